@@ -0,0 +1,170 @@
+"""
+Benchmark suite for the figure pipeline
+Renders the six figures plus synthetic complexes of 10^2, 10^4 and 10^5
+simplices headless on Agg, one fresh worker process per case so peak RSS is
+per case, and records wall time, peak memory and output bytes. Results are
+compared with a stored baseline; any metric above baseline * (1 + tolerance)
+is a regression and the run exits non-zero.
+Requires: matplotlib, numpy
+Usage: python benchmarks.py [--save-baseline] [--baseline benchmark_baseline.json]
+                            [--time-tol 0.5] [--memory-tol 0.2] [--bytes-tol 0.05]
+                            [--repeat 3] [--only figure1 synthetic_1e4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+BASELINE = 'benchmark_baseline.json'
+FIGURE_CASES = ('figure1', 'figure2', 'figure3', 'figure4', 'figure5', 'figure6')
+SYNTHETIC_SIZES = {'synthetic_1e2': 10 ** 2, 'synthetic_1e4': 10 ** 4, 'synthetic_1e5': 10 ** 5}
+CASES = FIGURE_CASES + tuple(SYNTHETIC_SIZES)
+METRICS = ('seconds', 'peak_rss_mb', 'bytes')
+
+# ==================== Cases ====================
+
+def synthetic_figure(n_simplices, output, seed=0):
+    """Draw a jittered grid complex with about `n_simplices` simplices and save it as PNG"""
+    import matplotlib.pyplot as plt
+    from complex_draw import draw_complex, synthetic_grid_complex
+
+    # A triangulated grid has ~3 simplices (vertex + edges + faces) per triangle
+    coords, edges, triangles = synthetic_grid_complex(max(1, n_simplices // 3), seed)
+    fig, ax = plt.subplots(figsize=(8, 8))
+    draw_complex(ax, coords, {0: range(len(coords)), 1: edges, 2: triangles},
+                 styles={0: {'size': 2}, 1: {'linewidth': 0.3}, 2: {'linewidth': 0}})
+    ax.set_aspect('equal')
+    ax.axis('off')
+    plt.tight_layout()
+    plt.savefig(output, bbox_inches='tight', facecolor='white')
+    plt.close()
+
+
+def _init_case(workdir):
+    """Fresh worker: headless backend, repo style, output confined to `workdir`"""
+    matplotlib.use('Agg')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(workdir)
+    os.makedirs('images', exist_ok=True)
+
+
+def run_case(name):
+    """Run one case in this (fresh) process; returns its metrics dict"""
+    import generate_figures
+    from profiling import peak_rss_mb
+
+    if name in SYNTHETIC_SIZES:
+        output = f'images/{name}.png'
+        func = lambda: synthetic_figure(SYNTHETIC_SIZES[name], output)
+    else:
+        spec = generate_figures.FIGURE_SPECS[name]
+        output, func = spec.output, spec.func
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'peak_rss_mb': peak_rss_mb(), 'bytes': os.path.getsize(output)}
+
+
+def measure(name, repeat=1):
+    """Best-of-`repeat` metrics of one case, each repetition in a new process"""
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, initializer=_init_case, initargs=(workdir,)) as pool:
+                runs.append(pool.submit(run_case, name).result())
+    return {m: min(r[m] for r in runs if r[m] is not None) if any(r[m] is not None for r in runs) else None
+            for m in METRICS}
+
+# ==================== Baseline Comparison ====================
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    data = {'matplotlib': matplotlib.__version__, 'python': sys.version.split()[0],
+            'cases': results}
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def compare(results, baseline, tolerances):
+    """Regressions as (case, metric, baseline value, current value, ratio)"""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get('cases', {}).get(name)
+        if not base:
+            continue
+        for metric, tol in tolerances.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if new > old * (1 + tol):
+                regressions.append((name, metric, old, new, new / old))
+    return regressions
+
+# ==================== Main Function ====================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the figure pipeline against a stored baseline.')
+    parser.add_argument('--baseline', default=BASELINE, help=f'baseline JSON (default: {BASELINE})')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store this run as the new baseline instead of comparing')
+    parser.add_argument('--only', nargs='+', choices=CASES, metavar='CASE',
+                        help=f'run only these cases ({", ".join(CASES)})')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case, best is kept (default: 3)')
+    parser.add_argument('--time-tol', type=float, default=0.5,
+                        help='allowed relative wall-time increase (default: 0.5 = +50%%)')
+    parser.add_argument('--memory-tol', type=float, default=0.2,
+                        help='allowed relative peak-RSS increase (default: 0.2)')
+    parser.add_argument('--bytes-tol', type=float, default=0.05,
+                        help='allowed relative output-size increase (default: 0.05)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = args.only or CASES
+    results = {}
+    for name in cases:
+        results[name] = measure(name, max(args.repeat, 1))
+        r = results[name]
+        print(f"  {name:<14s} {r['seconds']:7.2f}s  {r['peak_rss_mb'] or 0:7.0f} MB  "
+              f"{r['bytes'] / 1024:8.0f} KB")
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {'cases': {}}
+        save_baseline(args.baseline, {**baseline.get('cases', {}), **results})
+        print(f"✓ Baseline saved to: {args.baseline}")
+        return 0
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    if baseline.get('matplotlib') != matplotlib.__version__:
+        print(f"Note: baseline was recorded with matplotlib {baseline.get('matplotlib')}, "
+              f"running {matplotlib.__version__}")
+    tolerances = {'seconds': args.time_tol, 'peak_rss_mb': args.memory_tol, 'bytes': args.bytes_tol}
+    regressions = compare(results, baseline, tolerances)
+    if regressions:
+        for name, metric, old, new, ratio in regressions:
+            print(f"✗ {name}: {metric} {old:.4g} -> {new:.4g} ({ratio:.2f}x, "
+                  f"tolerance +{tolerances[metric]:.0%})")
+        return 1
+    print(f"✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
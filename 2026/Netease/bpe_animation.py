@@ -0,0 +1,384 @@
+"""
+Animated BPE merge sequence for the figure2 pushout illustration
+The most frequent words of a corpus are laid out as rows of atom cells
+(faded circles, as in figure2) drawn once into a saved background. Each
+merge of the incremental BPE engine then updates only its footprint: the
+background is restored under every displayed occurrence of the merged pair
+and the new token box is drawn on top (Agg blitting), so the per-frame cost
+depends on the merge, not on the words on screen or the merges before it.
+Frames stream to GIF (Pillow, each frame written as just the changed
+rectangle against a fixed palette) or to MP4 (raw frames piped to a local
+ffmpeg); nothing is buffered.
+Requires: matplotlib, numpy, Pillow (GIF) or ffmpeg on PATH (MP4)
+Usage: python bpe_animation.py out.gif [--corpus FILE] [--merges 300] [--words 60] [--fps 12]
+Benchmark: python bpe_animation.py --benchmark [--words 50 200 800]
+"""
+
+import shutil
+import subprocess
+import time
+from collections import Counter
+
+import matplotlib
+import numpy as np
+
+from bpe_engine import BPETrainer, synthetic_corpus
+
+ATOM_COLOR = 'blue'
+TOKEN_CMAP = 'plasma'
+TOKEN_LEVELS = 8  # token colours by length: 2, 3, ..., 9+
+
+# ==================== Frame Writers ====================
+
+class GifStream:
+    """Streaming GIF writer: one global palette, each frame only its changed rectangle"""
+
+    def __init__(self, path, fps=12, loop=0):
+        self.path = path
+        self.delay = max(2, int(round(100 / fps))) * 10  # ms, GIF has centisecond delays
+        self.loop = loop
+        self.fp = None
+        self.colors = None  # (n, 3) uint8 palette entries in use
+        self.palette = None
+        self.known = np.empty(0, dtype=np.int32)  # sorted 0xRRGGBB colours seen so far
+        self.known_index = np.empty(0, dtype=np.uint8)  # and their palette indices
+
+    def _quantize(self, rgba, chunk=4096):
+        """P image of `rgba` with every pixel mapped to its exactly nearest palette colour.
+
+        Pillow's own mapping is approximate (white came out as (252,252,255)),
+        so each distinct colour is matched by squared RGB distance once and
+        remembered for later frames.
+        """
+        from PIL import Image
+        rgb = rgba[..., :3].astype(np.int32)
+        keys = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        pos = np.minimum(np.searchsorted(self.known, uniq), len(self.known) - 1)
+        new = uniq[self.known[pos] != uniq] if len(self.known) else uniq
+        if len(new):
+            colors = np.stack([new >> 16, (new >> 8) & 255, new & 255], axis=1)
+            palette = self.colors.astype(np.int32)
+            nearest = np.concatenate([((colors[i:i + chunk, None, :] - palette[None]) ** 2).sum(axis=2).argmin(axis=1)
+                                      for i in range(0, len(colors), chunk)])
+            order = np.argsort(np.concatenate([self.known, new]), kind='stable')
+            self.known = np.concatenate([self.known, new])[order]
+            self.known_index = np.concatenate([self.known_index, nearest.astype(np.uint8)])[order]
+        index = self.known_index[np.searchsorted(self.known, uniq)]
+        frame = Image.fromarray(index[inverse.reshape(keys.shape)], 'P')
+        frame.putpalette(self.palette)
+        return frame
+
+    def open(self, first, swatch):
+        """Write the header; the palette is the token colour swatch plus the first frame's colours"""
+        from PIL import Image, GifImagePlugin
+        base = Image.fromarray(np.ascontiguousarray(first[..., :3])).quantize(256 - len(swatch))
+        self.colors = np.concatenate([swatch, np.asarray(base.getpalette(), dtype=np.uint8).reshape(-1, 3)])[:256]
+        self.palette = self.colors.ravel().tolist() + [0] * (768 - self.colors.size)
+        frame = self._quantize(first)
+        # 'loop' makes Pillow write GIF89a and the NETSCAPE2.0 loop extension
+        header, _ = GifImagePlugin.getheader(frame, info={'optimize': False, 'loop': self.loop})
+        self.fp = open(self.path, 'wb')
+        self.fp.write(b''.join(header))
+        self._write(frame, (0, 0))
+
+    def _write(self, frame, offset):
+        from PIL import GifImagePlugin
+        self.fp.write(b''.join(GifImagePlugin.getdata(frame, offset, duration=self.delay, disposal=1)))
+
+    def write(self, buffer, rect):
+        """Write the region rect = (x0, y0, x1, y1) (buffer rows, top-down) as the next frame"""
+        x0, y0, x1, y1 = rect
+        self._write(self._quantize(buffer[y0:y1, x0:x1]), (x0, y0))
+
+    def close(self):
+        if self.fp:
+            self.fp.write(b';')
+            self.fp.close()
+            self.fp = None
+
+
+class FfmpegStream:
+    """Raw RGBA frames piped to a local ffmpeg (H.264 MP4)"""
+
+    def __init__(self, path, fps=12, crf=23):
+        self.path = path
+        self.fps = fps
+        self.crf = crf
+        self.proc = None
+
+    def open(self, first, swatch=None):
+        ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found on PATH (set animation.ffmpeg_path); "
+                               "write a .gif instead")
+        height, width = first.shape[:2]
+        self.proc = subprocess.Popen(
+            [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+             '-s', f'{width}x{height}', '-r', str(self.fps), '-i', '-',
+             # yuv420p needs even dimensions
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2:color=white', '-c:v', 'libx264',
+             '-pix_fmt', 'yuv420p', '-crf', str(self.crf), self.path],
+            stdin=subprocess.PIPE)
+        self.write(first, None)
+
+    def write(self, buffer, rect):
+        self.proc.stdin.write(buffer.data if buffer.flags.c_contiguous else buffer.tobytes())
+
+    def close(self):
+        if self.proc:
+            self.proc.stdin.close()
+            if self.proc.wait():
+                raise RuntimeError(f"ffmpeg exited with status {self.proc.returncode}")
+            self.proc = None
+
+
+def open_stream(path, fps=12):
+    return FfmpegStream(path, fps) if path.lower().endswith(('.mp4', '.m4v', '.mov')) else GifStream(path, fps)
+
+# ==================== Animator ====================
+
+class MergeAnimator:
+    """Blitted view of a BPETrainer's merges over its `n_words` most frequent words"""
+
+    def __init__(self, trainer, n_words=60, width=48, dpi=100, cell_inches=0.28, blit=True):
+        import matplotlib.pyplot as plt
+        self.trainer = trainer
+        self.blit = blit
+        starts = np.concatenate([[0], np.cumsum([len(w) for w in trainer.words])])
+        self.word_start = starts
+        order = np.argsort(-np.asarray(trainer.word_freq), kind='stable')[:n_words]
+        # Flow the words into rows of `width` cells, one blank cell between words
+        self.origin = {}
+        x = y = 0
+        for w in order.tolist():
+            n = len(trainer.words[w])
+            if x and x + n > width:
+                x, y = 0, y + 1
+            self.origin[w] = (x, -y)
+            x += n + 1
+        rows = y + 1
+        self.shown = np.zeros(len(trainer.words), dtype=bool)
+        self.shown[list(self.origin)] = True
+        self.tokens = {}  # (word, start column) -> (box, label) of the current merged token
+        cmap = matplotlib.colormaps[TOKEN_CMAP]
+        self.colors = [cmap(0.15 + 0.7 * i / (TOKEN_LEVELS - 1)) for i in range(TOKEN_LEVELS)]
+
+        self.fig = plt.figure(figsize=(cell_inches * (width + 1), cell_inches * (rows + 2.2)), dpi=dpi)
+        ax = self.ax = self.fig.add_axes([0, 0, 1, 1])
+        ax.set_xlim(-1, width)
+        ax.set_ylim(-rows + 0.4, 2.0)
+        ax.axis('off')
+        self.header = ax.text(-0.5, 1.2, '', fontsize=11, fontweight='bold', va='center')
+        self._draw_base()
+
+    def _cells(self):
+        coords, chars = [], []
+        for w, (x, y) in self.origin.items():
+            for i, ch in enumerate(self.trainer.words[w]):
+                coords.append((x + i, y))
+                chars.append(ch)
+        return np.array(coords, dtype=float).reshape(-1, 2), chars
+
+    def _draw_base(self):
+        """Atoms and their labels, drawn once; the blank canvas is the blitting background"""
+        from complex_draw import draw_labels, draw_vertices
+        coords, chars = self._cells()
+        if len(coords):
+            draw_vertices(self.ax, coords, radius=0.3, color=ATOM_COLOR, alpha=0.3, zorder=2)
+            draw_labels(self.ax, coords, chars, max_labels=len(chars), ha='center', va='center',
+                        fontsize=9, color='navy', zorder=3)
+        canvas = self.fig.canvas
+        canvas.draw()
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+        self.height = int(self.fig.bbox.height)
+
+    def buffer(self):
+        return np.asarray(self.fig.canvas.buffer_rgba())
+
+    def swatch(self):
+        """Greys and the token colours blended with white, black and the faded atoms (GIF palette)"""
+        from matplotlib.colors import to_rgb
+        atom = 0.3 * np.array(to_rgb(ATOM_COLOR)) + 0.7
+        steps = np.linspace(0, 1, 6)[:, None]
+        out = [np.linspace(0, 1, 16)[:, None].repeat(3, axis=1)]
+        for c in self.colors:
+            c = np.array(c[:3])
+            out += [steps * c + (1 - steps) * blend for blend in (1.0, 0.0, atom)]
+        return (np.concatenate(out) * 255).round().astype(np.uint8)
+
+    def _pixel_rect(self, x0, x1, y):
+        """Display-space (x0, y0, x1, y1) of the cells x0..x1 of row y, in whole pixels"""
+        (a, b), (c, d) = self.ax.transData.transform([(x0 - 0.5, y - 0.5), (x1 + 0.5, y + 0.5)])
+        return int(np.floor(a)), int(np.floor(b)), int(np.ceil(c)), int(np.ceil(d))
+
+    def _token_artists(self, x0, x1, y, token):
+        from matplotlib.patches import FancyBboxPatch
+        from matplotlib.text import Text
+        color = self.colors[min(len(token), TOKEN_LEVELS + 1) - 2]
+        box = FancyBboxPatch((x0 - 0.32, y - 0.26), x1 - x0 + 0.64, 0.52,
+                             boxstyle='round,pad=0.06,rounding_size=0.2',
+                             facecolor=color, edgecolor='none', zorder=4)
+        dark = sum(color[:3]) < 1.6
+        label = Text((x0 + x1) / 2, y, token, ha='center', va='center', fontsize=9,
+                     fontweight='bold', color='white' if dark else 'black', zorder=5)
+        for artist in (box, label):
+            artist.set_figure(self.fig)
+            artist.axes = self.ax
+            artist.set_transform(self.ax.transData)
+        return box, label
+
+    def apply(self, step, positions):
+        """Show one merge: positions are the trainer's merged left-symbol positions.
+
+        Returns the dirty rectangle (x0, y0, x1, y1) in buffer rows (top-down), or None.
+        """
+        trainer = self.trainer
+        positions = np.asarray(positions, dtype=np.int64)
+        words = np.searchsorted(self.word_start, positions, side='right') - 1
+        keep = self.shown[words] if len(positions) else np.zeros(0, dtype=bool)
+        rects = []
+        for p, w in zip(positions[keep].tolist(), words[keep].tolist()):
+            start = self.word_start[w]
+            col0 = p - start
+            nxt = trainer.next[p]
+            col1 = (nxt if nxt >= 0 else self.word_start[w + 1]) - start - 1
+            ox, oy = self.origin[w]
+            # The merged token replaces every token inside its span
+            for col in range(col0, col1 + 1):
+                self.tokens.pop((w, col), None)
+            artists = self._token_artists(ox + col0, ox + col1, oy, step.token)
+            self.tokens[(w, col0)] = artists
+            rect = self._pixel_rect(ox + col0, ox + col1, oy)
+            if self.blit:
+                self._restore(rect)
+                for artist in artists:
+                    self.ax.draw_artist(artist)
+            rects.append(rect)
+        self.header.set_text(f"merge {step.rank + 1}: '{step.left}' + '{step.right}' -> "
+                             f"'{step.token}'   ({step.count:,d} occurrences)")
+        if self.blit:
+            header = self._header_rect()
+            self._restore(header)
+            self.ax.draw_artist(self.header)
+            rects.append(header)
+        else:
+            self._redraw()
+            rects.append((0, 0, int(self.fig.bbox.width), self.height))
+        x0, y0 = min(r[0] for r in rects), min(r[1] for r in rects)
+        x1, y1 = max(r[2] for r in rects), max(r[3] for r in rects)
+        width = int(self.fig.bbox.width)
+        x0, x1 = max(x0, 0), min(x1, width)
+        top, bottom = self.height - min(y1, self.height), self.height - max(y0, 0)
+        return (x0, top, x1, bottom) if x1 > x0 and bottom > top else None
+
+    def _restore(self, rect):
+        """Copy the background back under the display rect (x0, y0, x1, y1)"""
+        x0, y0, x1, y1 = rect
+        # Saved regions are addressed top-down from their own lower-left corner
+        self.fig.canvas.restore_region(self.background, bbox=(x0, self.height - y1, x1, self.height - y0),
+                                       xy=(0, 0))
+
+    def _header_rect(self):
+        (a, b), (c, d) = self.ax.transData.transform([(-1, 0.75), (self.ax.get_xlim()[1], 1.65)])
+        return int(a), int(b), int(np.ceil(c)), int(np.ceil(d))
+
+    def _redraw(self):
+        """Full redraw of every current token (the non-blitting reference path)"""
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for box, label in self.tokens.values():
+            box.draw(canvas.get_renderer())
+            label.draw(canvas.get_renderer())
+        self.header.draw(canvas.get_renderer())
+
+# ==================== Animation ====================
+
+def merge_positions(trainer, pair):
+    """Merge `pair`; returns (PushoutStep, left-symbol positions that were merged)"""
+    candidates = sorted(trainer.positions.get(pair, ()))
+    step = trainer.merge(pair)
+    new = trainer.ids[step.token]
+    sym = trainer.sym
+    return step, [p for p in candidates if sym[p] == new]
+
+
+def animate_bpe(trainer, output, merges=300, n_words=60, fps=12, min_count=2, dpi=100):
+    """Train `merges` merges on `trainer` and stream one frame per merge to `output`"""
+    import matplotlib.pyplot as plt
+    animator = MergeAnimator(trainer, n_words, dpi=dpi)
+    stream = open_stream(output, fps)
+    frames, render, encode = 1, 0.0, 0.0
+    try:
+        stream.open(animator.buffer(), animator.swatch())
+        for _ in range(merges):
+            best = trainer.best_pair()
+            if best is None or best[1] < min_count:
+                break
+            step, positions = merge_positions(trainer, best[0])
+            start = time.perf_counter()
+            rect = animator.apply(step, positions)
+            render += time.perf_counter() - start
+            start = time.perf_counter()
+            if rect is not None:
+                stream.write(animator.buffer(), rect)
+                frames += 1
+            encode += time.perf_counter() - start
+    finally:
+        stream.close()
+        plt.close(animator.fig)
+    print(f"✓ Saved {output}: {frames} frames, render {1e3 * render / max(frames - 1, 1):.2f} ms/frame, "
+          f"encode {1e3 * encode / max(frames - 1, 1):.2f} ms/frame")
+    return frames
+
+
+def load_trainer(corpus=None, size_mb=2.0, seed=0):
+    """BPETrainer over a text file, or over a small synthetic Zipf corpus"""
+    if corpus:
+        with open(corpus, encoding='utf-8') as f:
+            return BPETrainer.from_lines(f)
+    words, counts = synthetic_corpus(size_mb, lexicon=5000, seed=seed)
+    return BPETrainer(Counter({w: c for w, c in zip(words, counts.tolist()) if c}))
+
+
+def benchmark(word_counts=(50, 200, 800), merges=200, size_mb=2.0):
+    """Per-frame render time, blitting vs full redraw, as the number of words on screen grows"""
+    import matplotlib.pyplot as plt
+    matplotlib.use('Agg')
+    for n_words in word_counts:
+        for blit in (True, False):
+            trainer = load_trainer(size_mb=size_mb)
+            animator = MergeAnimator(trainer, n_words, width=64, blit=blit)
+            elapsed, frames = 0.0, 0
+            for _ in range(merges):
+                best = trainer.best_pair()
+                if best is None:
+                    break
+                step, positions = merge_positions(trainer, best[0])
+                start = time.perf_counter()
+                animator.apply(step, positions)
+                elapsed += time.perf_counter() - start
+                frames += 1
+            plt.close(animator.fig)
+            print(f"{n_words:>6d} words  {'blit' if blit else 'full redraw':<12s} "
+                  f"{1e3 * elapsed / max(frames, 1):8.2f} ms/frame over {frames} merges")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Animate BPE merges with blitting.')
+    parser.add_argument('output', nargs='?', help='.gif (Pillow) or .mp4 (ffmpeg)')
+    parser.add_argument('--corpus', metavar='FILE', help='text corpus (default: synthetic Zipf corpus)')
+    parser.add_argument('--merges', type=int, default=300)
+    parser.add_argument('--words', type=int, nargs='+', default=None,
+                        help='words on screen (several values with --benchmark)')
+    parser.add_argument('--fps', type=float, default=12)
+    parser.add_argument('--benchmark', action='store_true', help='compare blitting with full redraws')
+    args = parser.parse_args()
+    matplotlib.use('Agg')
+    if args.benchmark:
+        benchmark(args.words or (50, 200, 800), min(args.merges, 200))
+    elif not args.output:
+        parser.error('an output .gif or .mp4 is required')
+    else:
+        animate_bpe(load_trainer(args.corpus), args.output, args.merges, (args.words or [60])[0], args.fps)
@@ -0,0 +1,515 @@
+"""
+Vectorized drawing layer for simplicial complexes
+Takes NumPy arrays (vertex coordinates, simplex index arrays) and emits one
+collection per dimension instead of one artist per simplex, so complexes with
+10^4-10^5 simplices render in about the time a handful of patches take.
+Requires: matplotlib, numpy
+Benchmark: python complex_draw.py [--sizes 100 10000 100000]
+           python complex_draw.py --lod [--sizes 1000 100000 1000000] [--plot out.png]
+"""
+
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+
+# ==================== Geometry Helpers ====================
+
+def edges_of(simplices):
+    """Unique sorted edges (m, 2) of an array of k-simplices (n, k+1), k >= 1"""
+    simplices = np.asarray(simplices)
+    k = simplices.shape[1]
+    i, j = np.triu_indices(k, 1)
+    pairs = np.stack([simplices[:, i], simplices[:, j]], axis=-1).reshape(-1, 2)
+    return np.unique(np.sort(pairs, axis=1), axis=0)
+
+
+def cull_labels(points, priority=None, max_labels=200, min_spacing=None):
+    """Indices of the labels worth drawing, highest priority first.
+
+    Labels are first thinned on a grid of `min_spacing` cells (one label per
+    cell, the highest priority one wins), then capped at `max_labels`.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    order = np.arange(n) if priority is None else np.argsort(-np.asarray(priority), kind='stable')
+    if min_spacing:
+        cells = np.floor(points[order] / min_spacing).astype(np.int64)
+        # np.unique keeps the first occurrence, i.e. the highest priority per cell
+        _, first = np.unique(cells, axis=0, return_index=True)
+        order = order[np.sort(first)]
+    return order[:max_labels]
+
+
+def _auto_spacing(ax, max_labels):
+    """Grid spacing that allows roughly `max_labels` labels over the current view"""
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    return np.sqrt(abs((x1 - x0) * (y1 - y0)) / max(max_labels, 1))
+
+# ==================== Collection Builders ====================
+
+def draw_simplices(ax, coords, simplices, facecolor='lightblue', edgecolor='blue',
+                   alpha=0.3, linewidth=2, zorder=1, **kwargs):
+    """Draw k-simplices (k >= 2) as filled polygons in a single PolyCollection"""
+    simplices = np.asarray(simplices, dtype=np.intp)
+    coll = PolyCollection(np.asarray(coords, dtype=float)[simplices], closed=True,
+                          facecolors=facecolor, edgecolors=edgecolor, alpha=alpha,
+                          linewidths=linewidth, zorder=zorder, **kwargs)
+    ax.add_collection(coll, autolim=False)
+    return coll
+
+
+def draw_edges(ax, coords, edges, color='k', linewidth=2, zorder=2, **kwargs):
+    """Draw 1-simplices as a single LineCollection"""
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    coll = LineCollection(np.asarray(coords, dtype=float)[edges], colors=color,
+                          linewidths=linewidth, zorder=zorder, **kwargs)
+    ax.add_collection(coll, autolim=False)
+    return coll
+
+
+def draw_vertices(ax, coords, size=15, color='k', radius=None, zorder=2, **kwargs):
+    """Draw 0-simplices as one offset collection.
+
+    With `radius` the markers are circles in data units (EllipseCollection),
+    otherwise fixed-size markers of `size` points (scatter).
+    """
+    coords = np.asarray(coords, dtype=float)
+    if radius is None:
+        return ax.scatter(coords[:, 0], coords[:, 1], s=size ** 2, c=color,
+                          zorder=zorder, **kwargs)
+    if 'edgecolor' not in kwargs and 'edgecolors' not in kwargs:
+        # Like Circle(color=...): a 1pt rim in the face colour
+        kwargs['edgecolors'] = color
+    diameter = np.broadcast_to(2.0 * np.asarray(radius, dtype=float), len(coords))
+    coll = EllipseCollection(diameter, diameter, np.zeros(len(coords)), units='xy',
+                             offsets=coords, offset_transform=ax.transData,
+                             facecolors=color, zorder=zorder, **kwargs)
+    ax.add_collection(coll, autolim=False)
+    return coll
+
+
+def draw_labels(ax, coords, labels, offset=(0, 0), priority=None, max_labels=200,
+                min_spacing=None, **text_kw):
+    """Draw text labels at `coords + offset`, culled to at most `max_labels`.
+
+    Returns the Text artists that were created.
+    """
+    coords = np.asarray(coords, dtype=float) + np.asarray(offset, dtype=float)
+    if min_spacing is None and len(coords) > max_labels:
+        min_spacing = _auto_spacing(ax, max_labels)
+    keep = cull_labels(coords, priority, max_labels, min_spacing)
+    return [ax.text(coords[i, 0], coords[i, 1], labels[i], **text_kw) for i in np.sort(keep)]
+
+
+def arrow_segments(coords, edges, node_radius=0.0, head_length=None, head_width=None):
+    """Shaft and open-head ('->') segments for directed edges, fully vectorized.
+
+    Returns (segments (3m, 2, 2), unit directions (m, 2)); each edge
+    contributes its shaft and the two barbs of its head.
+    """
+    coords = np.asarray(coords, dtype=float)
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    start, end = coords[edges[:, 0]], coords[edges[:, 1]]
+    delta = end - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    unit = delta / np.where(length > 0, length, 1.0)[:, None]
+    normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+    if head_length is None:
+        head_length = 0.045 * (np.median(length) if len(length) else 1.0)
+    if head_width is None:
+        head_width = 0.6 * head_length
+    tail = start + node_radius * unit
+    tip = end - node_radius * unit
+    back = tip - head_length * unit
+    segments = np.stack([
+        np.stack([tail, tip], axis=1),
+        np.stack([back + 0.5 * head_width * normal, tip], axis=1),
+        np.stack([back - 0.5 * head_width * normal, tip], axis=1),
+    ], axis=1).reshape(-1, 2, 2)
+    return segments, unit
+
+
+def draw_directed_edges(ax, coords, edges, weights=None, node_radius=0.0, color='red',
+                        linewidth=3, zorder=1, head_length=None, head_width=None,
+                        label_fmt='w={:g}', label_offset=0.15, max_labels=200,
+                        label_kw=None, **kwargs):
+    """Draw directed (weighted) edges as one LineCollection of shafts and arrow heads.
+
+    Weight labels sit `label_offset` to the left of each edge midpoint and are
+    culled to the `max_labels` heaviest. Returns (collection, label texts).
+    """
+    coords = np.asarray(coords, dtype=float)
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    segments, unit = arrow_segments(coords, edges, node_radius, head_length, head_width)
+    coll = LineCollection(segments, colors=color, linewidths=linewidth, zorder=zorder,
+                          capstyle='round', joinstyle='round', **kwargs)
+    ax.add_collection(coll, autolim=False)
+    texts = []
+    if weights is not None and max_labels:
+        weights = np.asarray(weights)
+        mid = 0.5 * (coords[edges[:, 0]] + coords[edges[:, 1]])
+        normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+        labels = [label_fmt.format(w) for w in weights.tolist()]
+        texts = draw_labels(ax, mid + label_offset * normal, labels, priority=weights,
+                            max_labels=max_labels, **(label_kw or {}))
+    return coll, texts
+
+
+def draw_complex(ax, coords, simplices_by_dim, styles=None, labels=None, label_kw=None,
+                 max_labels=200):
+    """Draw a whole complex: one collection per dimension plus culled vertex labels.
+
+    `simplices_by_dim` maps dimension -> (n, dim+1) index array; `styles` maps
+    dimension -> keyword overrides for that dimension's builder. Returns a dict
+    dimension -> collection (and 'labels' -> texts).
+    """
+    styles = styles or {}
+    artists = {}
+    for dim in sorted(simplices_by_dim):
+        simplices = simplices_by_dim[dim]
+        style = styles.get(dim, {})
+        if dim == 0:
+            artists[0] = draw_vertices(ax, coords[np.asarray(simplices).reshape(-1)], **style)
+        elif dim == 1:
+            artists[1] = draw_edges(ax, coords, simplices, **style)
+        else:
+            artists[dim] = draw_simplices(ax, coords, simplices, **style)
+    if labels is not None:
+        artists['labels'] = draw_labels(ax, coords, labels, max_labels=max_labels,
+                                        **(label_kw or {}))
+    return artists
+
+def draw_weighted_directed_complex(ax, K, coords, node_radius=0.2, node_color='orange',
+                                   edge_color='red', face_color='lightgreen',
+                                   node_label_fmt='{}', weight_fmt='w={:.2g}', max_labels=200,
+                                   lod_threshold=15000, top_k=30, raster_px=1024):
+    """Draw a weighted directed SimplicialComplex in the figure5 style.
+
+    Nodes are data-unit circles with white labels, edges follow their
+    orientation with weight labels, and 2-simplices are dashed translucent
+    triangles. Above `lod_threshold` edges + triangles the complex switches to
+    level of detail: all edges and triangles go into one weight raster image
+    and only the `top_k` heaviest edges keep arrows and labels. The default is
+    where the full draw overtakes the raster's fixed ~1.4 s cost (--lod). Returns a dict
+    of the created artists ('raster' -> AxesImage in LOD mode).
+    """
+    coords = np.asarray(coords, dtype=float)
+    artists = {}
+    edges, weights = K.oriented(1), K.weights(1)
+    lod = lod_threshold is not None and K.count(1) + K.count(2) > lod_threshold
+    if lod:
+        artists['raster'] = draw_density(ax, coords, edges, weights, K.simplices(2), K.weights(2),
+                                         edge_color=edge_color, face_color=face_color,
+                                         pad=node_radius, raster_px=raster_px)
+        keep = top_k_indices(weights, top_k) if weights is not None else np.arange(min(top_k, len(edges)))
+        edges = edges[keep]
+        weights = weights[keep] if weights is not None else None
+    elif K.count(2):
+        artists[2] = draw_simplices(ax, coords, K.oriented(2), facecolor=face_color, alpha=0.2,
+                                    edgecolor='green', linewidth=2, linestyle='--', zorder=0)
+    artists[0] = draw_vertices(ax, coords, radius=node_radius, color=node_color,
+                               edgecolor=node_color, linewidth=2, zorder=3)
+    if K.labels is not None:
+        artists['labels'] = draw_labels(ax, coords, [node_label_fmt.format(l) for l in K.labels],
+                                        priority=K.weights(0), max_labels=max_labels,
+                                        ha='center', va='center', fontsize=11, fontweight='bold',
+                                        color='white', zorder=4)
+    artists[1] = draw_directed_edges(
+        ax, coords, edges, weights, node_radius=node_radius, color=edge_color,
+        linewidth=3, zorder=1, label_fmt=weight_fmt, label_offset=0.15, max_labels=max_labels,
+        label_kw=dict(ha='center', va='center', fontsize=10, fontweight='bold', color=edge_color,
+                      bbox=dict(boxstyle='round,pad=0.3', facecolor='white',
+                                edgecolor=edge_color, linewidth=1)))
+    return artists
+
+# ==================== Level of Detail ====================
+
+def top_k_indices(weights, k):
+    """Indices of the `k` largest weights, heaviest first"""
+    weights = np.asarray(weights)
+    if k >= len(weights):
+        return np.argsort(-weights, kind='stable')
+    part = np.argpartition(-weights, k)[:k]
+    return part[np.argsort(-weights[part], kind='stable')]
+
+
+def raster_extent(coords, pad=0.0):
+    """(x0, x1, y0, y1) bounding all vertices, padded by `pad` data units"""
+    lo, hi = coords.min(axis=0) - pad, coords.max(axis=0) + pad
+    hi = np.maximum(hi, lo + 1e-9)
+    return lo[0], hi[0], lo[1], hi[1]
+
+
+def raster_shape(extent, raster_px=1024):
+    """(rows, cols) with `raster_px` pixels along the longer side of `extent`"""
+    x0, x1, y0, y1 = extent
+    aspect = (y1 - y0) / (x1 - x0)
+    if aspect <= 1:
+        return max(1, int(round(raster_px * aspect))), raster_px
+    return raster_px, max(1, int(round(raster_px / aspect)))
+
+
+def _deposit(out, points, mass, shape):
+    """Add `mass` at pixel coordinates `points` (col, row) into the flat raster `out`"""
+    h, w = shape
+    col = np.clip(points[:, 0].astype(np.int64), 0, w - 1)
+    row = np.clip(points[:, 1].astype(np.int64), 0, h - 1)
+    out += np.bincount(row * w + col, mass, h * w)
+
+
+def _sample_counts(size, budget):
+    """Samples per simplex: one per pixel of `size`, scaled down to at most ~`budget` in total"""
+    n = np.maximum(np.ceil(size), 1).astype(np.int64)
+    total = n.sum()
+    if total > budget:
+        n = np.maximum((n * (budget / total)).astype(np.int64), 1)
+    return n
+
+
+def _chunks(n, budget):
+    """Consecutive slices of the simplices holding about `budget` samples each"""
+    cuts = np.searchsorted(np.cumsum(n), np.arange(budget, n.sum(), budget))
+    bounds = np.unique(np.concatenate([[0], cuts, [len(n)]]))
+    return [slice(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def rasterize_edges(coords, edges, weights=None, extent=None, shape=(512, 512),
+                    budget=None, chunk=1 << 20, seed=0):
+    """Edge weight per pixel: each edge adds its weight to every pixel it crosses.
+
+    Edges are sampled about once per pixel of length; when that exceeds
+    `budget` samples in total (default: two per raster pixel), every edge
+    gets proportionally fewer, heavier samples (stratified, so the expected
+    raster is unchanged). The cost is O(m + budget) whatever the edge
+    lengths. Returns a (rows, cols) array with row 0 at the bottom.
+    """
+    coords = np.asarray(coords, dtype=float)
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    extent = extent or raster_extent(coords)
+    h, w = shape
+    x0, x1, y0, y1 = extent
+    scale = np.array([w / (x1 - x0), h / (y1 - y0)])
+    pixels = (coords - (x0, y0)) * scale
+    weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=float)
+    out = np.zeros(h * w)
+    if len(edges) == 0:
+        return out.reshape(h, w)
+    a, b = pixels[edges[:, 0]], pixels[edges[:, 1]]
+    length = np.max(np.abs(b - a), axis=1)  # pixels crossed, Chebyshev length
+    n = _sample_counts(length, budget or 2 * h * w)
+    jitter = np.random.default_rng(seed).random(len(edges))
+    for part in _chunks(n, chunk):
+        counts = n[part]
+        owner = np.repeat(np.arange(part.start, part.stop), counts)
+        first = np.cumsum(counts) - counts
+        step = np.arange(counts.sum()) - np.repeat(first, counts)
+        t = (step + jitter[owner]) / counts.repeat(counts)
+        points = a[owner] + t[:, None] * (b[owner] - a[owner])
+        _deposit(out, points, (weights[owner] * np.maximum(length[owner], 1) / n[owner]), shape)
+    return out.reshape(h, w)
+
+
+def rasterize_triangles(coords, triangles, weights=None, extent=None, shape=(512, 512),
+                        budget=None, chunk=1 << 20, seed=0):
+    """Triangle weight per pixel covered, sampled like `rasterize_edges` by area"""
+    coords = np.asarray(coords, dtype=float)
+    triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+    extent = extent or raster_extent(coords)
+    h, w = shape
+    x0, x1, y0, y1 = extent
+    pixels = (coords - (x0, y0)) * np.array([w / (x1 - x0), h / (y1 - y0)])
+    weights = np.ones(len(triangles)) if weights is None else np.asarray(weights, dtype=float)
+    out = np.zeros(h * w)
+    if len(triangles) == 0:
+        return out.reshape(h, w)
+    a, b, c = (pixels[triangles[:, i]] for i in range(3))
+    u, v = b - a, c - a
+    area = 0.5 * np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0])
+    n = _sample_counts(area, budget or 2 * h * w)
+    offset = np.random.default_rng(seed).random((len(triangles), 2))
+    for part in _chunks(n, chunk):
+        counts = n[part]
+        owner = np.repeat(np.arange(part.start, part.stop), counts)
+        step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        # R2 low-discrepancy points in the unit square, folded into the triangle
+        r = (step[:, None] * np.array([0.7548776662, 0.5698402910]) + offset[owner]) % 1.0
+        fold = r.sum(axis=1) > 1
+        r[fold] = 1 - r[fold]
+        points = a[owner] + r[:, :1] * u[owner] + r[:, 1:] * v[owner]
+        _deposit(out, points, weights[owner] * np.maximum(area[owner], 1) / n[owner], shape)
+    return out.reshape(h, w)
+
+
+def _intensity(density, saturate=99.0):
+    """Log-scaled density in [0, 1], saturating at the `saturate` percentile of covered pixels"""
+    nonzero = density[density > 0]
+    if len(nonzero) == 0:
+        return density
+    level = np.log1p(density / np.median(nonzero))
+    # Heavy-tailed weights would otherwise leave all but a few pixels near zero
+    return np.minimum(level / np.percentile(level[density > 0], saturate), 1.0)
+
+
+def draw_density(ax, coords, edges, edge_weights=None, triangles=None, triangle_weights=None,
+                 edge_color='red', face_color='lightgreen', face_alpha=0.4, pad=0.0,
+                 raster_px=1024, zorder=0, **kwargs):
+    """Draw edges and triangles as a single RGBA weight raster (one imshow).
+
+    Edge and triangle weights are accumulated separately, log-scaled and
+    composited (edges over faces) into one image covering the vertices'
+    bounding box. Returns the AxesImage.
+    """
+    from matplotlib.colors import to_rgb
+    coords = np.asarray(coords, dtype=float)
+    extent = raster_extent(coords, pad)
+    shape = raster_shape(extent, raster_px)
+    edge_alpha = _intensity(rasterize_edges(coords, edges, edge_weights, extent, shape))
+    if triangles is not None and len(triangles):
+        face = face_alpha * _intensity(rasterize_triangles(coords, triangles, triangle_weights,
+                                                           extent, shape))
+    else:
+        face = np.zeros(shape)
+    alpha = edge_alpha + face * (1 - edge_alpha)
+    rgba = np.empty(shape + (4,))
+    safe = np.where(alpha > 0, alpha, 1.0)
+    for i, (e, f) in enumerate(zip(to_rgb(edge_color), to_rgb(face_color))):
+        rgba[..., i] = (e * edge_alpha + f * face * (1 - edge_alpha)) / safe
+    rgba[..., 3] = alpha
+    return ax.imshow(rgba, extent=extent, origin='lower', interpolation='antialiased',
+                     aspect=ax.get_aspect(), zorder=zorder, **kwargs)
+
+# ==================== Synthetic Complexes ====================
+
+def synthetic_grid_complex(n_triangles, seed=0):
+    """Jittered triangulated grid with about `n_triangles` 2-simplices.
+
+    Returns (coords (v, 2), edges (e, 2), triangles (t, 3)).
+    """
+    side = max(1, int(np.ceil(np.sqrt(n_triangles / 2.0))))
+    rng = np.random.default_rng(seed)
+    gx, gy = np.meshgrid(np.arange(side + 1), np.arange(side + 1))
+    coords = np.stack([gx.ravel(), gy.ravel()], axis=1) + rng.uniform(-0.3, 0.3, ((side + 1) ** 2, 2))
+    cell = (np.arange(side)[:, None] * (side + 1) + np.arange(side)[None, :]).ravel()
+    lower = np.stack([cell, cell + 1, cell + side + 2], axis=1)
+    upper = np.stack([cell, cell + side + 1, cell + side + 2], axis=1)
+    triangles = np.concatenate([lower, upper])[:n_triangles]
+    return coords, edges_of(triangles), triangles
+
+# ==================== Benchmark ====================
+
+def _draw_naive(ax, coords, edges, triangles, weights):
+    """Reference renderer: one artist per simplex, as the original figure code does"""
+    from matplotlib.patches import FancyArrowPatch, Polygon
+    for tri in triangles:
+        ax.add_patch(Polygon(coords[tri], closed=True, facecolor='lightblue', alpha=0.3,
+                             edgecolor='blue', linewidth=0.5))
+    for (i, j), w in zip(edges, weights):
+        ax.add_patch(FancyArrowPatch(coords[i], coords[j], arrowstyle='->',
+                                     mutation_scale=5, color='red', linewidth=0.5))
+    for v in coords:
+        ax.plot(v[0], v[1], 'ko', markersize=2)
+
+
+def _draw_vectorized(ax, coords, edges, triangles, weights):
+    draw_simplices(ax, coords, triangles, linewidth=0.5)
+    draw_directed_edges(ax, coords, edges, weights, linewidth=0.5, max_labels=50,
+                        label_kw=dict(fontsize=4, ha='center', va='center', color='red'))
+    draw_vertices(ax, coords, size=2)
+
+
+def benchmark(sizes=(100, 1000, 10000, 100000), naive_max=1000, seed=0):
+    """Artist count and render time (build + Agg draw) against complex size"""
+    import time
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    rows = []
+    for n in sizes:
+        coords, edges, triangles = synthetic_grid_complex(n, seed)
+        weights = np.random.default_rng(seed).random(len(edges))
+        n_simplices = len(coords) + len(edges) + len(triangles)
+        for mode, draw in (('naive', _draw_naive), ('vectorized', _draw_vectorized)):
+            if mode == 'naive' and n > naive_max:
+                continue
+            fig, ax = plt.subplots(figsize=(8, 8))
+            start = time.perf_counter()
+            draw(ax, coords, edges, triangles, weights)
+            ax.set_xlim(coords[:, 0].min() - 1, coords[:, 0].max() + 1)
+            ax.set_ylim(coords[:, 1].min() - 1, coords[:, 1].max() + 1)
+            fig.canvas.draw()
+            elapsed = time.perf_counter() - start
+            artists = len(ax.get_children())
+            plt.close(fig)
+            rows.append((n_simplices, mode, artists, elapsed))
+            print(f"{n_simplices:>10d} simplices  {mode:<10s} {artists:>8d} artists  {elapsed:8.3f}s")
+    return rows
+
+
+def synthetic_dense_complex(n_edges, n_vertices=None, seed=0):
+    """Random weighted directed complex with `n_edges` edges and n_edges / 4 triangles.
+
+    Returns (SimplicialComplex, coords); weights are heavy-tailed like co-occurrence counts.
+    """
+    from simplicial_complex import SimplicialComplex
+    rng = np.random.default_rng(seed)
+    n_vertices = n_vertices or max(8, int(np.sqrt(8 * n_edges)))
+    # Locality: most edges join nearby vertices on a ring, as in a laid-out interaction graph
+    angle = np.sort(rng.uniform(0, 2 * np.pi, n_vertices))
+    coords = np.stack([np.cos(angle), np.sin(angle)], axis=1) * rng.uniform(0.3, 1.0, (n_vertices, 1))
+    src = rng.integers(n_vertices, size=n_edges)
+    dst = (src + 1 + rng.geometric(8.0 / n_vertices, n_edges)) % n_vertices
+    third = (dst + 1) % n_vertices
+    edges = np.stack([src, dst], axis=1)[src != dst]
+    triangles = np.stack([src, dst, third], axis=1)[(src != dst) & (third != src)][:n_edges // 4]
+    K = SimplicialComplex({1: edges, 2: triangles},
+                          weights={1: rng.pareto(1.5, len(edges)) + 1,
+                                   2: rng.pareto(1.5, len(triangles)) + 1},
+                          n_vertices=n_vertices)
+    return K, coords
+
+
+def benchmark_lod(sizes=(1000, 10000, 100000, 1000000), full_max=100000, seed=0, plot=None):
+    """Render time of draw_weighted_directed_complex with and without level of detail"""
+    import time
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    for m in sizes:
+        K, coords = synthetic_dense_complex(m, seed=seed)
+        for mode, threshold in (('full', None), ('lod', 0)):
+            if mode == 'full' and m > full_max:
+                continue
+            fig, ax = plt.subplots(figsize=(8, 8))
+            start = time.perf_counter()
+            draw_weighted_directed_complex(ax, K, coords, node_radius=0.004, lod_threshold=threshold,
+                                           max_labels=30)
+            ax.set_xlim(-1.1, 1.1)
+            ax.set_ylim(-1.1, 1.1)
+            ax.set_aspect('equal')
+            fig.canvas.draw()
+            elapsed = time.perf_counter() - start
+            if plot and mode == 'lod':
+                fig.savefig(plot, facecolor='white')
+            plt.close(fig)
+            print(f"{K.count(1):>10,d} edges {K.count(2):>10,d} triangles  {mode:<5s} {elapsed:8.3f}s")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark naive vs collection-based complex drawing.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='target number of triangles per synthetic complex')
+    parser.add_argument('--naive-max', type=int, default=1000,
+                        help='skip the naive renderer above this many triangles')
+    parser.add_argument('--lod', action='store_true',
+                        help='benchmark level-of-detail rendering; --sizes are then edge counts')
+    parser.add_argument('--plot', metavar='PNG', help='with --lod: save the last LOD render')
+    args = parser.parse_args()
+    if args.lod:
+        benchmark_lod(args.sizes, plot=args.plot)
+    else:
+        benchmark(args.sizes, args.naive_max)
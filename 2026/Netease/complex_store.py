@@ -0,0 +1,420 @@
+"""
+Memory-mapped on-disk store for weighted interaction complexes
+One file holds a fixed header (magic, format version, index location), then
+64-byte aligned raw arrays -- per dimension the canonical int32 simplex rows,
+float64 weights and int8 orientations, plus the vocabulary as UTF-8 bytes
+with offsets -- and a JSON index describing them. Opening reads only the
+header and index; the arrays are numpy.memmap views, so a multi-GB complex
+opens in milliseconds and every worker process that opens it shares the same
+page-cache pages (no copies, nothing pickled but the path).
+New logs are added append-only: each append writes a segment (its simplices
+in global vertex ids and its new vocabulary tokens) after the existing data,
+then repoints the header at a new index. Readers holding earlier versions are
+unaffected. Writers (append, compact) take an exclusive flock on the file and
+re-read the header inside it, so appends from several handles or processes
+serialise instead of overwriting each other (the lock needs fcntl, i.e.
+Linux/macOS). A single-segment store loads zero-copy; several segments are
+merged on load (weights summed) until `compact` rewrites them into one.
+Requires: numpy
+Usage: python complex_store.py info STORE | compact STORE
+       python complex_store.py benchmark [--simplices 10000000] [--workers 2]
+       python interaction_complex.py LOG [LOG ...] --store STORE   (append)
+"""
+
+import json
+import os
+import struct
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+
+import numpy as np
+
+from simplicial_complex import INDEX_DTYPE, SimplicialComplex, row_keys
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+MAGIC = b'NEScplx\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQ')  # magic, version, flags, index offset, index length
+HEADER_SIZE = 64
+ALIGN = 64
+
+# ==================== File Layout ====================
+
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def _write_arrays(f, arrays):
+    """Write arrays at aligned offsets from the current end; returns name -> [offset, dtype, shape]"""
+    entries = {}
+    for name, a in arrays.items():
+        a = np.ascontiguousarray(a)
+        offset = _aligned(f.tell())
+        f.write(b'\0' * (offset - f.tell()))
+        f.write(a.tobytes())
+        entries[name] = [offset, a.dtype.str, list(a.shape)]
+    return entries
+
+
+def _commit(f, index):
+    """Append the JSON index and point the header at it (the only in-place write)"""
+    data = json.dumps(index, separators=(',', ':')).encode()
+    offset = _aligned(f.tell())
+    f.write(b'\0' * (offset - f.tell()))
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, 0, offset, len(data)).ljust(HEADER_SIZE, b'\0'))
+    f.flush()
+    os.fsync(f.fileno())
+    return offset + len(data)
+
+
+def _read_index(f, path):
+    """(index, end of index) from the header of an open store file"""
+    f.seek(0)
+    magic, version, _, offset, length = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a complex store")
+    if version > VERSION:
+        raise ValueError(f"{path}: format version {version} is newer than supported ({VERSION})")
+    f.seek(offset)
+    return json.loads(f.read(length)), offset + length
+
+
+@contextmanager
+def _locked(path):
+    """`path` opened for update under an exclusive lock (released on close).
+
+    If a compact replaced the file while we waited, the lock is retaken on the new file.
+    """
+    while True:
+        f = open(path, 'r+b')
+        if fcntl is None:
+            break
+        fcntl.flock(f, fcntl.LOCK_EX)
+        if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+            break
+        f.close()
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+def _segment_arrays(K, new_tokens=()):
+    """Raw arrays of one segment: dim/rows, dim/weights, dim/orientations, vocab/*"""
+    arrays = {}
+    for d in K.dims:
+        arrays[f'{d}/rows'] = K.simplices(d)
+        if K.weights(d) is not None:
+            arrays[f'{d}/weights'] = K.weights(d)
+        arrays[f'{d}/orientations'] = K.orientations(d)
+    if new_tokens:
+        data = [str(t).encode('utf-8') for t in new_tokens]
+        arrays['vocab/offsets'] = np.concatenate([[0], np.cumsum([len(b) for b in data])]).astype(np.int64)
+        arrays['vocab/data'] = np.frombuffer(b''.join(data), dtype=np.uint8)
+    return arrays
+
+# ==================== Vocabulary ====================
+
+class VocabularyTable:
+    """Read-only token sequence over the memory-mapped vocabulary of all segments"""
+
+    def __init__(self, parts):
+        self.parts = [p for p in parts if len(p[0]) > 1]
+        self.starts = np.concatenate([[0], np.cumsum([len(o) - 1 for o, _ in self.parts])]).tolist()
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        part = bisect_right(self.starts, i) - 1
+        offsets, data = self.parts[part]
+        j = i - self.starts[part]
+        return bytes(data[offsets[j]:offsets[j + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for offsets, data in self.parts:
+            raw = bytes(data)
+            bounds = offsets.tolist()
+            for a, b in zip(bounds[:-1], bounds[1:]):
+                yield raw[a:b].decode('utf-8')
+
+    def ids(self):
+        """token -> vertex id"""
+        return {token: i for i, token in enumerate(self)}
+
+# ==================== Store ====================
+
+class ComplexStore:
+    """Append-only, memory-mapped file holding one weighted complex and its vocabulary.
+
+    Appends and compaction are serialised by a file lock; any number of reader
+    processes. Pickles as its path, so stores can be handed to worker pools
+    and reopened there.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.index, self.end = _read_index(f, path)
+        self._complex = None
+
+    def __reduce__(self):
+        return (ComplexStore, (self.path,))
+
+    @classmethod
+    def create(cls, path, K=None, labels=None):
+        """New store (replacing any file at `path`), optionally holding K as its first segment"""
+        tmp = path + '.tmp'
+        with open(tmp, 'w+b') as f:
+            f.write(b'\0' * HEADER_SIZE)
+            _commit(f, {'version': VERSION, 'n_vertices': 0, 'segments': []})
+        os.replace(tmp, path)
+        store = cls(path)
+        if K is not None:
+            store.append(K, labels)
+        return store
+
+    @classmethod
+    def open(cls, path, create=True):
+        """Open `path`, creating an empty store if it does not exist and `create`"""
+        if create and not os.path.exists(path):
+            return cls.create(path)
+        return cls(path)
+
+    # ---------- Reading ----------
+
+    @property
+    def segments(self):
+        return self.index['segments']
+
+    @property
+    def n_vertices(self):
+        return self.index['n_vertices']
+
+    def _array(self, entry):
+        offset, dtype, shape = entry
+        if int(np.prod(shape)) == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+
+    def arrays(self, segment):
+        """name -> memory-mapped array of one segment"""
+        return {name: self._array(entry) for name, entry in self.segments[segment]['arrays'].items()}
+
+    def vocabulary(self):
+        parts = []
+        for i, seg in enumerate(self.segments):
+            if 'vocab/offsets' in seg['arrays']:
+                arrays = self.arrays(i)
+                parts.append((arrays['vocab/offsets'], arrays['vocab/data']))
+        return VocabularyTable(parts) if parts else None
+
+    def complex(self):
+        """The stored complex: zero-copy memmaps for one segment, merged for several"""
+        if self._complex is None:
+            segments = [self.arrays(i) for i in range(len(self.segments))]
+            dims = sorted({int(name.split('/')[0]) for seg in segments for name in seg
+                           if not name.startswith('vocab/')})
+            simplices, weights, orientations = {}, {}, {}
+            for d in dims:
+                parts = [seg for seg in segments if f'{d}/rows' in seg]
+                if len(parts) == 1:
+                    seg = parts[0]
+                    simplices[d], orientations[d] = seg[f'{d}/rows'], seg[f'{d}/orientations']
+                    if f'{d}/weights' in seg:
+                        weights[d] = seg[f'{d}/weights']
+                else:
+                    simplices[d], weights[d], orientations[d] = _merge(parts, d, self.n_vertices)
+            self._complex = SimplicialComplex._from_canonical(
+                simplices, weights, orientations, self.n_vertices, self.vocabulary())
+        return self._complex
+
+    @property
+    def nbytes(self):
+        """Bytes of array data on disk"""
+        return sum(int(np.prod(shape)) * np.dtype(dtype).itemsize
+                   for seg in self.segments for _, dtype, shape in seg['arrays'].values())
+
+    def summary(self):
+        counts = {}
+        for seg in self.segments:
+            for name, (_, _, shape) in seg['arrays'].items():
+                if name.endswith('/rows'):
+                    counts[int(name.split('/')[0])] = counts.get(int(name.split('/')[0]), 0) + shape[0]
+        stored = ', '.join(f'{d}:{n:,d}' for d, n in sorted(counts.items()))
+        return (f"{self.path}: format v{self.index['version']}, {self.n_vertices:,d} vertices, "
+                f"{len(self.segments)} segment(s), simplices {{{stored}}}, "
+                f"{self.nbytes / 1e6:.1f} MB of arrays")
+
+    # ---------- Writing ----------
+
+    def _global(self, K, labels):
+        """K with its vertices renumbered to store ids (by label), plus the tokens new to the store"""
+        labels = K.labels if labels is None else labels
+        vocabulary = self.vocabulary()
+        if labels is None:
+            if vocabulary is not None:
+                raise ValueError("store has a vocabulary: appended complexes need vertex labels")
+            return K, [], max(self.n_vertices, K.n_vertices)
+        if vocabulary is None and self.n_vertices:
+            raise ValueError("store has unlabelled vertices: cannot append a labelled complex")
+        ids = vocabulary.ids() if vocabulary is not None else {}
+        new_tokens = []
+        remap = np.empty(len(labels), dtype=np.int64)
+        for i, token in enumerate(str(l) for l in labels):
+            if token not in ids:
+                ids[token] = len(ids)
+                new_tokens.append(token)
+            remap[i] = ids[token]
+        if np.array_equal(remap, np.arange(len(remap))):
+            return K, new_tokens, len(ids)
+        # Renumbering changes the sorted vertex order, so rebuild canonical rows and parities
+        simplices = {d: remap[K.oriented(d)] for d in K.dims}
+        weights = {d: K.weights(d) for d in K.dims if K.weights(d) is not None}
+        G = SimplicialComplex(simplices, weights, n_vertices=len(ids))
+        return G, new_tokens, len(ids)
+
+    def append(self, K, labels=None):
+        """Append complex K (vertices matched to the vocabulary by label) as a new segment"""
+        with _locked(self.path) as f:
+            # Another handle may have appended since this one was opened
+            self.index, self.end = _read_index(f, self.path)
+            self._complex = None
+            K, new_tokens, n_vertices = self._global(K, labels)
+            f.truncate(self.end)  # drop the tail of an append that never committed
+            f.seek(self.end)
+            entries = _write_arrays(f, _segment_arrays(K, new_tokens))
+            index = dict(self.index, n_vertices=n_vertices,
+                         segments=self.segments + [{'arrays': entries, 'added': time.time()}])
+            self.end = _commit(f, index)
+        self.index = index
+        self._complex = None
+        return len(self.segments) - 1
+
+    def compact(self):
+        """Rewrite all segments as one (atomic replace), so the complex loads zero-copy again"""
+        with _locked(self.path) as lock:
+            self.index, self.end = _read_index(lock, self.path)
+            self._complex = None
+            K = self.complex()
+            vocabulary = self.vocabulary()
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w+b') as f:
+                f.write(b'\0' * HEADER_SIZE)
+                entries = _write_arrays(f, _segment_arrays(K, list(vocabulary) if vocabulary else ()))
+                _commit(f, {'version': VERSION, 'n_vertices': self.n_vertices,
+                            'segments': [{'arrays': entries, 'added': time.time()}]})
+            os.replace(tmp, self.path)
+        self.__init__(self.path)
+        return self
+
+
+def _merge(segments, d, n_vertices):
+    """Union of one dimension over segments: weights summed, orientation of the heaviest copy.
+
+    Segments keep only their dominant order, so a merged orientation can differ
+    from one counted over all logs at once when the orders are nearly tied.
+    """
+    rows = np.concatenate([seg[f'{d}/rows'] for seg in segments])
+    weights = np.concatenate([seg[f'{d}/weights'] if f'{d}/weights' in seg
+                              else np.ones(len(seg[f'{d}/rows'])) for seg in segments])
+    orientations = np.concatenate([seg[f'{d}/orientations'] for seg in segments])
+    _, inverse = np.unique(row_keys(rows, n_vertices), return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.lexsort((-weights, inverse))
+    first = order[np.r_[True, inverse[order][1:] != inverse[order][:-1]]]
+    return (np.ascontiguousarray(rows[first], dtype=INDEX_DTYPE),
+            np.bincount(inverse, weights=weights), orientations[first])
+
+
+def open_complex(path):
+    """Shortcut: the SimplicialComplex stored at `path`"""
+    return ComplexStore(path).complex()
+
+# ==================== Benchmark ====================
+
+def _worker_open(store):
+    """Open the store in a worker and touch every edge weight; returns (open s, total s)"""
+    start = time.perf_counter()
+    K = store.complex()
+    opened = time.perf_counter() - start
+    total = float(np.sum(K.weights(1)))
+    return opened, time.perf_counter() - start, total
+
+
+def benchmark(n_simplices=10 ** 7, workers=2, path='complex_store_bench.bin', seed=0):
+    """Write a synthetic complex, then time opening it here and in worker processes"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    rng = np.random.default_rng(seed)
+    n_vertices = max(4, int(np.sqrt(n_simplices)))
+    n_edges, n_triangles = n_simplices // 2, n_simplices // 2
+    edges = rng.integers(n_vertices, size=(n_edges, 2))
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    triangles = rng.integers(n_vertices, size=(n_triangles, 3))
+    triangles = triangles[(triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+                          & (triangles[:, 0] != triangles[:, 2])]
+    K = SimplicialComplex({1: edges, 2: triangles},
+                          weights={1: rng.random(len(edges)), 2: rng.random(len(triangles))},
+                          n_vertices=n_vertices)
+    start = time.perf_counter()
+    store = ComplexStore.create(path, K)
+    written = time.perf_counter() - start
+    size = os.path.getsize(path)
+    print(f"Wrote {len(K):,d} simplices ({size / 1e9:.2f} GB) in {written:.2f}s")
+    try:
+        start = time.perf_counter()
+        L = ComplexStore(path).complex()
+        opened = time.perf_counter() - start
+        print(f"Open in this process: {opened * 1e3:.2f} ms, {L}")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for i, (t_open, t_total, _) in enumerate(pool.map(_worker_open, [store] * workers)):
+                print(f"  worker {i}: open {t_open * 1e3:8.2f} ms, open + read all edge weights {t_total:.2f}s")
+        extra = SimplicialComplex({1: rng.integers(n_vertices, size=(1000, 2))}, n_vertices=n_vertices)
+        start = time.perf_counter()
+        store.append(extra)
+        print(f"Append 1,000 edges: {(time.perf_counter() - start) * 1e3:.2f} ms "
+              f"({len(store.segments)} segments)")
+        start = time.perf_counter()
+        store.complex()
+        print(f"Merged load of {len(store.segments)} segments: {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        store.compact()
+        print(f"Compact: {time.perf_counter() - start:.2f}s; reopen "
+              f"{_worker_open(store)[0] * 1e3:.2f} ms")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Inspect, compact or benchmark complex stores.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('info', help='print the store header summary').add_argument('store')
+    sub.add_parser('compact', help='merge all segments into one').add_argument('store')
+    p_bench = sub.add_parser('benchmark', help='write, open and share a synthetic store')
+    p_bench.add_argument('--simplices', type=float, default=1e7)
+    p_bench.add_argument('--workers', type=int, default=2)
+    p_bench.add_argument('--path', default='complex_store_bench.bin')
+    args = parser.parse_args()
+    if args.command == 'info':
+        print(ComplexStore(args.store).summary())
+    elif args.command == 'compact':
+        start = time.perf_counter()
+        store = ComplexStore(args.store).compact()
+        print(f"✓ Compacted in {time.perf_counter() - start:.2f}s: {store.summary()}")
+    else:
+        benchmark(int(args.simplices), args.workers, args.path)
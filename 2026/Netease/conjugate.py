@@ -0,0 +1,214 @@
+"""
+Sparse conjugate complex construction  K -> K*
+Tokens (simplices of K) and atoms (vertices of K) form a sparse
+token x atom incidence matrix A in CSR form. Transposing it (CSR -> CSC)
+gives every atom's star, the set of tokens containing it; each star is a
+simplex of K*, and the token co-occurrence matrix A A^T (shared-atom counts)
+gives the weighted 1-skeleton of K*. Everything is plain NumPy index
+arithmetic -- no nested Python loops over tokens or atoms.
+Requires: numpy
+Benchmark: python conjugate.py [--tokens 1000000] [--atoms 500000] [--max-degree 100]
+"""
+
+import time
+
+import numpy as np
+
+from simplicial_complex import SimplicialComplex
+
+# ==================== Sparse Helpers ====================
+
+def csr_from_rows(rows):
+    """CSR (indptr, indices) of a list of variable-length index rows"""
+    lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.fromiter((i for r in rows for i in r), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def csr_transpose(indptr, indices, n_cols):
+    """Transpose a binary CSR matrix (equivalently: its CSC form read as CSR)"""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    order = np.argsort(indices, kind='stable')
+    t_indptr = np.zeros(n_cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_cols), out=t_indptr[1:])
+    return t_indptr, rows[order]
+
+
+def gram_offdiag(a_indptr, a_indices, t_indptr, t_indices, max_degree=None, batch=1 << 23):
+    """Upper off-diagonal of A A^T for a binary CSR matrix A, as (pairs (m, 2), counts).
+
+    Row-blocked sparse product (Gustavson): for a block of rows of A, every
+    entry (i, atom) is expanded into the star of that atom from A^T (given as
+    CSR t_indptr/t_indices), keeping partners j > i, and the block's pairs are
+    counted with np.unique. Blocks produce disjoint rows of the result, so
+    peak memory is bounded by `batch` expanded products. Columns of A with
+    more than `max_degree` entries (hub atoms) are skipped.
+    """
+    n = len(a_indptr) - 1
+    degree = np.diff(t_indptr)
+    if max_degree is not None:
+        degree = np.where(degree > max_degree, 0, degree)
+    entry_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(a_indptr))
+    expand = degree[a_indices]
+    cum = np.concatenate([[0], np.cumsum(expand)])
+    pairs, counts = [], []
+    start = 0
+    while start < len(a_indices):
+        # Largest run of whole rows whose expansion fits in the batch
+        stop = int(np.searchsorted(cum, cum[start] + batch, side='right')) - 1
+        stop = max(stop, start + 1)
+        if stop < len(a_indices):
+            stop = max(int(a_indptr[entry_rows[stop]]), int(a_indptr[entry_rows[start] + 1]))
+        lengths = expand[start:stop]
+        total = int(lengths.sum())
+        if total:
+            offsets = np.repeat(t_indptr[a_indices[start:stop]] - (cum[start:stop] - cum[start]), lengths)
+            partners = t_indices[offsets + np.arange(total)]
+            rows = np.repeat(entry_rows[start:stop], lengths)
+            keep = partners > rows
+            uniq, c = np.unique(rows[keep] * n + partners[keep], return_counts=True)
+            pairs.append(uniq)
+            counts.append(c)
+        start = stop
+    keys = np.concatenate(pairs) if pairs else np.empty(0, dtype=np.int64)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+    return np.stack(np.divmod(keys, n), axis=1).reshape(-1, 2), counts
+
+# ==================== Conjugate Complex ====================
+
+class ConjugateComplex:
+    """K* of a token complex K: vertices are tokens, simplices are atom stars.
+
+    tokens : CSR (indptr, indices) token -> atoms, i.e. the incidence matrix A
+    stars  : CSR atom -> tokens, i.e. A^T (each star is a maximal simplex of K*)
+    edges, shared : token pairs with at least one shared atom and the number
+                    of atoms they share (off-diagonal of A A^T)
+    """
+
+    def __init__(self, tokens, n_atoms, atom_labels=None, max_degree=None):
+        self.tokens = tokens
+        self.n_atoms = n_atoms
+        self.n_tokens = len(tokens[0]) - 1
+        self.atom_labels = atom_labels
+        self.max_degree = max_degree
+        start = time.perf_counter()
+        self.stars = csr_transpose(tokens[0], tokens[1], n_atoms)
+        self.edges, self.shared = gram_offdiag(*tokens, *self.stars, max_degree)
+        self.skipped_hubs = int(np.count_nonzero(np.diff(self.stars[0]) > max_degree)) if max_degree else 0
+        self.elapsed = time.perf_counter() - start
+
+    def token_atoms(self, i):
+        indptr, indices = self.tokens
+        return indices[indptr[i]:indptr[i + 1]]
+
+    def star(self, atom):
+        """Tokens containing `atom`: one maximal simplex of K*"""
+        indptr, indices = self.stars
+        return indices[indptr[atom]:indptr[atom + 1]]
+
+    @property
+    def token_labels(self):
+        """Token labels in set notation, e.g. '{a,b}'"""
+        name = (lambda a: str(a)) if self.atom_labels is None else (lambda a: self.atom_labels[a])
+        return ['{' + ','.join(name(a) for a in sorted(self.token_atoms(i).tolist())) + '}'
+                for i in range(self.n_tokens)]
+
+    def edges_with(self, min_shared=1):
+        """K* edges whose tokens share at least `min_shared` atoms, with their counts"""
+        keep = self.shared >= min_shared
+        return self.edges[keep], self.shared[keep]
+
+    def base_complex(self):
+        """The original complex K: the tokens closed under faces"""
+        indptr, indices = self.tokens
+        groups = {}
+        for d in np.unique(np.diff(indptr)).tolist():
+            rows = np.flatnonzero(np.diff(indptr) == d)
+            groups[d - 1] = indices[indptr[rows][:, None] + np.arange(d)]
+        return SimplicialComplex(groups, n_vertices=self.n_atoms, labels=self.atom_labels).closure()
+
+    def to_simplicial_complex(self, max_dim=2, min_shared=1):
+        """K* as a SimplicialComplex over token vertices, truncated at `max_dim`.
+
+        Edges carry their shared-atom count as weight; simplices of dimension
+        >= 2 are the (max_dim+1)-subsets of atom stars. Hub atoms above
+        `max_degree` are skipped here as in the edges.
+        """
+        edges, shared = self.edges_with(min_shared)
+        simplices = {0: np.arange(self.n_tokens)[:, None], 1: edges}
+        indptr, indices = self.stars
+        degree = np.diff(indptr)
+        if self.max_degree is not None:
+            degree = np.where(degree > self.max_degree, 0, degree)
+        for k in range(2, max_dim + 1):
+            parts = []
+            for d in np.unique(degree[degree > k]).tolist():
+                rows = np.flatnonzero(degree == d)
+                block = np.sort(indices[indptr[rows][:, None] + np.arange(d)], axis=1)
+                combos = _combinations(d, k + 1)
+                parts.append(block[:, combos].reshape(-1, k + 1))
+            if parts:
+                simplices[k] = np.concatenate(parts)
+        return SimplicialComplex(simplices, weights={1: shared.astype(float)},
+                                 n_vertices=self.n_tokens, labels=self.token_labels).closure()
+
+
+def _combinations(n, k):
+    """All k-subsets of range(n) as a (C(n, k), k) array, in lexicographic order"""
+    combos = np.arange(n, dtype=np.intp)[:, None]
+    for _ in range(k - 1):
+        # Extend every row by each index above its last one
+        last = combos[:, -1]
+        counts = n - 1 - last
+        starts = np.cumsum(counts) - counts
+        step = np.arange(int(counts.sum()), dtype=np.intp) - np.repeat(starts, counts)
+        combos = np.concatenate([np.repeat(combos, counts, axis=0),
+                                 (np.repeat(last + 1, counts) + step)[:, None]], axis=1)
+    return combos
+
+
+def conjugate_complex(tokens, n_atoms=None, atom_labels=None, max_degree=None):
+    """Build K* from tokens given as atom index rows (lists or an (n, k) array)"""
+    indptr, indices = csr_from_rows(tokens) if not isinstance(tokens, tuple) else tokens
+    if n_atoms is None:
+        n_atoms = int(indices.max()) + 1 if len(indices) else 0
+    return ConjugateComplex((indptr, indices), n_atoms, atom_labels, max_degree)
+
+
+def from_simplicial_complex(K, dims=None, max_degree=None):
+    """K* of a SimplicialComplex: its simplices (of `dims`, default all >= 1) become tokens"""
+    dims = [d for d in K.dims if d >= 1] if dims is None else dims
+    parts = [K.simplices(d) for d in dims]
+    lengths = np.concatenate([np.full(len(p), p.shape[1], dtype=np.int64) for p in parts])
+    indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.concatenate([p.ravel() for p in parts]).astype(np.int64)
+    return ConjugateComplex((indptr, indices), K.n_vertices, K.labels, max_degree)
+
+# ==================== Benchmark ====================
+
+def benchmark(n_tokens=1_000_000, n_atoms=500_000, max_len=5, max_degree=100, seed=0):
+    """K* of random tokens over a large atom vocabulary"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(2, max_len + 1, n_tokens)
+    indptr = np.zeros(n_tokens + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    # Zipf-skewed atoms, as in real vocabularies
+    indices = np.minimum(rng.zipf(1.2, int(indptr[-1])) - 1, n_atoms - 1)
+    kstar = conjugate_complex((indptr, indices), n_atoms, max_degree=max_degree)
+    print(f"{n_tokens:,} tokens over {n_atoms:,} atoms -> K* with {len(kstar.edges):,} edges "
+          f"in {kstar.elapsed:.2f}s ({kstar.skipped_hubs} hub atoms above degree {max_degree} skipped)")
+    return kstar
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark sparse K* construction.')
+    parser.add_argument('--tokens', type=int, default=1_000_000)
+    parser.add_argument('--atoms', type=int, default=500_000)
+    parser.add_argument('--max-degree', type=int, default=100,
+                        help='skip hub atoms contained in more tokens than this')
+    args = parser.parse_args()
+    benchmark(args.tokens, args.atoms, max_degree=args.max_degree)
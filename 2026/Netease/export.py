@@ -0,0 +1,165 @@
+"""
+Single-pass multi-format export for generate_figures.py
+`plt.savefig(..., bbox_inches='tight')` draws every figure twice (once to
+measure the tight bounding box, once to render) and writes one format. The
+export stage measures the tight box once, renders the Agg raster once per
+PNG dpi and encodes it for every PNG target (each with its own zlib
+compression level), and writes SVG/PDF targets with one vector pass each
+against the same box. Bytes and encode time are reported per target.
+PNG is always written: the notes embed it. Vector outputs carry no
+timestamps and fixed SVG ids, so they are reproducible.
+Requires: matplotlib, numpy
+Usage: python generate_figures.py --export png:300:9 svg pdf
+"""
+
+import io
+import os
+import time
+from collections import namedtuple
+
+import matplotlib
+import matplotlib.image as mimage
+import matplotlib.pyplot as plt
+import numpy as np
+
+FORMATS = ('png', 'svg', 'pdf')
+
+# dpi None = savefig.dpi; compress_level None = the PNG encoder's default (6)
+ExportTarget = namedtuple('ExportTarget', ['format', 'dpi', 'compress_level'])
+DEFAULT_TARGETS = (ExportTarget('png', None, None),)
+
+# Vector metadata without creation dates, so repeated exports are byte-identical
+VECTOR_METADATA = {'svg': {'Date': None}, 'pdf': {'CreationDate': None}}
+
+_targets = DEFAULT_TARGETS
+RESULTS = []  # per-target result dicts of this process, drained by take_results()
+
+# ==================== Targets ====================
+
+def parse_target(spec):
+    """'FORMAT[:DPI[:LEVEL]]' -> ExportTarget, e.g. 'png:150:9', 'pdf', 'svg:600'"""
+    fmt, *rest = spec.lower().split(':')
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (choose from {', '.join(FORMATS)})")
+    if len(rest) > 2 or (rest[1:] and fmt != 'png'):
+        raise ValueError(f"bad export target {spec!r}: use FORMAT[:DPI], PNG also takes :LEVEL")
+    dpi = float(rest[0]) if rest and rest[0] else None
+    level = int(rest[1]) if rest[1:] else None
+    if level is not None and not 0 <= level <= 9:
+        raise ValueError(f"PNG compression level must be 0-9, got {level}")
+    return ExportTarget(fmt, dpi, level)
+
+
+def parse_targets(specs):
+    """Targets from CLI specs; a default PNG is added when none is requested"""
+    targets = tuple(dict.fromkeys(parse_target(s) for s in specs or ()))
+    if not any(t.format == 'png' for t in targets):
+        targets = DEFAULT_TARGETS + targets
+    return targets
+
+
+def configure(targets=None):
+    """Set the export targets of this process (None restores the PNG-only default)"""
+    global _targets
+    _targets = tuple(targets) if targets else DEFAULT_TARGETS
+
+
+def current_targets():
+    return _targets
+
+
+def target_paths(output, targets=None):
+    """Output path per target: `output` with the format's extension, '@DPI[-zLEVEL]' for repeats"""
+    stem = os.path.splitext(output)[0]
+    seen, paths = set(), []
+    for t in targets or _targets:
+        suffix = ''
+        if t.format in seen:
+            suffix = f"@{t.dpi or matplotlib.rcParams['savefig.dpi']:g}"
+            suffix += '' if t.compress_level is None else f'-z{t.compress_level}'
+        seen.add(t.format)
+        paths.append(f'{stem}{suffix}.{t.format}')
+    return paths
+
+
+def take_results():
+    """Return and clear the results recorded since the last call"""
+    results = RESULTS[:]
+    del RESULTS[:]
+    return results
+
+# ==================== Export ====================
+
+def tight_bbox(fig, dpi, pad_inches=None):
+    """Padded tight bounding box (inches) from one no-output draw at `dpi`, as savefig measures it"""
+    pad = matplotlib.rcParams['savefig.pad_inches'] if pad_inches is None else pad_inches
+    canvas = fig.canvas
+    manager, canvas.manager = canvas.manager, None  # no GUI resize while the dpi changes
+    original = fig.dpi
+    try:
+        fig.dpi = dpi
+        fig.draw_without_rendering()
+        bbox = fig.get_tightbbox()
+    finally:
+        fig.dpi = original
+        canvas.manager = manager
+    return bbox.padded(pad)
+
+
+def render_rgba(fig, dpi, bbox, facecolor='white'):
+    """One Agg render of the `bbox` region at `dpi`, as an (h, w, 4) uint8 array"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='rgba', dpi=dpi, bbox_inches=bbox, facecolor=facecolor)
+    # Agg truncates the canvas size to whole pixels
+    width, height = int(bbox.width * dpi), int(bbox.height * dpi)
+    return np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(height, width, 4)
+
+
+def export_figure(output, fig=None, targets=None, facecolor='white', pad_inches=None):
+    """Write the figure to every export target derived from the PNG path `output`.
+
+    Returns one dict per target: format, path, dpi, bytes, render and encode
+    seconds (a PNG's shared raster render is charged to the first PNG at
+    that dpi; vector backends draw while encoding, so theirs is all encode).
+    """
+    fig = fig or plt.gcf()
+    targets = targets or _targets
+    default_dpi = matplotlib.rcParams['savefig.dpi']
+    if default_dpi == 'figure':  # matplotlib's default when the repo style is not applied
+        default_dpi = fig.dpi
+    dpis = [t.dpi or default_dpi for t in targets]
+    png_dpis = [d for t, d in zip(targets, dpis) if t.format == 'png']
+    # The box is measured once, at the main PNG's dpi so its pixels match savefig's
+    bbox = tight_bbox(fig, png_dpis[0] if png_dpis else default_dpi, pad_inches)
+    rasters = {}
+    results = []
+    for t, dpi, path in zip(targets, dpis, target_paths(output, targets)):
+        render = 0.0
+        start = time.perf_counter()
+        if t.format == 'png':
+            if dpi not in rasters:
+                rasters[dpi] = render_rgba(fig, dpi, bbox, facecolor)
+                render = time.perf_counter() - start
+                start = time.perf_counter()
+            pil_kwargs = None if t.compress_level is None else {'compress_level': t.compress_level}
+            mimage.imsave(path, rasters[dpi], format='png', origin='upper', dpi=dpi, pil_kwargs=pil_kwargs)
+        else:
+            with matplotlib.rc_context({'svg.hashsalt': 'export'}):
+                fig.savefig(path, format=t.format, dpi=dpi, bbox_inches=bbox, facecolor=facecolor,
+                            metadata=VECTOR_METADATA[t.format])
+        results.append({'format': t.format, 'path': path, 'dpi': dpi,
+                        'compress_level': t.compress_level, 'bytes': os.path.getsize(path),
+                        'render': render, 'encode': time.perf_counter() - start})
+    RESULTS.extend(results)
+    return results
+
+
+def format_results(results):
+    """One-line summary: format, dpi, size and encode time per target"""
+    parts = []
+    for r in results:
+        level = '' if r['compress_level'] is None else f" z{r['compress_level']}"
+        render = f" + render {r['render']:.2f}s" if r['render'] else ''
+        parts.append(f"{r['format']} {r['dpi']:g}dpi{level} {r['bytes'] / 1024:.0f} KB "
+                     f"encode {r['encode']:.2f}s{render}")
+    return ' | '.join(parts)
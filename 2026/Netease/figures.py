@@ -0,0 +1,469 @@
+"""
+Simplicial Complex Category Notes - Figure Drawing Code
+The six figures of the notes, one function per figure writing its PNG (plus
+any configured export targets) to `output`. Importing this module loads
+matplotlib and numpy and applies the shared style; generate_figures.py only
+imports it once a figure is actually rendered.
+All text in English to avoid font issues
+Requires: matplotlib, numpy
+Usage: python generate_figures.py [--only figure3,figure5] [--out DIR]
+"""
+
+import matplotlib.pyplot as plt
+import matplotlib.patches as patches
+from matplotlib.patches import Polygon, FancyBboxPatch, FancyArrowPatch, Circle, Ellipse
+from matplotlib.patches import FancyArrow
+import numpy as np
+
+import bpe_engine
+import complex_draw
+import conjugate
+import homology
+from bpe_engine import BPETrainer
+from conjugate import conjugate_complex
+from export import export_figure
+from homology import Homology
+import panel_templates
+from panel_templates import PanelTemplate, cached, draw_node_motif
+from complex_draw import (draw_edges, draw_labels, draw_simplices, draw_vertices,
+                          draw_weighted_directed_complex)
+import simplicial_complex
+import splitting
+from simplicial_complex import SimplicialComplex
+from splitting import InverseSplitting
+
+def apply_style():
+    """Set matplotlib style for better quality"""
+    plt.style.use('default')
+    plt.rcParams['figure.dpi'] = 150
+    plt.rcParams['savefig.dpi'] = 300
+    plt.rcParams['font.family'] = 'Arial'
+    plt.rcParams['font.size'] = 10
+
+apply_style()
+
+# ==================== Figure 1: Simplicial Complex (Hypergraph) ====================
+
+def figure1_complex():
+    """The full 3-simplex on atoms a, b, c, d, closed under faces"""
+    return SimplicialComplex.from_simplices([[0, 1, 2, 3]], labels=['a', 'b', 'c', 'd'],
+                                            close=True)
+
+def figure1_simplicial_complex(output='images/figure1_simplicial_complex.png'):
+    """Generate simplicial complex visualization as hypergraph"""
+    fig, ax = plt.subplots(figsize=(10, 8))
+    K = figure1_complex()
+    
+    # Define vertices (0-simplices)
+    vertices = np.array([
+        [0, 0],      # a
+        [2, 0],      # b
+        [1, 1.732],  # c
+        [1, 0.577]   # d
+    ])
+    
+    # Draw 3-simplex (tetrahedron) faces with transparency
+    draw_simplices(ax, vertices, K.simplices(2), facecolor='lightblue', alpha=0.1,
+                   edgecolor='lightblue', linewidth=1)
+    
+    # Draw 2-simplex (triangles) - more visible
+    triangles = K.simplices(2)[K.index_of([[0, 1, 2], [0, 1, 3]])]
+    draw_simplices(ax, vertices, triangles, facecolor='lightblue', alpha=0.3,
+                   edgecolor='blue', linewidth=2)
+    
+    # Draw 1-simplex (edges)
+    draw_edges(ax, vertices, K.simplices(1), color='k', linewidth=2)
+    
+    # Draw 0-simplex (vertices)
+    draw_vertices(ax, vertices, size=15, color='k')
+    draw_labels(ax, vertices, K.labels, offset=(0, -0.15), ha='center', va='top',
+                fontsize=14, fontweight='bold')
+    
+    # Add dimension labels
+    ax.text(0.5, 0.3, "0-dim: vertices", fontsize=10, 
+            color='gray', style='italic')
+    ax.text(0.5, 0.5, "1-dim: edges", fontsize=10, 
+            color='gray', style='italic')
+    ax.text(0.5, 0.7, "2-dim: triangles", fontsize=10, 
+            color='gray', style='italic')
+    ax.text(0.5, 0.9, "3-dim: tetrahedron", fontsize=10, 
+            color='gray', style='italic')
+    
+    # Homology over GF(2): Betti numbers, and any 1-cycles that bound nothing
+    H = Homology(K)
+    for cycle in H.cycles(1):
+        draw_edges(ax, vertices, K.simplices(1)[cycle], color='purple', linewidth=3)
+    betti = ', '.join(f'β{k}={b}' for k, b in enumerate(H.betti))
+    ax.text(1, -0.4, f"Betti numbers: {betti}", fontsize=10,
+            ha='center', color='purple')
+    
+    ax.set_xlim(-0.5, 2.5)
+    ax.set_ylim(-0.5, 2.2)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Simplicial Complex (Hypergraph Visualization)', 
+                 fontsize=16, fontweight='bold', pad=20)
+    
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 1: Simplicial Complex")
+
+# ==================== Figure 2: BPE Pushout Process (Hypergraph Iteration) ====================
+
+# Toy corpus whose BPE merge trace is ab, bc, cd, then (ab, c) -> abc
+FIGURE2_CORPUS = {'ab': 5, 'bc': 4, 'cd': 3, 'abc': 2}
+
+def figure2_trace():
+    """Train BPE on the toy corpus: returns (atoms, initial adjacent pairs, merge trace)"""
+    trainer = BPETrainer(FIGURE2_CORPUS)
+    atoms = list(trainer.vocab)
+    pairs = sorted((atoms[a], atoms[b]) for a, b in trainer.counts)
+    return atoms, pairs, trainer.train(len(FIGURE2_CORPUS))
+
+def figure2_bpe_pushout(output='images/figure2_bpe_pushout.png'):
+    """Generate BPE pushout process: showing hypergraph step-by-step aggregation"""
+    fig, axes = plt.subplots(1, 4, figsize=(16, 4))
+    
+    atoms, atom_pairs, trace = figure2_trace()
+    positions = np.array([[i, 0] for i in range(len(atoms))])
+    atom_x = {atom: pos[0] for atom, pos in zip(atoms, positions)}
+    
+    # Step 1: Atoms only
+    ax = axes[0]
+    draw_node_motif(ax, positions, atoms, radius=0.3, color='blue', fontsize=12, fontweight='bold')
+    ax.set_xlim(-0.5, 3.5)
+    ax.set_ylim(-0.5, 0.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 1: Atoms\n(0-simplices)', fontsize=11, fontweight='bold')
+    
+    # Step 2: Add edges
+    ax = axes[1]
+    draw_node_motif(ax, positions, atoms, radius=0.3, color='blue', fontsize=12, fontweight='bold')
+    for left, right in atom_pairs:
+        ax.plot([atom_x[left], atom_x[right]], [0, 0], 
+                'g-', linewidth=4, zorder=1)
+    ax.set_xlim(-0.5, 3.5)
+    ax.set_ylim(-0.5, 0.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 2: Add Edges\n(1-simplices)', fontsize=11, fontweight='bold')
+    
+    # Step 3: Merge to tokens
+    ax = axes[2]
+    # First-generation merges (atom + atom), centred over their atoms
+    token_labels = [step.token for step in trace if step.left in atom_x and step.right in atom_x]
+    token_positions = np.array([[np.mean([atom_x[ch] for ch in label]), 0]
+                                for label in token_labels])
+    for pos, label in zip(token_positions, token_labels):
+        ellipse = Ellipse(pos, 0.8, 0.4, color='purple', zorder=3)
+        ax.add_patch(ellipse)
+        ax.text(pos[0], pos[1], label, ha='center', va='center',
+                fontsize=12, fontweight='bold', color='white', zorder=4)
+    # Show original atoms (faded)
+    for pos, atom in zip(positions, atoms):
+        circle = Circle(pos, 0.2, color='blue', alpha=0.3, zorder=2)
+        ax.add_patch(circle)
+    ax.set_xlim(-0.5, 3.5)
+    ax.set_ylim(-0.5, 0.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 3: Pushout\n(Merge to Tokens)', fontsize=11, fontweight='bold')
+    
+    # Step 4: Higher dimension aggregation
+    ax = axes[3]
+    # The last merge glues the step-3 tokens into one higher-dimensional token
+    big_token = trace[-1].token
+    big_token_pos = np.array([token_positions[:, 0].mean(), 0])
+    # Draw triangle (2-simplex) spanning the outer tokens and raised over the inner one
+    triangle_vertices = np.array([[token_positions[0, 0], -0.3],
+                                  [token_positions[-1, 0], -0.3],
+                                  [token_positions[1:-1, 0].mean(), 0.3]])
+    triangle = Polygon(triangle_vertices, closed=True,
+                      facecolor='orange', alpha=0.5,
+                      edgecolor='orange', linewidth=2, zorder=1)
+    ax.add_patch(triangle)
+    draw_node_motif(ax, [big_token_pos], [big_token], radius=0.4, color='orange',
+                    fontsize=12, fontweight='bold')
+    ax.set_xlim(-0.5, 3.5)
+    ax.set_ylim(-0.5, 0.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 4: Higher Dim\n(2-simplices)', fontsize=11, fontweight='bold')
+    
+    plt.suptitle('BPE Colimit Process: Hypergraph Step-by-Step Aggregation',
+                 fontsize=14, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 2: BPE Pushout Process")
+
+# ==================== Figure 3: Inverse Splitting Pullback Process ====================
+
+# Global complex ABC with support weights; the pullback filter keeps support >= 2
+FIGURE3_CLUSTERS = [[0, 1, 2], [0, 1], [1, 2], [0, 2], [0], [1], [2]]
+FIGURE3_SUPPORT = [1, 3, 3, 1, 2, 1, 1]
+FIGURE3_THRESHOLD = 2
+FIGURE3_POSITIONS = np.array([[0.5, 0], [2, 0], [1.25, 1.2]])
+
+def figure3_trace():
+    """Run the inverse splitting of the figure3 complex; returns the engine with its trace"""
+    engine = InverseSplitting(FIGURE3_CLUSTERS, FIGURE3_SUPPORT, atom_labels=['A', 'B', 'C'])
+    engine.run(FIGURE3_THRESHOLD)
+    return engine
+
+def cluster_slots(n, slots):
+    """Hand-placed box centres for the first clusters, then a grid below them"""
+    extra = [(0.4 + 0.6 * (i % 3), -0.2 - 0.35 * (i // 3)) for i in range(max(0, n - len(slots)))]
+    return [np.array(p) for p in list(slots)[:n] + extra]
+
+def draw_cluster_boxes(ax, names, slots, width, height, facecolor, edgecolor, alpha, fontsize):
+    """Rounded boxes labelled with cluster names"""
+    for pos, label in zip(cluster_slots(len(names), slots), names):
+        rect = FancyBboxPatch((pos[0]-width/2, pos[1]-height/2), width, height,
+                              boxstyle="round,pad=0.05",
+                              facecolor=facecolor, alpha=alpha,
+                              edgecolor=edgecolor, linewidth=2)
+        ax.add_patch(rect)
+        ax.text(pos[0], pos[1], label, ha='center', va='center',
+                fontsize=fontsize, fontweight='bold', color='black')
+
+def figure3_inverse_splitting_pullback(output='images/figure3_inverse_splitting_pullback.png'):
+    """Generate inverse splitting pullback process: showing hypergraph step-by-step decomposition"""
+    fig, axes = plt.subplots(1, 4, figsize=(16, 4))
+    engine = figure3_trace()
+    first = engine.trace[0]
+    triangle_vertices = FIGURE3_POSITIONS
+    labels = engine.atom_labels
+    
+    # Step 1: the global complex (maximal clusters)
+    ax = axes[0]
+    roots = engine.atoms(engine.roots)
+    draw_simplices(ax, triangle_vertices, [r for r in roots if len(r) == 3],
+                   facecolor='orange', alpha=0.4, edgecolor='orange', linewidth=2)
+    draw_vertices(ax, triangle_vertices, radius=0.15, color='orange', zorder=3)
+    draw_labels(ax, triangle_vertices, labels, ha='center', va='center',
+                fontsize=12, fontweight='bold', color='white', zorder=4)
+    ax.set_xlim(-0.5, 2.5)
+    ax.set_ylim(-0.5, 1.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 1: Global Complex\n(2-simplex)', fontsize=11, fontweight='bold')
+    
+    # Step 2: Decompose to faces (the first iteration's candidates)
+    ax = axes[1]
+    faces = engine.atoms(first.candidates)
+    draw_edges(ax, triangle_vertices, [f for f in faces if len(f) == 2], color='g',
+               linewidth=3, zorder=1)
+    for face in faces:
+        mid = triangle_vertices[face].mean(axis=0)
+        ax.text(mid[0], mid[1]+0.1, ''.join(labels[i] for i in face), ha='center', va='bottom',
+                fontsize=10, color='green', fontweight='bold')
+    draw_vertices(ax, triangle_vertices, radius=0.12, color='orange', alpha=0.6, zorder=2)
+    draw_labels(ax, triangle_vertices, labels, ha='center', va='center',
+                fontsize=11, fontweight='bold', color='white', zorder=3)
+    ax.set_xlim(-0.5, 2.5)
+    ax.set_ylim(-0.5, 1.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 2: Decompose to Edges\n(1-simplices)', fontsize=11, fontweight='bold')
+    
+    # Step 3: Pullback (clusters passing the support filter)
+    ax = axes[2]
+    draw_cluster_boxes(ax, engine.names(first.kept), [(0.5, 0.3), (1.25, 0.6)],
+                       0.6, 0.3, 'lightgreen', 'green', 0.6, 10)
+    ax.set_xlim(-0.5, 2.5)
+    ax.set_ylim(-0.5, 1.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 3: Pullback\n(Filter Clusters)', fontsize=11, fontweight='bold')
+    
+    # Step 4: Minimal clusters (the limit of the iteration)
+    ax = axes[3]
+    draw_cluster_boxes(ax, engine.names(engine.limit), [(0.5, 0.2), (1.25, 0.4), (0.875, 0.8)],
+                       0.5, 0.24, 'lightblue', 'blue', 0.7, 9)
+    ax.set_xlim(-0.5, 2.5)
+    ax.set_ylim(-0.5, 1.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Step 4: Minimal Clusters\n(Limit Object)', fontsize=11, fontweight='bold')
+    
+    plt.suptitle('Inverse Splitting Limit Process: Hypergraph Step-by-Step Decomposition',
+                 fontsize=14, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 3: Inverse Splitting Pullback Process")
+
+# ==================== Figure 4: Conjugate Complex Construction ====================
+
+def conjugate_example():
+    """Atoms a, b, c with tokens {a,b}, {b,c}, {a,b,c}, and the conjugate complex K*"""
+    return conjugate_complex([[0, 1], [1, 2], [0, 1, 2]], atom_labels=['a', 'b', 'c'])
+
+# Hand-placed panel coordinates: atoms of K, then tokens of K* (vertices of K*)
+ATOM_POSITIONS = np.array([[0.5, 0], [1.5, 0], [1, 0.866]])
+TOKEN_POSITIONS = np.array([[0.5, 0.2], [1.5, 0.2], [1, 0.866]])
+
+# K* edges drawn in the figures: token pairs sharing at least this many atoms
+KSTAR_MIN_SHARED = 2
+
+# Axes setup shared by the K and K* panels
+PANEL_AXES = {'xlim': (-0.3, 2.3), 'ylim': (-0.5, 1.5), 'aspect': 'equal',
+              'title_kw': {'fontsize': 11, 'fontweight': 'bold'}}
+
+def original_panel_template(annotate=False):
+    """Panel 'Original Complex K': the tokens' closure drawn over the atoms (built once)"""
+    def build():
+        K = conjugate_example().base_complex()
+        calls = [
+            ('faces', 'draw_simplices', (K.simplices(2),),
+             dict(facecolor='lightblue', alpha=0.3, edgecolor='blue', linewidth=2)),
+            ('edges', 'draw_edges', (K.simplices(1),), dict(color='b', linewidth=2)),
+            ('atoms', 'draw_vertices', (), dict(radius=0.12, color='blue', zorder=3)),
+            ('labels', 'draw_labels', (K.labels,),
+             dict(offset=(0, -0.15), ha='center', va='top', fontsize=11, fontweight='bold', color='blue')),
+        ]
+        if annotate:
+            for tri in K.simplices(2):
+                center = ATOM_POSITIONS[tri].mean(axis=0)
+                calls.append(('annotation', 'text', (center[0], 0.5, '{' + ','.join(K.labels[i] for i in tri) + '}'),
+                              dict(ha='center', va='center', fontsize=10, color='blue', style='italic')))
+        return PanelTemplate('original', ATOM_POSITIONS, calls,
+                             {**PANEL_AXES, 'title': 'Original Complex $K$\nVertices=Atoms, Simplices=Tokens'})
+    return cached(('original-K', annotate), build)
+
+def conjugate_panel_template(annotate=False):
+    """Panel 'Conjugate Complex K*': tokens as vertices, shared-atom edges dashed (built once)"""
+    def build():
+        kstar = conjugate_example()
+        edges, _ = kstar.edges_with(KSTAR_MIN_SHARED)
+        calls = [
+            ('tokens', 'draw_vertices', (), dict(radius=0.15, color='purple', zorder=3)),
+            ('labels', 'draw_labels', (kstar.token_labels,),
+             dict(ha='center', va='center', fontsize=10, fontweight='bold', color='white', zorder=4)),
+            ('edges', 'draw_edges', (edges,), dict(color='purple', linewidth=2, linestyle='--', zorder=1)),
+        ]
+        if annotate:
+            calls.append(('annotation', 'text', (1, 0.5, "Atom Clusters"),
+                          dict(ha='center', va='center', fontsize=10, color='purple', style='italic')))
+        return PanelTemplate('conjugate', TOKEN_POSITIONS, calls,
+                             {**PANEL_AXES, 'title': 'Conjugate Complex $K^*$\nVertices=Tokens, Simplices=Atom Clusters'})
+    return cached(('conjugate-K*', annotate), build)
+
+def draw_original_panel(ax, annotate=False, offset=(0, 0), overrides=None):
+    return original_panel_template(annotate).draw(ax, offset, overrides)
+
+def draw_conjugate_panel(ax, annotate=False, offset=(0, 0), overrides=None):
+    return conjugate_panel_template(annotate).draw(ax, offset, overrides)
+
+def figure4_conjugate_complex(output='images/figure4_conjugate_complex.png'):
+    """Generate conjugate complex construction visualization"""
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    
+    # Left: Original complex K
+    draw_original_panel(axes[0], annotate=True)
+    
+    # Right: Conjugate complex K*
+    draw_conjugate_panel(axes[1], annotate=True)
+    
+    # Add transformation arrow
+    fig.text(0.5, 0.5, "Vertex↔Simplex\nReversal", 
+             ha='center', va='center', fontsize=12, 
+             fontweight='bold', color='red',
+             bbox=dict(boxstyle='round', facecolor='white', 
+                      edgecolor='red', linewidth=2))
+    
+    plt.suptitle('Conjugate Complex Construction: Vertex-Simplex Reversal',
+                 fontsize=14, fontweight='bold', y=0.98)
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 4: Conjugate Complex Construction")
+
+# ==================== Figure 5: Weighted Directed Complex ====================
+
+def figure5_complex():
+    """Weighted directed complex on items 1-4: temporal edges plus one directed triangle"""
+    edges = [
+        ((0, 1), 0.8),
+        ((1, 2), 0.6),
+        ((2, 0), 0.4),
+        ((1, 3), 0.7),
+        ((3, 2), 0.5)
+    ]
+    return SimplicialComplex(
+        {1: [e for e, _ in edges], 2: [(0, 1, 2)]},
+        weights={1: [w for _, w in edges]},
+        labels=['1', '2', '3', '4'])
+
+def figure5_weighted_directed_complex(output='images/figure5_weighted_directed_complex.png'):
+    """Generate weighted directed complex visualization"""
+    fig, ax = plt.subplots(figsize=(10, 8))
+    K = figure5_complex()
+    
+    # Define node positions (items)
+    node_pos = np.array([
+        [0, 0],      # Item 1
+        [2, 0],      # Item 2
+        [1, 1.732],  # Item 3
+        [3, 1.732]   # Item 4
+    ])
+    
+    # Draw nodes, directed edges (stopping at the node rim) with weight labels,
+    # and the 2-simplex (directed triangle)
+    draw_weighted_directed_complex(ax, K, node_pos, node_label_fmt='Item {}')
+    ax.text(1, 0.6, "Directed Triangle\n(2-simplex)", ha='center', va='center',
+            fontsize=9, color='green', style='italic')
+    
+    ax.text(1.5, -0.8, "Directed edges show temporal relations: Item i → Item j",
+            ha='center', va='center', fontsize=10, color='gray', style='italic')
+    ax.text(1.5, -1.1, "Weights w represent co-occurrence frequency (AEP convergence)",
+            ha='center', va='center', fontsize=10, color='gray', style='italic')
+    
+    ax.set_xlim(-0.5, 3.5)
+    ax.set_ylim(-1.5, 2.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title('Weighted Directed Complex: From Interaction Sequences to Global Complex',
+                 fontsize=14, fontweight='bold', pad=20)
+    
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 5: Weighted Directed Complex")
+
+# ==================== Figure 6: Conjugate Transformation ====================
+
+def figure6_conjugate_transformation(output='images/figure6_conjugate_transformation.png'):
+    """Generate conjugate complex hypergraph transformation"""
+    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    
+    # Left: Original complex K
+    draw_original_panel(axes[0])
+    
+    # Middle: Transformation arrow
+    ax = axes[1]
+    ax.arrow(0.3, 0.5, 0.4, 0, head_width=0.1, head_length=0.1,
+             fc='red', ec='red', linewidth=3, zorder=2)
+    ax.arrow(0.7, 0.5, -0.4, 0, head_width=0.1, head_length=0.1,
+             fc='red', ec='red', linewidth=3, zorder=2)
+    ax.text(0.5, 0.5, "Vertex↔Simplex\nReversal", ha='center', va='center',
+            fontsize=12, fontweight='bold', color='red',
+            bbox=dict(boxstyle='round', facecolor='white',
+                     edgecolor='red', linewidth=2))
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    
+    # Right: Conjugate complex K*
+    draw_conjugate_panel(axes[2])
+    
+    plt.suptitle('Conjugate Complex Construction: Hypergraph Vertex-Simplex Reversal',
+                 fontsize=14, fontweight='bold', y=0.98)
+    plt.tight_layout()
+    export_figure(output)
+    plt.close()
+    print("✓ Generated Figure 6: Conjugate Transformation")
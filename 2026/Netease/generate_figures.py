@@ -2,564 +2,366 @@
 Simplicial Complex Category Notes - Figure Generation Script
 Using matplotlib for PNG export (no external dependencies needed)
 All text in English to avoid font issues
+The figure registry below is plain data: matplotlib, numpy and the drawing
+code in figures.py are only imported (and the style applied) once a figure is
+rendered, so listing or selecting figures starts in milliseconds.
 Requires: matplotlib, numpy
 Install: pip install matplotlib numpy
+Usage: python generate_figures.py [--list] [--only figure3,figure5] [--out DIR] [--jobs N]
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import Polygon, FancyBboxPatch, FancyArrowPatch, Circle, Ellipse
-from matplotlib.patches import FancyArrow
-import numpy as np
+import argparse
+import importlib
+import inspect
 import os
+import sys
+import time
+import traceback
+import types
+from collections import namedtuple
+
+import numpy as np
+
+# ==================== Figure Registry ====================
+
+# A registered figure: drawing function in figures.py, output file name, the other
+# figures.py names its cache key depends on (dependencies() adds what they reach),
+# and a title for --list
+FigureEntry = namedtuple('FigureEntry', ['name', 'func', 'filename', 'inputs', 'title'])
+
+# A loaded figure job: `inputs` lists the extra data/helpers its cache key depends on
+FigureSpec = namedtuple('FigureSpec', ['name', 'func', 'output', 'inputs'])
+
+# Shared K / K* panels behind figures 4 and 6
+CONJUGATE_INPUTS = ('conjugate_example', 'original_panel_template', 'conjugate_panel_template',
+                    'draw_original_panel', 'draw_conjugate_panel', 'ATOM_POSITIONS', 'TOKEN_POSITIONS',
+                    'KSTAR_MIN_SHARED', 'PANEL_AXES', 'conjugate', 'complex_draw', 'simplicial_complex',
+                    'panel_templates')
+
+# Independent figure jobs, in serial build order
+REGISTRY = [
+    FigureEntry('figure1', 'figure1_simplicial_complex', 'figure1_simplicial_complex.png',
+                ('figure1_complex', 'complex_draw', 'simplicial_complex', 'homology'),
+                'Simplicial Complex'),
+    FigureEntry('figure2', 'figure2_bpe_pushout', 'figure2_bpe_pushout.png',
+                ('figure2_trace', 'FIGURE2_CORPUS', 'bpe_engine', 'panel_templates'),
+                'BPE Pushout Process'),
+    FigureEntry('figure3', 'figure3_inverse_splitting_pullback', 'figure3_inverse_splitting_pullback.png',
+                ('figure3_trace', 'cluster_slots', 'draw_cluster_boxes', 'FIGURE3_CLUSTERS', 'FIGURE3_SUPPORT',
+                 'FIGURE3_THRESHOLD', 'FIGURE3_POSITIONS', 'splitting', 'conjugate', 'complex_draw'),
+                'Inverse Splitting Pullback Process'),
+    FigureEntry('figure4', 'figure4_conjugate_complex', 'figure4_conjugate_complex.png',
+                CONJUGATE_INPUTS, 'Conjugate Complex Construction'),
+    FigureEntry('figure5', 'figure5_weighted_directed_complex', 'figure5_weighted_directed_complex.png',
+                ('figure5_complex', 'complex_draw', 'simplicial_complex'),
+                'Weighted Directed Complex'),
+    FigureEntry('figure6', 'figure6_conjugate_transformation', 'figure6_conjugate_transformation.png',
+                CONJUGATE_INPUTS, 'Conjugate Transformation'),
+]
+REGISTERED = {entry.name: entry for entry in REGISTRY}
+
+# Default output directory; the render cache manifest is kept next to it
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = 'images'
+CACHE_MANIFEST = 'render_cache.json'
+
+_out_dir = OUT_DIR
+_specs = None  # FigureSpecs of the loaded drawing code
+figures = None  # the figures module, once loaded
+
+def set_output_dir(out_dir=OUT_DIR):
+    """Write figures to `out_dir` (FIGURES / FIGURE_SPECS follow on next use)"""
+    global _out_dir, _specs
+    _out_dir, _specs = out_dir, None
+
+def output_path(entry, out_dir=None):
+    return os.path.join(out_dir or _out_dir, entry.filename)
+
+def manifest_path(out_dir=None):
+    """Render cache manifest next to the output directory (render_cache.json for images/).
+
+    Sibling output directories share it; its entries are keyed by output path.
+    """
+    return os.path.join(os.path.dirname(os.path.normpath(out_dir or _out_dir)), CACHE_MANIFEST)
+
+def select(only=None):
+    """Registered names in build order, restricted to the comma-separated `only` list"""
+    if only is None:
+        return list(REGISTERED)
+    wanted = {name.strip() for name in only.split(',') if name.strip()}
+    if not wanted:
+        raise ValueError(f"no figures selected by {only!r}; registered: {', '.join(REGISTERED)}")
+    unknown = sorted(wanted - set(REGISTERED))
+    if unknown:
+        raise ValueError(f"unknown figure(s) {', '.join(unknown)}; registered: {', '.join(REGISTERED)}")
+    return [name for name in REGISTERED if name in wanted]
+
+# Values of figures.py that enter a cache key as data (others are code, or not hashable stably)
+DATA_TYPES = (np.ndarray, list, tuple, dict, str, int, float, bool)
+
+def _is_local(module):
+    """True for modules loaded from this directory"""
+    path = getattr(module, '__file__', None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) == HERE
+
+def _code_names(code):
+    """Global names used by a code object and the functions nested in it"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _module_imports(module):
+    """Local modules whose names `module` imports"""
+    used = set()
+    for value in vars(module).values():
+        owner = value if isinstance(value, types.ModuleType) else sys.modules.get(getattr(value, '__module__', None))
+        if owner is not None and owner is not module and _is_local(owner):
+            used.add(owner)
+    return used
+
+def dependencies(func):
+    """What a figure function's output depends on beyond its own source.
 
-# Create images directory
-os.makedirs('images', exist_ok=True)
-
-# Set matplotlib style for better quality
-plt.style.use('default')
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.family'] = 'Arial'
-plt.rcParams['font.size'] = 10
-
-# ==================== Figure 1: Simplicial Complex (Hypergraph) ====================
-
-def figure1_simplicial_complex():
-    """Generate simplicial complex visualization as hypergraph"""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Define vertices (0-simplices)
-    vertices = np.array([
-        [0, 0],      # a
-        [2, 0],      # b
-        [1, 1.732],  # c
-        [1, 0.577]   # d
-    ])
-    labels = ['a', 'b', 'c', 'd']
-    
-    # Draw 3-simplex (tetrahedron) faces with transparency
-    tetra_faces = [
-        [0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]
-    ]
-    for face in tetra_faces:
-        triangle = Polygon(vertices[face], closed=True, 
-                          facecolor='lightblue', alpha=0.1,
-                          edgecolor='lightblue', linewidth=1)
-        ax.add_patch(triangle)
-    
-    # Draw 2-simplex (triangles) - more visible
-    triangles = [
-        [0, 1, 2], [0, 1, 3]
-    ]
-    for tri in triangles:
-        triangle = Polygon(vertices[tri], closed=True,
-                          facecolor='lightblue', alpha=0.3,
-                          edgecolor='blue', linewidth=2)
-        ax.add_patch(triangle)
-    
-    # Draw 1-simplex (edges)
-    edges = [
-        (0, 1), (1, 2), (2, 0),
-        (0, 3), (1, 3), (2, 3)
-    ]
-    for i, j in edges:
-        ax.plot([vertices[i][0], vertices[j][0]], 
-                [vertices[i][1], vertices[j][1]], 
-                'k-', linewidth=2)
-    
-    # Draw 0-simplex (vertices)
-    for i, (v, label) in enumerate(zip(vertices, labels)):
-        ax.plot(v[0], v[1], 'ko', markersize=15)
-        ax.text(v[0], v[1]-0.15, label, ha='center', va='top',
-                fontsize=14, fontweight='bold')
-    
-    # Add dimension labels
-    ax.text(0.5, 0.3, "0-dim: vertices", fontsize=10, 
-            color='gray', style='italic')
-    ax.text(0.5, 0.5, "1-dim: edges", fontsize=10, 
-            color='gray', style='italic')
-    ax.text(0.5, 0.7, "2-dim: triangles", fontsize=10, 
-            color='gray', style='italic')
-    ax.text(0.5, 0.9, "3-dim: tetrahedron", fontsize=10, 
-            color='gray', style='italic')
-    
-    ax.set_xlim(-0.5, 2.5)
-    ax.set_ylim(-0.5, 2.2)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Simplicial Complex (Hypergraph Visualization)', 
-                 fontsize=16, fontweight='bold', pad=20)
-    
-    plt.tight_layout()
-    plt.savefig('images/figure1_simplicial_complex.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 1: Simplicial Complex")
-
-# ==================== Figure 2: BPE Pushout Process (Hypergraph Iteration) ====================
-
-def figure2_bpe_pushout():
-    """Generate BPE pushout process: showing hypergraph step-by-step aggregation"""
-    fig, axes = plt.subplots(1, 4, figsize=(16, 4))
-    
-    atoms = ['a', 'b', 'c', 'd']
-    positions = np.array([[0, 0], [1, 0], [2, 0], [3, 0]])
-    
-    # Step 1: Atoms only
-    ax = axes[0]
-    for pos, atom in zip(positions, atoms):
-        circle = Circle(pos, 0.3, color='blue', zorder=3)
-        ax.add_patch(circle)
-        ax.text(pos[0], pos[1], atom, ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white', zorder=4)
-    ax.set_xlim(-0.5, 3.5)
-    ax.set_ylim(-0.5, 0.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 1: Atoms\n(0-simplices)', fontsize=11, fontweight='bold')
-    
-    # Step 2: Add edges
-    ax = axes[1]
-    for pos, atom in zip(positions, atoms):
-        circle = Circle(pos, 0.3, color='blue', zorder=3)
-        ax.add_patch(circle)
-        ax.text(pos[0], pos[1], atom, ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white', zorder=4)
-    for i in range(len(positions) - 1):
-        ax.plot([positions[i][0], positions[i+1][0]], 
-                [positions[i][1], positions[i+1][1]], 
-                'g-', linewidth=4, zorder=1)
-    ax.set_xlim(-0.5, 3.5)
-    ax.set_ylim(-0.5, 0.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 2: Add Edges\n(1-simplices)', fontsize=11, fontweight='bold')
-    
-    # Step 3: Merge to tokens
-    ax = axes[2]
-    token_positions = np.array([[0.5, 0], [1.5, 0], [2.5, 0]])
-    token_labels = ['ab', 'bc', 'cd']
-    for pos, label in zip(token_positions, token_labels):
-        ellipse = Ellipse(pos, 0.8, 0.4, color='purple', zorder=3)
-        ax.add_patch(ellipse)
-        ax.text(pos[0], pos[1], label, ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white', zorder=4)
-    # Show original atoms (faded)
-    for pos, atom in zip(positions, atoms):
-        circle = Circle(pos, 0.2, color='blue', alpha=0.3, zorder=2)
-        ax.add_patch(circle)
-    ax.set_xlim(-0.5, 3.5)
-    ax.set_ylim(-0.5, 0.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 3: Pushout\n(Merge to Tokens)', fontsize=11, fontweight='bold')
-    
-    # Step 4: Higher dimension aggregation
-    ax = axes[3]
-    big_token_pos = np.array([1.5, 0])
-    # Draw triangle (2-simplex)
-    triangle_vertices = np.array([[0.5, -0.3], [2.5, -0.3], [1.5, 0.3]])
-    triangle = Polygon(triangle_vertices, closed=True,
-                      facecolor='orange', alpha=0.5,
-                      edgecolor='orange', linewidth=2, zorder=1)
-    ax.add_patch(triangle)
-    circle = Circle(big_token_pos, 0.4, color='orange', zorder=3)
-    ax.add_patch(circle)
-    ax.text(big_token_pos[0], big_token_pos[1], 'abc', ha='center', va='center',
-            fontsize=12, fontweight='bold', color='white', zorder=4)
-    ax.set_xlim(-0.5, 3.5)
-    ax.set_ylim(-0.5, 0.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 4: Higher Dim\n(2-simplices)', fontsize=11, fontweight='bold')
-    
-    plt.suptitle('BPE Colimit Process: Hypergraph Step-by-Step Aggregation',
-                 fontsize=14, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig('images/figure2_bpe_pushout.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 2: BPE Pushout Process")
-
-# ==================== Figure 3: Inverse Splitting Pullback Process ====================
-
-def figure3_inverse_splitting_pullback():
-    """Generate inverse splitting pullback process: showing hypergraph step-by-step decomposition"""
-    fig, axes = plt.subplots(1, 4, figsize=(16, 4))
-    
-    # Step 1: 2-simplex (triangle)
-    ax = axes[0]
-    triangle_vertices = np.array([[0.5, 0], [2, 0], [1.25, 1.2]])
-    labels = ['A', 'B', 'C']
-    triangle = Polygon(triangle_vertices, closed=True,
-                      facecolor='orange', alpha=0.4,
-                      edgecolor='orange', linewidth=2)
-    ax.add_patch(triangle)
-    for v, label in zip(triangle_vertices, labels):
-        circle = Circle(v, 0.15, color='orange', zorder=3)
-        ax.add_patch(circle)
-        ax.text(v[0], v[1], label, ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white', zorder=4)
-    ax.set_xlim(-0.5, 2.5)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 1: Global Complex\n(2-simplex)', fontsize=11, fontweight='bold')
-    
-    # Step 2: Decompose to edges
-    ax = axes[1]
-    edges = [
-        (triangle_vertices[0], triangle_vertices[1], 'AB'),
-        (triangle_vertices[1], triangle_vertices[2], 'BC'),
-        (triangle_vertices[2], triangle_vertices[0], 'CA')
-    ]
-    for start, end, label in edges:
-        ax.plot([start[0], end[0]], [start[1], end[1]], 
-                'g-', linewidth=3, zorder=1)
-        mid = (start + end) / 2
-        ax.text(mid[0], mid[1]+0.1, label, ha='center', va='bottom',
-                fontsize=10, color='green', fontweight='bold')
-    for v, label in zip(triangle_vertices, labels):
-        circle = Circle(v, 0.12, color='orange', alpha=0.6, zorder=2)
-        ax.add_patch(circle)
-        ax.text(v[0], v[1], label, ha='center', va='center',
-                fontsize=11, fontweight='bold', color='white', zorder=3)
-    ax.set_xlim(-0.5, 2.5)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 2: Decompose to Edges\n(1-simplices)', fontsize=11, fontweight='bold')
-    
-    # Step 3: Pullback (filter clusters)
-    ax = axes[2]
-    clusters = [
-        (np.array([0.5, 0.3]), '{A,B}'),
-        (np.array([1.25, 0.6]), '{B,C}')
-    ]
-    for pos, label in clusters:
-        rect = FancyBboxPatch((pos[0]-0.3, pos[1]-0.15), 0.6, 0.3,
-                              boxstyle="round,pad=0.05",
-                              facecolor='lightgreen', alpha=0.6,
-                              edgecolor='green', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(pos[0], pos[1], label, ha='center', va='center',
-                fontsize=10, fontweight='bold', color='black')
-    ax.set_xlim(-0.5, 2.5)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 3: Pullback\n(Filter Clusters)', fontsize=11, fontweight='bold')
-    
-    # Step 4: Minimal clusters
-    ax = axes[3]
-    final_clusters = [
-        (np.array([0.5, 0.2]), '{A,B}'),
-        (np.array([1.25, 0.4]), '{B,C}'),
-        (np.array([0.875, 0.8]), '{A}')
-    ]
-    for pos, label in final_clusters:
-        rect = FancyBboxPatch((pos[0]-0.25, pos[1]-0.12), 0.5, 0.24,
-                              boxstyle="round,pad=0.05",
-                              facecolor='lightblue', alpha=0.7,
-                              edgecolor='blue', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(pos[0], pos[1], label, ha='center', va='center',
-                fontsize=9, fontweight='bold', color='black')
-    ax.set_xlim(-0.5, 2.5)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Step 4: Minimal Clusters\n(Limit Object)', fontsize=11, fontweight='bold')
-    
-    plt.suptitle('Inverse Splitting Limit Process: Hypergraph Step-by-Step Decomposition',
-                 fontsize=14, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig('images/figure3_inverse_splitting_pullback.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 3: Inverse Splitting Pullback Process")
-
-# ==================== Figure 4: Conjugate Complex Construction ====================
-
-def figure4_conjugate_complex():
-    """Generate conjugate complex construction visualization"""
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-    
-    # Left: Original complex K
-    ax = axes[0]
-    vertices_k = np.array([[0.5, 0], [1.5, 0], [1, 0.866]])
-    labels_k = ['a', 'b', 'c']
-    
-    # Draw triangle
-    triangle = Polygon(vertices_k, closed=True,
-                      facecolor='lightblue', alpha=0.3,
-                      edgecolor='blue', linewidth=2)
-    ax.add_patch(triangle)
-    # Draw edges
-    for i in range(3):
-        ax.plot([vertices_k[i, 0], vertices_k[(i+1)%3, 0]],
-                [vertices_k[i, 1], vertices_k[(i+1)%3, 1]],
-                'b-', linewidth=2)
-    # Draw vertices
-    for v, label in zip(vertices_k, labels_k):
-        circle = Circle(v, 0.12, color='blue', zorder=3)
-        ax.add_patch(circle)
-        ax.text(v[0], v[1]-0.15, label, ha='center', va='top',
-                fontsize=11, fontweight='bold', color='blue')
-    ax.text(1, 0.5, "{a,b,c}", ha='center', va='center',
-            fontsize=10, color='blue', style='italic')
-    ax.set_xlim(-0.3, 2.3)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Original Complex $K$\nVertices=Atoms, Simplices=Tokens',
-                 fontsize=11, fontweight='bold')
-    
-    # Right: Conjugate complex K*
-    ax = axes[1]
-    kstar_vertices = [
-        (np.array([0.5, 0.2]), '{a,b}'),
-        (np.array([1.5, 0.2]), '{b,c}'),
-        (np.array([1, 0.866]), '{a,b,c}')
-    ]
-    
-    for pos, label in kstar_vertices:
-        circle = Circle(pos, 0.15, color='purple', zorder=3)
-        ax.add_patch(circle)
-        ax.text(pos[0], pos[1], label, ha='center', va='center',
-                fontsize=10, fontweight='bold', color='white', zorder=4)
-    
-    # Draw edges in K*
-    edges_kstar = [
-        (kstar_vertices[0][0], kstar_vertices[2][0]),
-        (kstar_vertices[1][0], kstar_vertices[2][0])
-    ]
-    for start, end in edges_kstar:
-        ax.plot([start[0], end[0]], [start[1], end[1]],
-                'purple', linewidth=2, linestyle='--', zorder=1)
-    
-    ax.text(1, 0.5, "Atom Clusters", ha='center', va='center',
-            fontsize=10, color='purple', style='italic')
-    ax.set_xlim(-0.3, 2.3)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Conjugate Complex $K^*$\nVertices=Tokens, Simplices=Atom Clusters',
-                 fontsize=11, fontweight='bold')
-    
-    # Add transformation arrow
-    fig.text(0.5, 0.5, "Vertex↔Simplex\nReversal", 
-             ha='center', va='center', fontsize=12, 
-             fontweight='bold', color='red',
-             bbox=dict(boxstyle='round', facecolor='white', 
-                      edgecolor='red', linewidth=2))
-    
-    plt.suptitle('Conjugate Complex Construction: Vertex-Simplex Reversal',
-                 fontsize=14, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig('images/figure4_conjugate_complex.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 4: Conjugate Complex Construction")
-
-# ==================== Figure 5: Weighted Directed Complex ====================
-
-def figure5_weighted_directed_complex():
-    """Generate weighted directed complex visualization"""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Define node positions (items)
-    nodes = {
-        '1': np.array([0, 0]),
-        '2': np.array([2, 0]),
-        '3': np.array([1, 1.732]),
-        '4': np.array([3, 1.732])
-    }
-    
-    # Draw nodes
-    for node_id, pos in nodes.items():
-        circle = Circle(pos, 0.2, color='orange', 
-                       edgecolor='darkorange', linewidth=2, zorder=3)
-        ax.add_patch(circle)
-        ax.text(pos[0], pos[1], f'Item {node_id}', ha='center', va='center',
-                fontsize=11, fontweight='bold', color='white', zorder=4)
-    
-    # Define directed edges with weights
-    edges = [
-        (('1', '2'), 0.8),
-        (('2', '3'), 0.6),
-        (('3', '1'), 0.4),
-        (('2', '4'), 0.7),
-        (('4', '3'), 0.5)
-    ]
-    
-    # Draw directed edges with arrows
-    for (start, end), weight in edges:
-        start_pos = nodes[start]
-        end_pos = nodes[end]
-        dx = end_pos[0] - start_pos[0]
-        dy = end_pos[1] - start_pos[1]
-        length = np.sqrt(dx**2 + dy**2)
-        dx_norm = dx / length
-        dy_norm = dy / length
-        
-        # Calculate arrow start and end (avoiding node overlap)
-        arrow_start_x = start_pos[0] + 0.2 * dx_norm
-        arrow_start_y = start_pos[1] + 0.2 * dy_norm
-        arrow_end_x = end_pos[0] - 0.2 * dx_norm
-        arrow_end_y = end_pos[1] - 0.2 * dy_norm
-        
-        # Draw arrow
-        arrow = FancyArrowPatch((arrow_start_x, arrow_start_y),
-                                (arrow_end_x, arrow_end_y),
-                                arrowstyle='->', mutation_scale=20,
-                                color='red', linewidth=3, zorder=1)
-        ax.add_patch(arrow)
-        
-        # Label weight
-        mid_x = (start_pos[0] + end_pos[0]) / 2
-        mid_y = (start_pos[1] + end_pos[1]) / 2
-        offset_x = -0.15 * dy_norm
-        offset_y = 0.15 * dx_norm
-        ax.text(mid_x + offset_x, mid_y + offset_y, f'w={weight}',
-                ha='center', va='center', fontsize=10, 
-                fontweight='bold', color='red',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='white',
-                         edgecolor='red', linewidth=1))
-    
-    # Draw 2-simplex (directed triangle)
-    triangle_vertices = np.array([nodes['1'], nodes['2'], nodes['3']])
-    triangle = Polygon(triangle_vertices, closed=True,
-                      facecolor='lightgreen', alpha=0.2,
-                      edgecolor='green', linewidth=2, linestyle='--', zorder=0)
-    ax.add_patch(triangle)
-    ax.text(1, 0.6, "Directed Triangle\n(2-simplex)", ha='center', va='center',
-            fontsize=9, color='green', style='italic')
-    
-    ax.text(1.5, -0.8, "Directed edges show temporal relations: Item i → Item j",
-            ha='center', va='center', fontsize=10, color='gray', style='italic')
-    ax.text(1.5, -1.1, "Weights w represent co-occurrence frequency (AEP convergence)",
-            ha='center', va='center', fontsize=10, color='gray', style='italic')
-    
-    ax.set_xlim(-0.5, 3.5)
-    ax.set_ylim(-1.5, 2.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Weighted Directed Complex: From Interaction Sequences to Global Complex',
-                 fontsize=14, fontweight='bold', pad=20)
-    
-    plt.tight_layout()
-    plt.savefig('images/figure5_weighted_directed_complex.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 5: Weighted Directed Complex")
-
-# ==================== Figure 6: Conjugate Transformation ====================
-
-def figure6_conjugate_transformation():
-    """Generate conjugate complex hypergraph transformation"""
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-    
-    # Left: Original complex K
-    ax = axes[0]
-    vertices_k = np.array([[0.5, 0], [1.5, 0], [1, 0.866]])
-    labels_k = ['a', 'b', 'c']
-    
-    triangle = Polygon(vertices_k, closed=True,
-                      facecolor='lightblue', alpha=0.3,
-                      edgecolor='blue', linewidth=2)
-    ax.add_patch(triangle)
-    for i in range(3):
-        ax.plot([vertices_k[i, 0], vertices_k[(i+1)%3, 0]],
-                [vertices_k[i, 1], vertices_k[(i+1)%3, 1]],
-                'b-', linewidth=2)
-    for v, label in zip(vertices_k, labels_k):
-        circle = Circle(v, 0.12, color='blue', zorder=3)
-        ax.add_patch(circle)
-        ax.text(v[0], v[1]-0.15, label, ha='center', va='top',
-                fontsize=11, fontweight='bold', color='blue')
-    ax.set_xlim(-0.3, 2.3)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Original Complex $K$\nVertices=Atoms, Simplices=Tokens',
-                 fontsize=11, fontweight='bold')
-    
-    # Middle: Transformation arrow
-    ax = axes[1]
-    ax.arrow(0.3, 0.5, 0.4, 0, head_width=0.1, head_length=0.1,
-             fc='red', ec='red', linewidth=3, zorder=2)
-    ax.arrow(0.7, 0.5, -0.4, 0, head_width=0.1, head_length=0.1,
-             fc='red', ec='red', linewidth=3, zorder=2)
-    ax.text(0.5, 0.5, "Vertex↔Simplex\nReversal", ha='center', va='center',
-            fontsize=12, fontweight='bold', color='red',
-            bbox=dict(boxstyle='round', facecolor='white',
-                     edgecolor='red', linewidth=2))
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    
-    # Right: Conjugate complex K*
-    ax = axes[2]
-    kstar_vertices = [
-        (np.array([0.5, 0.2]), '{a,b}'),
-        (np.array([1.5, 0.2]), '{b,c}'),
-        (np.array([1, 0.866]), '{a,b,c}')
-    ]
-    
-    for pos, label in kstar_vertices:
-        circle = Circle(pos, 0.15, color='purple', zorder=3)
-        ax.add_patch(circle)
-        ax.text(pos[0], pos[1], label, ha='center', va='center',
-                fontsize=10, fontweight='bold', color='white', zorder=4)
-    
-    edges_kstar = [
-        (kstar_vertices[0][0], kstar_vertices[2][0]),
-        (kstar_vertices[1][0], kstar_vertices[2][0])
-    ]
-    for start, end in edges_kstar:
-        ax.plot([start[0], end[0]], [start[1], end[1]],
-                'purple', linewidth=2, linestyle='--', zorder=1)
-    
-    ax.set_xlim(-0.3, 2.3)
-    ax.set_ylim(-0.5, 1.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_title('Conjugate Complex $K^*$\nVertices=Tokens, Simplices=Atom Clusters',
-                 fontsize=11, fontweight='bold')
-    
-    plt.suptitle('Conjugate Complex Construction: Hypergraph Vertex-Simplex Reversal',
-                 fontsize=14, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig('images/figure6_conjugate_transformation.png', 
-                bbox_inches='tight', facecolor='white')
-    plt.close()
-    print("✓ Generated Figure 6: Conjugate Transformation")
+    The helpers and data of its own module that it uses (followed through the
+    helpers' bodies), then every local module they reach, closed over those
+    modules' imports -- so an edit to e.g. simplicial_complex, used by figure3
+    only through splitting, changes figure3's cache key. Sorted by name.
+    """
+    home = sys.modules[func.__module__]
+    objects, modules = {}, set()
+    stack = [func]
+    while stack:
+        f = stack.pop()
+        for name in _code_names(f.__code__):
+            if name not in f.__globals__ or name in objects:
+                continue
+            value = f.__globals__[name]
+            owner = value if isinstance(value, types.ModuleType) else \
+                sys.modules.get(getattr(value, '__module__', None)) if callable(value) else None
+            if owner is home and inspect.isfunction(value):
+                objects[name] = value
+                stack.append(value)
+            elif owner is not None and owner is not home and _is_local(owner):
+                modules.add(owner)
+            elif owner is None and isinstance(value, DATA_TYPES):
+                objects[name] = value
+    todo = list(modules)
+    while todo:
+        for dep in _module_imports(todo.pop()) - modules - {home}:
+            modules.add(dep)
+            todo.append(dep)
+    return [objects[n] for n in sorted(objects) if objects[n] is not func] + \
+        sorted(modules, key=lambda m: m.__name__)
+
+def load_figures():
+    """FigureSpecs of every registered figure; imports the drawing code and style on first use"""
+    global figures, _specs
+    if _specs is None:
+        figures = importlib.import_module('figures')
+        _specs = []
+        for e in REGISTRY:
+            func = getattr(figures, e.func)
+            inputs = tuple(getattr(figures, n) for n in e.inputs)
+            derived = tuple(d for d in dependencies(func) if not any(d is i for i in inputs))
+            _specs.append(FigureSpec(e.name, func, output_path(e), inputs + derived))
+    return _specs
+
+def __getattr__(name):
+    """FIGURES and FIGURE_SPECS load the drawing code on first access"""
+    if name == 'FIGURES':
+        return load_figures()
+    if name == 'FIGURE_SPECS':
+        return {spec.name: spec for spec in load_figures()}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ==================== Rendering ====================
+
+def spec_key(spec):
+    """Cache key of a figure job: the export stage and any non-default targets are part of it"""
+    import export
+    from render_cache import figure_key
+    targets = export.current_targets()
+    extra = (targets,) if targets != export.DEFAULT_TARGETS else ()
+    return figure_key(spec.func, tuple(spec.inputs) + (export,) + extra)
+
+def is_cached(cache, spec, key):
+    """True when the cache holds `spec`'s render for `key` and every export target file exists"""
+    import export
+    return cache.lookup(spec.name, key, spec.output, export.target_paths(spec.output))
+
+def plan(cache, names, force=False):
+    """(specs by name, cache keys, names to render) for the current output dir and export targets.
+
+    Cached figures are reported as skipped; with `force` every figure is
+    rendered and counted as a cache miss.
+    """
+    specs = {spec.name: spec for spec in load_figures()}
+    keys = {name: spec_key(specs[name]) for name in names}
+    todo = []
+    for name in names:
+        if force:
+            cache.forced(name)
+            todo.append(name)
+        elif is_cached(cache, specs[name], keys[name]):
+            print(f"- Skipped {name}: unchanged")
+        else:
+            todo.append(name)
+    return specs, keys, todo
+
+def _init_worker(targets=None, out_dir=OUT_DIR):
+    """Set up a render worker once: headless Agg backend, the shared style and export targets"""
+    import matplotlib.pyplot as plt
+    import export
+    plt.switch_backend('Agg')
+    set_output_dir(out_dir)
+    load_figures()
+    figures.apply_style()
+    export.configure(targets)
+
+def render_job(name, profile=False, cprofile_dir=None):
+    """Render one figure by name.
+
+    Returns (name, elapsed seconds, error text or None, profile record or None,
+    export results per target).
+    """
+    import matplotlib.pyplot as plt
+    import export
+    from profiling import profile_figure
+    spec = {spec.name: spec for spec in load_figures()}[name]
+    start = time.perf_counter()
+    record = None
+    export.take_results()
+    try:
+        os.makedirs(os.path.dirname(spec.output) or '.', exist_ok=True)
+        if profile:
+            record = profile_figure(name, lambda: spec.func(spec.output), spec.output, cprofile_dir)
+        else:
+            spec.func(spec.output)
+        error = None
+    except Exception:
+        plt.close('all')
+        error = traceback.format_exc()
+    return name, time.perf_counter() - start, error, record, export.take_results()
+
+def render_figures(names, jobs=1, profile=False, cprofile_dir=None, targets=None):
+    """Render the named figures, serially or on a pool of `jobs` worker processes.
+
+    Every figure writes its own PNG, so jobs share no state and the parallel
+    output is identical to the serial build. Results come back in `names` order.
+    """
+    if jobs <= 1 or len(names) <= 1:
+        return [render_job(name, profile, cprofile_dir) for name in names]
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    results = {}
+    workers = min(jobs, len(names))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(targets, _out_dir)) as pool:
+        futures = {pool.submit(render_job, name, profile, cprofile_dir): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception:
+                # The worker itself died (e.g. killed or unpicklable result)
+                results[name] = (name, 0.0, traceback.format_exc(), None, [])
+    return [results[name] for name in names]
 
 # ==================== Main Function ====================
 
-def main():
-    """Generate all figures"""
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the Simplicial Complex Category figures.')
+    parser.add_argument('--list', action='store_true',
+                        help='list the registered figures and their outputs, then exit')
+    parser.add_argument('--only', metavar='NAMES',
+                        help='render only these figures, comma-separated (e.g. figure3,figure5)')
+    parser.add_argument('--out', default=OUT_DIR, metavar='DIR',
+                        help='output directory (default: images); the render cache sits next to it')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='number of worker processes (default: 1, serial)')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the render cache and regenerate every figure')
+    parser.add_argument('--profile', metavar='REPORT',
+                        help='time build/layout/draw/encode per figure and write a JSON '
+                             '(or .csv) report; combine with --force to profile every figure')
+    parser.add_argument('--cprofile', metavar='DIR',
+                        help='with --profile, also dump cProfile stats to DIR/<figure>.prof')
+    parser.add_argument('--export', nargs='+', metavar='FORMAT[:DPI[:LEVEL]]',
+                        help='export targets, e.g. png:300:9 svg pdf (PNG is always written; '
+                             'LEVEL is the PNG zlib compression 0-9)')
+    parser.add_argument('--watch', action='store_true',
+                        help='after the build, watch the scripts and notes and re-render affected figures')
+    parser.add_argument('--debounce', type=float, default=0.3, metavar='SECONDS',
+                        help='with --watch, wait for edits to settle this long (default: 0.3)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Generate the selected figures (all by default)"""
+    args = parse_args(argv)
+    if args.list:
+        for entry in REGISTRY:
+            print(f"{entry.name:<8s} {output_path(entry, args.out):<48s} {entry.title}")
+        return 0
+    try:
+        names = select(args.only)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
     print("Starting to generate Simplicial Complex Category figures...")
     print("=" * 60)
-    
+
+    start = time.perf_counter()
+    import export
+    from export import format_results
+    from profiling import format_record, write_report
+    from render_cache import RenderCache
     try:
-        figure1_simplicial_complex()
-        figure2_bpe_pushout()
-        figure3_inverse_splitting_pullback()
-        figure4_conjugate_complex()
-        figure5_weighted_directed_complex()
-        figure6_conjugate_transformation()
-        
-        print("=" * 60)
+        targets = export.parse_targets(args.export)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
+    export.configure(targets)
+    set_output_dir(args.out)
+    os.makedirs(args.out, exist_ok=True)
+    cache = RenderCache(manifest_path())
+    cache.evict({spec.name: spec.output for spec in load_figures()})
+    specs, keys, todo = plan(cache, names, args.force)
+
+    profile = bool(args.profile)
+    results = render_figures(todo, jobs=args.jobs, profile=profile,
+                             cprofile_dir=args.cprofile if profile else None, targets=targets)
+    failed = [(name, error) for name, _, error, _, _ in results if error]
+    for name, elapsed, error, _, _ in results:
+        if not error:
+            cache.record(name, keys[name], specs[name].output, elapsed)
+    cache.save()
+
+    print("=" * 60)
+    for name, elapsed, error, record, exports in results:
+        print(f"  {name}: {'FAILED' if error else 'ok'} ({elapsed:.2f}s)")
+        if exports:
+            print(f"    {format_results(exports)}")
+        if record:
+            print(f"    {format_record(record)}")
+    print(f"Total: {time.perf_counter() - start:.2f}s with {max(args.jobs, 1)} job(s)")
+    print(cache.summary())
+    if profile:
+        write_report(args.profile, [record for _, _, _, record, _ in results if record])
+        print(f"Profile written to: {args.profile}")
+    if failed:
+        for name, error in failed:
+            print(f"Error in {name}:")
+            print(error)
+        print(f"✗ {len(failed)} of {len(results)} figures failed")
+    else:
         print("✓ All figures generated successfully!")
-        print(f"Images saved in: {os.path.abspath('images')}")
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"Images saved in: {os.path.abspath(args.out)}")
+    if args.watch:
+        # Keep watching even after a failed build: the next edit may fix it
+        from watch import watch
+        return watch(args.debounce, args.out)
+    return 1 if failed else 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
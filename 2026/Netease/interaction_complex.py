@@ -0,0 +1,383 @@
+"""
+Streaming builder for weighted directed complexes from interaction logs
+Reads item sequences in chunks (files or generators), counts directed pair
+and triple co-occurrences inside a sliding window with vectorized NumPy
+key counting, and keeps memory bounded with top-k pruning or a count-min
+sketch. The result is a SimplicialComplex whose edge/triangle weights are
+co-occurrence frequencies and whose orientations are the dominant temporal
+order -- exactly what figure5 draws.
+Requires: numpy
+Usage: python interaction_complex.py LOG [LOG ...] [--window 3] [--top-k 1000] [--plot out.png]
+                                     [--store complex.bin]
+"""
+
+import time
+
+import numpy as np
+
+from simplicial_complex import SimplicialComplex
+
+# ==================== Input ====================
+
+class Vocabulary:
+    """Incremental token -> item id mapping; only each chunk's unique tokens touch Python"""
+
+    def __init__(self):
+        self.ids = {}
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def encode(self, tokens):
+        uniq, inverse = np.unique(np.asarray(tokens), return_inverse=True)
+        mapped = np.empty(len(uniq), dtype=np.int64)
+        for i, token in enumerate(uniq.tolist()):
+            item = self.ids.get(token)
+            if item is None:
+                item = self.ids[token] = len(self.items)
+                self.items.append(token)
+            mapped[i] = item
+        return mapped[inverse.ravel()]
+
+
+def read_sequences(path, sep=None):
+    """Yield one token list per non-empty line of a log file"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            tokens = line.split(sep)
+            if tokens:
+                yield tokens
+
+
+def chunked(sequences, chunk_events=1 << 20):
+    """Group sequences into chunks of ~chunk_events events.
+
+    Yields (flat tokens, sequence id per event) with sequence ids local to the chunk.
+    """
+    parts, lengths, size = [], [], 0
+    for seq in sequences:
+        seq = np.asarray(seq)
+        if len(seq) == 0:
+            continue
+        parts.append(seq)
+        lengths.append(len(seq))
+        size += len(seq)
+        if size >= chunk_events:
+            yield np.concatenate(parts), np.repeat(np.arange(len(lengths)), lengths)
+            parts, lengths, size = [], [], 0
+    if parts:
+        yield np.concatenate(parts), np.repeat(np.arange(len(lengths)), lengths)
+
+# ==================== Counters ====================
+
+class ExactCounter:
+    """Sorted key/count arrays merged per chunk.
+
+    With `capacity`, only the `capacity` heaviest keys survive each merge, so
+    counts of pruned keys restart from zero (a lossy heavy-hitter count).
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.pruned = 0
+
+    def add(self, keys, counts):
+        keys = np.concatenate([self.keys, keys])
+        counts = np.concatenate([self.counts, counts])
+        self.keys, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse.ravel(), weights=counts).astype(np.int64)
+        if self.capacity is not None and len(self.keys) > self.capacity:
+            keep = np.sort(np.argpartition(-self.counts, self.capacity - 1)[:self.capacity])
+            self.pruned += len(self.keys) - len(keep)
+            self.keys, self.counts = self.keys[keep], self.counts[keep]
+
+    def items(self):
+        return self.keys, self.counts
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.counts.nbytes
+
+
+class SketchCounter:
+    """Count-min sketch (depth x width) plus the `top_k` heaviest candidate keys.
+
+    Estimates never undercount; memory is fixed at depth*width counters.
+    """
+
+    def __init__(self, top_k, width=1 << 20, depth=4, seed=0):
+        self.top_k = top_k
+        self.width = width
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing with odd 64-bit multipliers
+        self.mult = rng.integers(1, 2 ** 62, depth, dtype=np.int64) * 2 + 1
+        self.keys = np.empty(0, dtype=np.int64)
+        self.pruned = 0
+
+    def _columns(self, keys):
+        h = keys.astype(np.uint64)[None, :] * self.mult.astype(np.uint64)[:, None]
+        return ((h >> np.uint64(32)) % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, keys):
+        cols = self._columns(keys)
+        return self.table[np.arange(len(self.table))[:, None], cols].min(axis=0)
+
+    def add(self, keys, counts):
+        cols = self._columns(keys)
+        for row in range(len(self.table)):
+            self.table[row] += np.bincount(cols[row], weights=counts,
+                                           minlength=self.width).astype(np.int64)
+        candidates = np.union1d(self.keys, keys)
+        if len(candidates) > self.top_k:
+            est = self.estimate(candidates)
+            keep = np.sort(np.argpartition(-est, self.top_k - 1)[:self.top_k])
+            self.pruned += len(candidates) - len(keep)
+            candidates = candidates[keep]
+        self.keys = candidates
+
+    def items(self):
+        return self.keys, self.estimate(self.keys)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes + self.keys.nbytes
+
+# ==================== Builder ====================
+
+class InteractionComplexBuilder:
+    """Stream item sequences into directed pair (1-simplex) and triple (2-simplex) counts.
+
+    window   : events i < j < k co-occur when k - i < window
+    max_dim  : 1 counts pairs only, 2 also counts triples
+    top_k    : bound on kept pairs/triples per dimension (None = exact, unbounded)
+    sketch   : (width, depth) to count with a count-min sketch instead of exact pruning
+    max_items: item ids must be below this; max_items**(max_dim+1) must fit in int64
+    typical  : optional typical_set.TypicalSetFilter; it meters the item entropy per
+               chunk and to_complex drops the simplices outside its typical set
+    """
+
+    def __init__(self, window=3, max_dim=2, top_k=None, sketch=None, max_items=1 << 21,
+                 vocabulary=None, typical=None):
+        if window < max_dim + 1:
+            raise ValueError(f"window {window} is too small for {max_dim}-simplices")
+        if float(max_items) ** (max_dim + 1) > 2.0 ** 63:
+            raise ValueError(f"max_items={max_items} overflows int64 keys for dimension {max_dim}")
+        self.window = window
+        self.max_dim = max_dim
+        self.max_items = max_items
+        self.vocabulary = vocabulary
+        self.typical = typical
+        if sketch is not None:
+            width, depth = sketch
+            self.counters = {d: SketchCounter(top_k or 1000, width, depth, seed=d)
+                             for d in range(1, max_dim + 1)}
+        else:
+            self.counters = {d: ExactCounter(top_k) for d in range(1, max_dim + 1)}
+        self.item_counts = np.zeros(0, dtype=np.int64)
+        self.events = 0
+        self.sequences = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+
+    # ---------- Counting ----------
+
+    def _tuples(self, items, seq_ids, order):
+        """All in-window ordered tuples of `order` events with distinct items, as int64 keys"""
+        n = len(items)
+        keys = []
+        offsets = [(d,) for d in range(1, self.window)] if order == 2 else \
+            [(d1, d2) for d1 in range(1, self.window) for d2 in range(d1 + 1, self.window)]
+        for offs in offsets:
+            last = offs[-1]
+            if last >= n:
+                continue
+            cols = [items[:n - last]] + [items[d:n - last + d] for d in offs]
+            ok = seq_ids[:n - last] == seq_ids[last:]
+            for a in range(len(cols)):
+                for b in range(a + 1, len(cols)):
+                    ok &= cols[a] != cols[b]
+            key = cols[0][ok]
+            for col in cols[1:]:
+                key = key * self.max_items + col[ok]
+            keys.append(key)
+        return np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+
+    def update(self, items, seq_ids):
+        """Count one chunk: item ids (int) or tokens with their per-event sequence ids"""
+        start = time.perf_counter()
+        items = np.asarray(items)
+        if self.vocabulary is not None:
+            items = self.vocabulary.encode(items)
+        items = items.astype(np.int64)
+        if len(items) and (items.min() < 0 or items.max() >= self.max_items):
+            raise ValueError(f"item ids must lie in [0, {self.max_items})")
+        seq_ids = np.asarray(seq_ids)
+        self.events += len(items)
+        self.sequences += int(np.count_nonzero(np.diff(seq_ids))) + 1 if len(items) else 0
+        self.chunks += 1
+        counts = np.bincount(items, minlength=len(self.item_counts))
+        if self.typical is not None:
+            self.typical.meter.add(counts)
+        counts[:len(self.item_counts)] += self.item_counts
+        self.item_counts = counts
+        for d, counter in self.counters.items():
+            keys, key_counts = np.unique(self._tuples(items, seq_ids, d + 1), return_counts=True)
+            counter.add(keys, key_counts)
+        self.elapsed += time.perf_counter() - start
+
+    def consume(self, sequences, chunk_events=1 << 20):
+        """Count an iterable of sequences in chunks; returns self"""
+        for items, seq_ids in chunked(sequences, chunk_events):
+            self.update(items, seq_ids)
+        return self
+
+    def consume_file(self, path, chunk_events=1 << 20, sep=None):
+        """Count a log file with one whitespace- (or `sep`-) separated sequence per line"""
+        if self.vocabulary is None:
+            self.vocabulary = Vocabulary()
+        return self.consume(read_sequences(path, sep), chunk_events)
+
+    # ---------- Results ----------
+
+    def counts(self, dim):
+        """Directed tuples (m, dim+1) in temporal order with their co-occurrence counts"""
+        keys, counts = self.counters[dim].items()
+        cols = []
+        for _ in range(dim + 1):
+            keys, col = np.divmod(keys, self.max_items)
+            cols.append(col)
+        return np.stack(cols[::-1], axis=1), counts
+
+    def to_complex(self, normalize=True, min_count=1):
+        """Weighted directed complex over the items seen so far.
+
+        Each simplex is weighted by its total co-occurrence count (divided by
+        the largest count per dimension when `normalize`); its orientation is
+        the most frequent temporal order. With a typical-set filter, simplices
+        outside the typical set (or with an atypical face) are dropped here. Vertices are renumbered to
+        the items of the counted simplices (before `min_count`; with a
+        typical-set filter, of the typical ones) and labelled with their tokens.
+        """
+        tuples = {d: _dominant_order(*self.counts(d)) for d in self.counters}
+        used = np.unique(np.concatenate([rows.ravel() for rows, _ in tuples.values()]))
+        tuples = {d: (rows[counts >= min_count], counts[counts >= min_count])
+                  for d, (rows, counts) in tuples.items()}
+        if self.typical is not None:
+            self.typical.clear()
+            surprisal, entropy = self.typical.meter.surprisal(), self.typical.meter.entropy
+            for d, (rows, counts) in tuples.items():
+                keep = self.typical.mask(rows, d, counts, surprisal, entropy)
+                tuples[d] = rows[keep], counts[keep]
+            used = np.unique(np.concatenate([rows.ravel() for rows, _ in tuples.values()]))
+        if len(used) == 0:
+            used = np.flatnonzero(self.item_counts)
+        remap = np.full(len(self.item_counts), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        simplices = {0: np.arange(len(used))[:, None]}
+        weights = {0: self.item_counts[used].astype(float)}
+        for d, (rows, counts) in tuples.items():
+            # The renumbering is monotone, so the dominant orders are unchanged by it
+            simplices[d], weights[d] = remap[rows], counts.astype(float)
+        if normalize:
+            weights = {d: w / w.max() if len(w) else w for d, w in weights.items()}
+        if self.vocabulary is not None:
+            labels = [str(self.vocabulary.items[i]) for i in used]
+        else:
+            labels = [str(i) for i in used]
+        return SimplicialComplex(simplices, weights, n_vertices=len(used), labels=labels).closure()
+
+    @property
+    def nbytes(self):
+        return self.item_counts.nbytes + sum(c.nbytes for c in self.counters.values())
+
+    def summary(self):
+        kept = ', '.join(f'{d}-simplices: {len(c.items()[0])} kept/{c.pruned} pruned'
+                         for d, c in self.counters.items())
+        rate = self.events / self.elapsed if self.elapsed else 0.0
+        return (f"{self.events} events in {self.sequences} sequences, {self.chunks} chunk(s), "
+                f"{rate:,.0f} events/s, {self.nbytes / 1e6:.1f} MB; {kept}")
+
+
+def _dominant_order(rows, counts):
+    """Collapse orderings of the same vertex set: total count, most frequent order kept"""
+    if len(rows) == 0:
+        return rows, counts
+    canon = np.sort(rows, axis=1)
+    _, inverse = np.unique(canon, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    totals = np.bincount(inverse, weights=counts)
+    # For every group the first row after sorting by (group, -count) is the dominant order
+    order = np.lexsort((-counts, inverse))
+    first = order[np.r_[True, inverse[order][1:] != inverse[order][:-1]]]
+    return rows[first], totals[inverse[first]]
+
+# ==================== Command Line ====================
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Build a weighted directed complex from interaction logs.')
+    parser.add_argument('logs', nargs='+', help='log files, one whitespace-separated sequence per line')
+    parser.add_argument('--window', type=int, default=3)
+    parser.add_argument('--max-dim', type=int, default=2, choices=(1, 2))
+    parser.add_argument('--top-k', type=int, default=None, help='keep only the k heaviest simplices per dimension')
+    parser.add_argument('--sketch', type=int, nargs=2, metavar=('WIDTH', 'DEPTH'),
+                        help='count with a count-min sketch of the given shape (uses --top-k, default 1000)')
+    parser.add_argument('--chunk-events', type=int, default=1 << 20)
+    parser.add_argument('--plot', metavar='PNG', help='render the complex in the figure5 style')
+    parser.add_argument('--store', metavar='PATH',
+                        help='append the raw counts to this complex store (created if missing) '
+                             'and plot the accumulated complex')
+    parser.add_argument('--typical', type=float, metavar='EPS',
+                        help='keep only simplices in the AEP typical set, EPS bits around the item entropy '
+                             '(with --store: of the accumulated complex; the store keeps raw counts)')
+    args = parser.parse_args(argv)
+
+    typical = None
+    if args.typical is not None and not args.store:
+        from typical_set import TypicalSetFilter
+        typical = TypicalSetFilter(args.typical)
+    builder = InteractionComplexBuilder(args.window, args.max_dim, args.top_k, args.sketch,
+                                        vocabulary=Vocabulary(), typical=typical)
+    for path in args.logs:
+        builder.consume_file(path, args.chunk_events)
+    print(builder.summary())
+    K = builder.to_complex(normalize=args.store is None)
+    if typical is not None:
+        print(typical.summary())
+    print(K)
+    if args.store:
+        from complex_store import ComplexStore
+        store = ComplexStore.open(args.store)
+        store.append(K)
+        print(f"✓ Appended to {store.summary()}")
+        K = store.complex()
+        if args.typical is not None:
+            # The store keeps the raw counts; typicality is judged over the merged item counts
+            from typical_set import TypicalSetFilter, filter_complex
+            typical = TypicalSetFilter(args.typical)
+            typical.meter.add(np.rint(K.weights(0)).astype(np.int64))
+            K = filter_complex(K, typical=typical)
+            print(typical.summary())
+            print(K)
+    if args.plot:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from complex_draw import draw_weighted_directed_complex
+        from layout import spring_layout
+        fig, ax = plt.subplots(figsize=(10, 8))
+        draw_weighted_directed_complex(ax, K, spring_layout(K, box=(-1.2, -1.2, 1.2, 1.2)))
+        ax.set_xlim(-1.5, 1.5)
+        ax.set_ylim(-1.5, 1.5)
+        ax.set_aspect('equal')
+        ax.axis('off')
+        fig.savefig(args.plot, bbox_inches='tight', facecolor='white')
+        print(f"✓ Saved {args.plot}")
+
+
+if __name__ == '__main__':
+    main()
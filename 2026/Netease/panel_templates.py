@@ -0,0 +1,312 @@
+"""
+Panel and artist templates shared between figures
+A PanelTemplate is a recorded group of complex_draw calls plus the axes
+setup of one panel (limits, aspect, title). It is built once per process
+(the complex is constructed and its arrays extracted once) and composed into
+any number of axes with a position offset and per-call style overrides, so
+figures 4 and 6 draw the same "Original Complex K" / "Conjugate Complex K*"
+panels from one definition. Its simplices and edges (one Path per polygon or
+segment, the costly part of building a large panel) are built on the first
+draw only; later draws add a collection sharing those paths, shifted by a
+transform instead of rebuilt. The circle-plus-label node motif is drawn as
+patches and texts for a few nodes; above `tile_threshold` nodes each distinct
+label is pre-rendered once into an RGBA tile and the tiles are stamped at
+draw time (one image blit per node instead of one text layout per node).
+Tiles are only used when labels repeat (at least `tile_reuse` nodes per
+distinct label), since every tile costs an off-screen render. Built templates
+share one bounded LRU cache; each tiled artist keeps its own tile cache sized
+to its distinct labels, so tiles never evict the panel templates.
+Requires: matplotlib, numpy
+Benchmark: python panel_templates.py [--nodes 50 500 5000] [--panels 1000 10000 100000]
+"""
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import PathCollection
+from matplotlib.patches import Circle
+from matplotlib.transforms import Affine2D, IdentityTransform
+
+import complex_draw
+
+# ==================== LRU Template Cache ====================
+
+class TemplateCache:
+    """LRU mapping key -> built template, holding at most `maxsize` entries"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        self.build_seconds = 0.0
+
+    def get(self, key, build):
+        """Cached value of `key`, calling `build()` on a miss"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        start = time.perf_counter()
+        value = build()
+        self.build_seconds += time.perf_counter() - start
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        return (f"templates: {len(self.entries)}/{self.maxsize} cached, {self.hits} hits, "
+                f"{self.misses} builds ({self.build_seconds * 1e3:.1f} ms), {self.evictions} evicted")
+
+
+TEMPLATES = TemplateCache()
+
+
+def cached(key, build):
+    """Process-wide template for `key` (built by `build()` on first use)"""
+    return TEMPLATES.get(key, build)
+
+# ==================== Panel Templates ====================
+
+# complex_draw calls whose collection is fixed paths in data coordinates
+SHARED_KINDS = ('draw_simplices', 'draw_edges')
+
+
+def _detached(coll):
+    """A collection with the paths and style of `coll`, attached to no axes"""
+    shared = PathCollection(coll.get_paths())
+    shared.update_from(coll)
+    shared.set_zorder(coll.get_zorder())
+    shared.set_transform(IdentityTransform())
+    shared.set_clip_path(None)
+    shared.set_clip_box(None)
+    return shared
+
+
+def _shifted(ax, offset):
+    """Data transform of `ax` moved by `offset` (data units)"""
+    return Affine2D().translate(*offset) + ax.transData if offset.any() else ax.transData
+
+
+class PanelTemplate:
+    """A panel recorded as draw calls over fixed positions plus its axes setup.
+
+    calls: list of (name, kind, args, kwargs); kind is a complex_draw function
+           name taking (ax, positions, *args) or 'text' for ax.text(x, y, s)
+    axes : dict with xlim, ylim, aspect, title, title_kw
+    """
+
+    def __init__(self, name, positions, calls, axes):
+        self.name = name
+        self.positions = np.asarray(positions, dtype=float)
+        self.calls = calls
+        self.axes = axes
+        self.built = {}  # call name -> detached collection of its first draw
+
+    def _collection(self, ax, name, kind, args, kwargs, offset):
+        """Collection of a SHARED_KINDS call: built on first use, then sharing its paths"""
+        shared = self.built.get(name)
+        if shared is None:
+            coll = getattr(complex_draw, kind)(ax, self.positions, *args, **kwargs)
+            self.built[name] = _detached(coll)
+        else:
+            coll = PathCollection(shared.get_paths())
+            coll.update_from(shared)
+            coll.set_zorder(shared.get_zorder())
+            ax.add_collection(coll, autolim=False)
+        coll.set_transform(_shifted(ax, offset))
+        return coll
+
+    def draw(self, ax, offset=(0, 0), overrides=None, setup=True):
+        """Compose the panel into `ax`, shifted by `offset`; overrides: call name -> kwargs"""
+        overrides = overrides or {}
+        offset = np.asarray(offset, dtype=float)
+        positions = self.positions + offset if offset.any() else self.positions
+        artists = []
+        for name, kind, args, kwargs in self.calls:
+            kw = {**kwargs, **overrides.get(name, {})}
+            if kind == 'text':
+                x, y, s = args
+                artists.append(ax.text(x + offset[0], y + offset[1], s, **kw))
+            elif kind in SHARED_KINDS and name not in overrides:
+                artists.append(self._collection(ax, name, kind, args, kw, offset))
+            else:
+                artists.append(getattr(complex_draw, kind)(ax, positions, *args, **kw))
+        if setup:
+            a = self.axes
+            ax.set_xlim(*(np.asarray(a['xlim']) + offset[0]))
+            ax.set_ylim(*(np.asarray(a['ylim']) + offset[1]))
+            ax.set_aspect(a.get('aspect', 'equal'))
+            ax.axis('off')
+            if 'title' in a:
+                ax.set_title(a['title'], **a.get('title_kw', {}))
+        return artists
+
+# ==================== Node Motif ====================
+
+def draw_node_motif(ax, coords, labels, radius=0.3, color='blue', alpha=None, zorder=3,
+                    text_color='white', tile_threshold=200, tile_reuse=8, **text_kw):
+    """Circles of `radius` (data units) with centred labels, e.g. figure2's white-on-blue atoms.
+
+    Up to `tile_threshold` nodes, or when labels repeat fewer than `tile_reuse`
+    times on average, this is one Circle and one Text per node; otherwise one
+    NodeTiles artist stamps a cached pre-rendered tile per node.
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    text_kw['color'] = text_color
+    text_kw.setdefault('ha', 'center')
+    text_kw.setdefault('va', 'center')
+    labels = [str(s) for s in labels]
+    if len(coords) > tile_threshold and len(set(labels)) * tile_reuse <= len(coords):
+        artist = NodeTiles(coords, labels, radius, color, alpha, text_kw)
+        artist.set_zorder(zorder)
+        ax.add_artist(artist)
+        return [artist]
+    artists = []
+    for pos, label in zip(coords, labels):
+        artists.append(ax.add_patch(Circle(pos, radius, color=color, alpha=alpha, zorder=zorder)))
+        artists.append(ax.text(pos[0], pos[1], label, zorder=zorder + 1, **text_kw))
+    return artists
+
+
+def render_tile(label, radius_px, color, alpha, text_kw, dpi):
+    """RGBA tile (rows top-down) of one node: circle of `radius_px` pixels with its label"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    size = 2 * int(np.ceil(radius_px)) + 4
+    fig = Figure(figsize=(size / dpi, size / dpi), dpi=dpi, facecolor='none')
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-size / 2, size / 2)
+    ax.set_ylim(-size / 2, size / 2)
+    ax.axis('off')
+    ax.patch.set_alpha(0)
+    ax.add_patch(Circle((0, 0), radius_px, color=color, alpha=alpha))
+    ax.text(0, 0, label, **text_kw)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+class NodeTiles(Artist):
+    """Many node motifs drawn as blits of cached per-label tiles"""
+
+    def __init__(self, coords, labels, radius, color, alpha, text_kw):
+        super().__init__()
+        self.coords = coords
+        self.labels = list(labels)
+        self.radius = radius
+        self.color = color
+        self.alpha = alpha
+        self.text_kw = dict(sorted(text_kw.items()))
+        self.groups = {}  # label -> node indices
+        for i, label in enumerate(self.labels):
+            self.groups.setdefault(label, []).append(i)
+        self.tiles = TemplateCache(maxsize=len(self.groups))  # one tile per label, per draw size
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        trans = self.axes.transData
+        centers = trans.transform(self.coords)
+        radius_px = abs(trans.transform((self.radius, 0))[0] - trans.transform((0, 0))[0])
+        dpi = self.figure.dpi
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(self.axes.bbox)
+        for label, nodes in self.groups.items():
+            key = (label, round(radius_px, 1), dpi)
+            tile = self.tiles.get(key, lambda: render_tile(label, radius_px, self.color, self.alpha,
+                                                           self.text_kw, dpi))
+            h, w = tile.shape[:2]
+            flipped = tile[::-1]  # draw_image takes rows bottom-up
+            for x, y in centers[nodes]:
+                renderer.draw_image(gc, round(x - w / 2), round(y - h / 2), flipped)
+        gc.restore()
+        self.stale = False
+
+# ==================== Benchmark ====================
+
+def benchmark(node_counts=(50, 500, 5000), alphabet='abcdefghijklmnopqrstuvwxyz', seed=0):
+    """Draw time of the node motif as patches + texts vs cached tiles.
+
+    Each node count is drawn with labels from `alphabet` (heavily shared) and
+    with a distinct label per node (one tile render per node, the worst case).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    rng = np.random.default_rng(seed)
+    for n in node_counts:
+        side = int(np.ceil(np.sqrt(n)))
+        coords = np.stack(np.divmod(np.arange(n), side), axis=1).astype(float)
+        label_sets = (('shared', [alphabet[i] for i in rng.integers(0, len(alphabet), n)]),
+                      ('distinct', [str(i) for i in range(n)]))
+        for kind, labels in label_sets:
+            times = {}
+            for mode, threshold in (('patches + texts', n), ('tiles', 0)):
+                fig, ax = plt.subplots(figsize=(8, 8), dpi=100)
+                start = time.perf_counter()
+                draw_node_motif(ax, coords, labels, radius=0.35, color='blue', tile_threshold=threshold,
+                                tile_reuse=0, fontsize=8, fontweight='bold')
+                ax.set_xlim(-1, side)
+                ax.set_ylim(-1, side)
+                ax.set_aspect('equal')
+                ax.axis('off')
+                fig.canvas.draw()
+                times[mode] = time.perf_counter() - start
+                plt.close(fig)
+            print(f"{n:>7d} nodes, {len(set(labels)):>5d} {kind:<8s} labels  "
+                  + '  '.join(f"{m}: {t * 1e3:8.1f} ms" for m, t in times.items()))
+
+
+def benchmark_panels(sizes=(1000, 10000, 100000), copies=4, seed=0):
+    """Artist build time of a complex panel composed `copies` times: direct calls vs a template"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    for n in sizes:
+        coords, edges, triangles = complex_draw.synthetic_grid_complex(n, seed)
+        calls = [('faces', 'draw_simplices', (triangles,), dict(facecolor='lightblue', alpha=0.3)),
+                 ('edges', 'draw_edges', (edges,), dict(color='b', linewidth=0.5)),
+                 ('atoms', 'draw_vertices', (), dict(size=2, color='blue'))]
+        axes = {'xlim': (coords[:, 0].min(), coords[:, 0].max()),
+                'ylim': (coords[:, 1].min(), coords[:, 1].max())}
+        times = {}
+        for mode in ('direct', 'template'):
+            template = PanelTemplate('bench', coords, calls, axes)
+            fig, axs = plt.subplots(1, copies, figsize=(4 * copies, 4), dpi=50)
+            build = []
+            for ax in axs:
+                start = time.perf_counter()
+                if mode == 'direct':
+                    for _, kind, args, kwargs in calls:
+                        getattr(complex_draw, kind)(ax, coords, *args, **kwargs)
+                else:
+                    template.draw(ax)
+                build.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            fig.canvas.draw()
+            times[mode] = (sum(build), build[-1], time.perf_counter() - start)
+            plt.close(fig)
+        print(f"{n:>7d} triangles x{copies} panels  " + '  '.join(
+            f"{m}: build {b * 1e3:7.1f} ms (last panel {last * 1e3:6.1f} ms), render {r * 1e3:7.1f} ms"
+            for m, (b, last, r) in times.items()))
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the panel and node motif templates.')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--panels', type=int, nargs='+', metavar='TRIANGLES',
+                        help='instead, time composing a complex panel of this many triangles 4 times')
+    args = parser.parse_args()
+    if args.panels:
+        benchmark_panels(args.panels)
+    else:
+        benchmark(args.nodes)
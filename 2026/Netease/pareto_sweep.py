@@ -0,0 +1,281 @@
+"""
+Parallel BPE parameter sweep with the Pareto front of the vocabulary trade-off
+Evaluates a grid of vocabulary-construction settings -- merge count, maximum
+simplex dimension (a token of k atoms is a (k-1)-simplex) and frequency
+threshold -- on worker processes. Settings that differ only in the merge
+count share one training run: each (max_dim, min_count) group trains once
+and records its metrics at every requested merge count. Memory (vocabulary
+size) is traded against generalisation (compression on held-out words); the
+non-dominated settings are extracted with an O(n log n) skyline and drawn in
+the style of the note figures. Finished groups are appended to a JSON-lines
+cache, so an interrupted sweep resumes where it stopped.
+Requires: numpy, matplotlib (--plot)
+Usage: python pareto_sweep.py [--corpus FILE] [--merges 250 500 1000 2000] [--max-dims 1 2 4 8]
+                              [--min-counts 2 10 50] [--jobs N] [--cache sweep_cache.jsonl]
+                              [--plot images/pareto_frontier.png]
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from bpe_engine import BPETrainer, synthetic_corpus
+
+CACHE = 'sweep_cache.jsonl'
+
+# One grid setting; max_dim caps tokens at max_dim + 1 atoms
+SweepPoint = namedtuple('SweepPoint', ['merges', 'max_dim', 'min_count'])
+
+# (metric, 'min' | 'max'): memory against generalisation
+OBJECTIVES = (('vocab_size', 'min'), ('heldout_ratio', 'max'))
+
+# ==================== Corpus ====================
+
+def load_corpus(path=None, size_mb=5.0, heldout=0.1, seed=0):
+    """(train, heldout) word-frequency tables; held-out words are unseen in training.
+
+    Without `path` the corpus is bpe_engine's synthetic Zipf corpus.
+    """
+    if path:
+        counts = Counter()
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                counts.update(line.split())
+        words, freq = list(counts), list(counts.values())
+    else:
+        words, freq = synthetic_corpus(size_mb, lexicon=20000, seed=seed)
+        freq = freq.tolist()
+    held = np.random.default_rng(seed).random(len(words)) < heldout
+    train, test = Counter(), Counter()
+    for w, c, h in zip(words, freq, held.tolist()):
+        if c:
+            (test if h else train)[w] += c
+    return train, test
+
+
+def corpus_key(path=None, size_mb=5.0, heldout=0.1, seed=0):
+    """Cache key of a corpus: file identity (path, size, mtime) or the synthetic parameters"""
+    if path:
+        st = os.stat(path)
+        source = f'{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}'
+    else:
+        source = f'synthetic:{size_mb:g}'
+    return hashlib.sha1(f'{source}:{heldout:g}:{seed}'.encode()).hexdigest()[:16]
+
+# ==================== Workers ====================
+
+_corpus = None
+
+
+def _init_worker(corpus_args):
+    """Load the corpus once per worker process"""
+    global _corpus
+    _corpus = load_corpus(*corpus_args)
+
+
+def run_group(max_dim, min_count, merge_counts):
+    """Train one (max_dim, min_count) setting up to the largest merge count.
+
+    Returns [(SweepPoint, metrics)] with the metrics at every merge count.
+    """
+    train, test = _corpus
+    trainer, held = BPETrainer(train), BPETrainer(test)
+    results = []
+    elapsed = held.init_seconds
+    for merges in sorted(merge_counts):
+        steps = trainer.train(merges - len(trainer.merges), min_count, max_len=max_dim + 1)
+        start = time.perf_counter()
+        held.replay(steps)
+        elapsed += time.perf_counter() - start
+        results.append((SweepPoint(merges, max_dim, min_count), {
+            'merges_done': len(trainer.merges),
+            'vocab_size': len(trainer.vocab),
+            'vocab_chars': sum(len(t) for t in trainer.vocab),
+            'train_ratio': trainer.compression_ratio,
+            'heldout_ratio': held.compression_ratio,
+            'seconds': trainer.init_seconds + trainer.elapsed + elapsed,
+        }))
+    return results
+
+# ==================== Sweep ====================
+
+def grid(merges, max_dims, min_counts):
+    return [SweepPoint(m, d, f) for d in max_dims for f in min_counts for m in merges]
+
+
+def read_cache(path, key):
+    """{SweepPoint: metrics} of the cached results for corpus `key` (torn last lines skipped)"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # interrupted while writing
+            if entry.get('corpus') == key:
+                done[SweepPoint(**entry['point'])] = entry['metrics']
+    return done
+
+
+def append_cache(path, key, results):
+    with open(path, 'ab+') as f:
+        # A torn last line from an interrupted run is closed off so it cannot swallow ours
+        if f.seek(0, os.SEEK_END) and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b'\n':
+            f.write(b'\n')
+        for point, metrics in results:
+            f.write((json.dumps({'corpus': key, 'point': point._asdict(), 'metrics': metrics}) + '\n').encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def sweep(points, corpus_args=(), jobs=None, cache=CACHE):
+    """Evaluate `points` on `jobs` processes; returns {SweepPoint: metrics} for all of them.
+
+    Cached points are not recomputed; each finished group is cached at once.
+    """
+    key = corpus_key(*corpus_args)
+    results = read_cache(cache, key) if cache else {}
+    groups = {}
+    for p in points:
+        if p not in results:
+            groups.setdefault((p.max_dim, p.min_count), set()).add(p.merges)
+    print(f"{len(points)} settings: {len(points) - sum(map(len, groups.values()))} cached, "
+          f"{len(groups)} training run(s) to go")
+    if groups:
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(groups)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tuple(corpus_args),)) as pool:
+            futures = {pool.submit(run_group, d, f, sorted(m)): (d, f) for (d, f), m in groups.items()}
+            for future in as_completed(futures):
+                group = future.result()
+                if cache:
+                    append_cache(cache, key, group)
+                results.update(group)
+                d, f = futures[future]
+                print(f"✓ max_dim={d} min_count={f}: {len(group)} point(s) "
+                      f"in {group[-1][1]['seconds']:.1f}s")
+    return {p: results[p] for p in points}
+
+# ==================== Pareto Front ====================
+
+def pareto_front(values, senses=('min', 'max')):
+    """Indices of the non-dominated rows of an (n, 2) objective array, by x.
+
+    Skyline: sort by the first objective (ties: best second objective first),
+    then one pass keeps every row that beats the best second objective so far.
+    """
+    values = np.asarray(values, dtype=float).reshape(-1, 2)
+    if len(senses) != 2:
+        raise ValueError("the skyline front takes exactly two objectives")
+    x, y = (values[:, i] if s == 'min' else -values[:, i] for i, s in enumerate(senses))
+    order = np.lexsort((y, x))  # x ascending, then y ascending (both minimised)
+    best = np.minimum.accumulate(y[order])
+    front = np.r_[True, y[order][1:] < best[:-1]]
+    return order[front]
+
+
+def distinct(results):
+    """Settings relabelled by the merges actually done, one per distinct outcome.
+
+    When training saturates (no pair left above min_count or within max_dim),
+    larger merge counts repeat the same vocabulary; only the first is kept.
+    """
+    out = {}
+    for p in sorted(results):
+        m = results[p]
+        out.setdefault(p._replace(merges=m.get('merges_done', p.merges)), m)
+    return out
+
+
+def front_of(results, objectives=OBJECTIVES):
+    """(points, metrics, front indices) of a sweep result, saturated repeats removed"""
+    results = distinct(results)
+    points = list(results)
+    metrics = [results[p] for p in points]
+    values = [[m[name] for name, _ in objectives] for m in metrics]
+    return points, metrics, pareto_front(values, [s for _, s in objectives])
+
+# ==================== Rendering ====================
+
+def plot_front(results, output, objectives=OBJECTIVES):
+    """Draw all settings and their Pareto front, in the style of the note figures"""
+    import matplotlib.pyplot as plt
+    from figures import apply_style
+    from export import export_figure
+
+    apply_style()
+    points, metrics, front = front_of(results, objectives)
+    (xname, _), (yname, _) = objectives
+    x = np.array([m[xname] for m in metrics])
+    y = np.array([m[yname] for m in metrics])
+    dims = np.array([p.max_dim for p in points])
+    fig, ax = plt.subplots(figsize=(10, 7))
+    colors = ['blue', 'purple', 'green', 'red', 'gray', 'brown']  # orange is the front
+    for i, d in enumerate(sorted(set(dims.tolist()))):
+        sel = dims == d
+        ax.scatter(x[sel], y[sel], s=40, color=colors[i % len(colors)], alpha=0.35,
+                   edgecolors='none', label=f'max dim {d}', zorder=2)
+    ax.plot(x[front], y[front], '-', drawstyle='steps-post', color='orange', linewidth=2.5,
+            zorder=3, label='Pareto front')
+    ax.scatter(x[front], y[front], s=90, facecolor='white', edgecolor='darkorange',
+               linewidth=2, zorder=4)
+    for k, i in enumerate(front.tolist()):
+        p = points[i]
+        # Alternate below/above so neighbouring front points do not overprint
+        ax.annotate(f'm={p.merges}, d={p.max_dim}, f={p.min_count}', (x[i], y[i]),
+                    xytext=(6, -12 if k % 2 == 0 else 6), textcoords='offset points',
+                    fontsize=8, color='gray')
+    ax.set_xlabel('Vocabulary size (tokens)' if xname == 'vocab_size' else xname, fontsize=11)
+    ax.set_ylabel('Held-out compression (chars / token)' if yname == 'heldout_ratio' else yname,
+                  fontsize=11)
+    ax.grid(True, alpha=0.3)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.legend(frameon=False, loc='lower right')
+    ax.set_title('Pareto Frontier: Memory Efficiency vs Generalisation of BPE Vocabularies',
+                 fontsize=14, fontweight='bold', pad=20)
+    fig.text(0.5, 0.01, "m = merges done, d = maximum simplex dimension, f = frequency threshold",
+             ha='center', fontsize=10, color='gray', style='italic')
+    plt.tight_layout(rect=(0, 0.03, 1, 1))
+    export_figure(output)
+    plt.close()
+    print(f"✓ Saved {output}")
+
+
+def format_front(results, objectives=OBJECTIVES):
+    points, metrics, front = front_of(results, objectives)
+    lines = [f"{'merges':>7s} {'max_dim':>7s} {'min_cnt':>7s} {'vocab':>7s} {'train':>7s} {'heldout':>7s}"]
+    for i in front.tolist():
+        p, m = points[i], metrics[i]
+        lines.append(f"{p.merges:>7d} {p.max_dim:>7d} {p.min_count:>7d} {m['vocab_size']:>7d} "
+                     f"{m['train_ratio']:>7.3f} {m['heldout_ratio']:>7.3f}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    import matplotlib
+    parser = argparse.ArgumentParser(description='Sweep BPE settings and extract the Pareto front.')
+    parser.add_argument('--corpus', metavar='FILE', help='text corpus (default: synthetic Zipf corpus)')
+    parser.add_argument('--size-mb', type=float, default=5.0, help='synthetic corpus size')
+    parser.add_argument('--heldout', type=float, default=0.1, help='share of words held out')
+    parser.add_argument('--merges', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    parser.add_argument('--max-dims', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--min-counts', type=int, nargs='+', default=[2, 10, 50])
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--cache', default=CACHE, help="results cache ('' disables)")
+    parser.add_argument('--plot', metavar='PNG', help='draw the front, e.g. images/pareto_frontier.png')
+    args = parser.parse_args()
+    matplotlib.use('Agg')
+    points = grid(args.merges, args.max_dims, args.min_counts)
+    results = sweep(points, (args.corpus, args.size_mb, args.heldout), args.jobs, args.cache)
+    print(format_front(results))
+    if args.plot:
+        plot_front(results, args.plot)
@@ -0,0 +1,136 @@
+"""
+Per-figure phase profiling for generate_figures.py
+Splits one figure's render into build (artist construction and everything
+else), layout (plt.tight_layout and the export stage's tight-bbox pass),
+draw (the render passes inside Figure.savefig; vector formats encode while
+drawing) and encode (PNG compression in matplotlib.image.imsave), and
+records artist count, output size and the process peak RSS so far. That is
+the all-time ru_maxrss, so in a serial build it is a running maximum rather
+than the figure's own peak (benchmarks.py renders each case in a fresh
+process). The figure functions are not modified: these calls are wrapped for
+the duration of one render.
+Requires: matplotlib
+"""
+
+import cProfile
+import csv
+import json
+import os
+import sys
+import time
+
+import matplotlib
+import matplotlib.image as mimage
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import export
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PHASES = ('build', 'layout', 'draw', 'encode')
+FIELDS = ('name', 'total', *PHASES, 'artists', 'bytes', 'process_peak_rss_mb')
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class PhaseTimer:
+    """Context manager timing the phases of the figure rendered inside it"""
+
+    def __init__(self):
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.artists = 0
+        self.total = 0.0
+
+    def _timed(self, phase, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.phases[phase] += time.perf_counter() - start
+        return wrapper
+
+    def _savefig(self, fig, *args, **kwargs):
+        if id(fig) not in self._counted:
+            # A figure exported to several formats is saved more than once
+            self._counted.add(id(fig))
+            self.artists += len(fig.findobj())
+        start = time.perf_counter()
+        encode_before = self.phases['encode']
+        try:
+            return self._originals[1](fig, *args, **kwargs)
+        finally:
+            # savefig = draw passes + encode; encode is timed separately inside it
+            self.phases['draw'] += time.perf_counter() - start - (self.phases['encode'] - encode_before)
+
+    def __enter__(self):
+        self._originals = (plt.tight_layout, Figure.savefig, mimage.imsave, export.tight_bbox)
+        self._counted = set()
+        plt.tight_layout = self._timed('layout', self._originals[0])
+        # A plain function, so fig.savefig still binds the figure
+        Figure.savefig = lambda fig, *args, **kwargs: self._savefig(fig, *args, **kwargs)
+        mimage.imsave = self._timed('encode', self._originals[2])
+        export.tight_bbox = self._timed('layout', self._originals[3])
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total = time.perf_counter() - self._start
+        plt.tight_layout, Figure.savefig, mimage.imsave, export.tight_bbox = self._originals
+        self.phases['build'] = self.total - self.phases['layout'] - self.phases['draw'] - self.phases['encode']
+        return False
+
+
+def profile_figure(name, func, output, cprofile_dir=None):
+    """Render one figure under a PhaseTimer (and cProfile); returns its record dict"""
+    profiler = cProfile.Profile() if cprofile_dir else None
+    with PhaseTimer() as timer:
+        if profiler:
+            profiler.enable()
+        try:
+            func()
+        finally:
+            if profiler:
+                profiler.disable()
+    if profiler:
+        os.makedirs(cprofile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(cprofile_dir, f'{name}.prof'))
+    record = {'name': name, 'total': timer.total, **timer.phases, 'artists': timer.artists,
+              'bytes': os.path.getsize(output) if os.path.exists(output) else None,
+              'process_peak_rss_mb': peak_rss_mb()}
+    return record
+
+
+def write_report(path, records):
+    """Write profile records as CSV (by .csv extension) or JSON"""
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        return
+    report = {'matplotlib': matplotlib.__version__,
+              'python': sys.version.split()[0],
+              'figures': records,
+              'totals': {p: sum(r[p] for r in records) for p in ('total', *PHASES)}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def format_record(r):
+    """One-line summary of a profile record"""
+    phases = ' '.join(f"{p}={r[p]:.2f}s" for p in PHASES)
+    rss = '' if r['process_peak_rss_mb'] is None else f", process peak RSS {r['process_peak_rss_mb']:.0f} MB"
+    size = '' if r['bytes'] is None else f", {r['bytes'] / 1024:.0f} KB"
+    return f"{phases}, {r['artists']} artists{size}{rss}"
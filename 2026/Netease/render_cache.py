@@ -0,0 +1,149 @@
+"""
+Content-addressed render cache for generate_figures.py
+A figure is skipped when the hash of its source code, input data, active
+rcParams and matplotlib version matches the manifest entry and the PNG on
+disk is still the one that was written.
+Requires: matplotlib, numpy
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import matplotlib
+import numpy as np
+
+MANIFEST_VERSION = 2
+
+# rcParams that change the rendered pixels
+RC_KEYS = ('figure.dpi', 'savefig.dpi', 'font.family', 'font.size')
+
+
+def _feed(h, obj):
+    """Feed one input object into the hash in a stable, type-tagged way"""
+    if isinstance(obj, np.ndarray):
+        h.update(b'ndarray')
+        h.update(str((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif inspect.isfunction(obj) or inspect.ismethod(obj) or inspect.isclass(obj) or inspect.ismodule(obj):
+        h.update(b'source')
+        h.update(inspect.getsource(obj).encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'seq%d' % len(obj))
+        for item in obj:
+            _feed(h, item)
+    elif isinstance(obj, dict):
+        h.update(b'dict%d' % len(obj))
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+    else:
+        h.update(b'repr')
+        h.update(repr(obj).encode())
+
+
+def figure_key(func, inputs=(), rc=None):
+    """Cache key of a figure: source, inputs, relevant rcParams and matplotlib version"""
+    rc = matplotlib.rcParams if rc is None else rc
+    h = hashlib.sha256()
+    h.update(matplotlib.__version__.encode())
+    _feed(h, func)
+    _feed(h, tuple(inputs))
+    _feed(h, {k: rc[k] for k in RC_KEYS})
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """On-disk manifest mapping output path -> figure name, key, output digest and render time.
+
+    Entries are keyed by output path, so builds into sibling directories that
+    share one manifest keep their own entries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        self.time_saved = 0.0
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs one full rebuild
+                self.entries = {}
+
+    def lookup(self, name, key, output, companions=()):
+        """True when `output` is a valid render for `key`; updates hit/miss stats.
+
+        `companions` are the other files of the render (e.g. SVG/PDF exports),
+        which must all exist too.
+        """
+        entry = self.entries.get(output)
+        fresh = (entry is not None
+                 and entry['name'] == name
+                 and entry['key'] == key
+                 and os.path.exists(output)
+                 and all(os.path.exists(p) for p in companions)
+                 and file_digest(output) == entry['digest'])
+        if fresh:
+            self.hits.append(name)
+            self.time_saved += entry['seconds']
+        else:
+            self.misses.append(name)
+        return fresh
+
+    def forced(self, name):
+        """Count a render that bypassed the lookup (e.g. --force) as a miss"""
+        self.misses.append(name)
+
+    def record(self, name, key, output, seconds):
+        """Store a fresh render in the manifest"""
+        self.entries[output] = {
+            'name': name,
+            'key': key,
+            'digest': file_digest(output),
+            'seconds': round(seconds, 4),
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    def evict(self, outputs):
+        """Drop stale entries: figures no longer registered, outputs that vanished, and
+        outputs in the current directory that a figure no longer writes to.
+
+        `outputs` maps every registered figure name to its output path; entries of
+        other output directories are kept. Returns the evicted output paths.
+        """
+        stale = []
+        for output, entry in self.entries.items():
+            current = outputs.get(entry['name'])
+            if (current is None or not os.path.exists(output)
+                    or (os.path.dirname(current) == os.path.dirname(output) and current != output)):
+                stale.append(output)
+        for output in stale:
+            del self.entries[output]
+        return stale
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def summary(self):
+        return (f"Cache: {len(self.hits)} hit(s), {len(self.misses)} miss(es), "
+                f"~{self.time_saved:.2f}s saved")
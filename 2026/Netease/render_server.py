@@ -0,0 +1,311 @@
+"""
+Warm render server for generate_figures.py
+A long-lived daemon keeps a pool of render workers with matplotlib, numpy,
+the repo style and the resolved fonts already loaded, and accepts figure
+jobs over a local Unix socket, so a render no longer pays interpreter,
+import and font-cache start-up. Every worker is started and warmed before
+the server reports ready; the pool size is the concurrency limit;
+requests beyond `--max-pending` queued figures are refused instead of piling
+up. SIGINT/SIGTERM or a `stop` request shut the server down cleanly (pending
+jobs finish, the socket file is removed).
+Renders go through the same render cache, output directory and export
+targets as generate_figures.py: unchanged figures are answered from the cache
+without reaching a worker.
+Protocol: one JSON object per line in each direction, e.g.
+  {"op": "render", "figures": ["figure3"], "out": "images", "export": ["svg"], "force": false}
+      -> {"ok": true, "results": [...], "cache": "...", "seconds": ...}
+  {"op": "ping"} / {"op": "stop"}
+Requires: matplotlib, numpy (Unix domain sockets, i.e. Linux/macOS)
+Usage: python render_server.py serve [--jobs 2] [--socket PATH]
+       python render_server.py render figure1 figure3 [--out DIR] [--export svg pdf] [--force]
+       python render_server.py ping | stop [--socket PATH]
+       (--socket may also come before the command; --out is relative to the server --root)
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOCKET = os.path.join(HERE, '.render_server.sock')
+
+# ==================== Worker ====================
+
+_barrier = None  # warm-up barrier shared by the whole pool (set in each worker)
+
+def _init_worker(root, barrier=None):
+    """Warm a worker once: imports, Agg backend, style and font resolution"""
+    global _barrier
+    _barrier = barrier
+    os.chdir(root)
+    sys.path.insert(0, HERE)
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import font_manager
+    import figures
+    figures.apply_style()
+    font_manager.findfont(font_manager.FontProperties(family=matplotlib.rcParams['font.family']))
+    # One throwaway draw fills the glyph, text-layout and mathtext caches
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.set_title('warm-up $K^*$', fontweight='bold')
+    ax.text(0.5, 0.5, '{a,b}', style='italic')
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _warm(timeout=120):
+    """Warm-up task: holds its worker until every worker has taken one.
+
+    The pool spawns workers lazily and an idle one would take every task,
+    so the barrier is what forces all of them to start.
+    """
+    if _barrier is not None:
+        _barrier.wait(timeout)
+    return os.getpid()
+
+
+def _render(name, out_dir, targets):
+    """Render one figure in a warm worker; returns a JSON-ready result dict"""
+    import export
+    import generate_figures
+    generate_figures.set_output_dir(out_dir)
+    export.configure(targets)
+    name, seconds, error, _, exports = generate_figures.render_job(name)
+    output = generate_figures.FIGURE_SPECS[name].output
+    return {'name': name, 'path': os.path.abspath(output), 'output': output, 'seconds': seconds,
+            'error': error, 'exports': exports, 'cached': False}
+
+# ==================== Server ====================
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server dispatching figure jobs to a warm process pool"""
+
+    daemon_threads = True
+
+    def __init__(self, path=SOCKET, jobs=2, max_pending=32, root=HERE):
+        import generate_figures
+        path = os.path.abspath(path)
+        # Output directories and the render cache resolve against root, as in the workers
+        os.chdir(root)
+        generate_figures.load_figures()
+        self.gf = generate_figures
+        self.figures = list(generate_figures.REGISTERED)
+        self.socket_path = path
+        self.max_pending = max_pending
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.cache_lock = threading.Lock()  # output dir / export targets of this process + manifest
+        self.started = time.time()
+        self.rendered = 0
+        barrier = multiprocessing.Barrier(jobs)
+        self.pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                        initargs=(root, barrier))
+        # Start every worker now so the first request is already warm
+        pids = set()
+        for future in [self.pool.submit(_warm) for _ in range(jobs)]:
+            try:
+                pids.add(future.result())
+            except threading.BrokenBarrierError:
+                pass
+        self.jobs = jobs
+        self.workers = len(pids)
+        if self.workers < jobs:
+            print(f"✗ Only {self.workers} of {jobs} worker(s) started; the rest start cold on first use")
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a crashed server
+        super().__init__(path, RenderHandler)
+
+    def admit(self, n):
+        """Reserve `n` queue slots; False when the server is saturated"""
+        with self.lock:
+            if self.pending + n > self.max_pending:
+                return False
+            self.pending += n
+            return True
+
+    def release(self, n):
+        with self.lock:
+            self.pending -= n
+            self.rendered += n
+
+    def _plan(self, names, out_dir, targets, force):
+        """(cache keys, specs, names to render, cache summary) for one request"""
+        import export
+        from render_cache import RenderCache
+        with self.cache_lock:
+            self.gf.set_output_dir(out_dir)
+            export.configure(targets)
+            cache = RenderCache(self.gf.manifest_path())
+            specs, keys, todo = self.gf.plan(cache, names, force)
+            return keys, specs, todo, cache.summary()
+
+    def _record(self, out_dir, keys, results):
+        """Add the successful renders to the manifest of `out_dir`"""
+        from render_cache import RenderCache
+        with self.cache_lock:
+            self.gf.set_output_dir(out_dir)
+            cache = RenderCache(self.gf.manifest_path())  # re-read: other requests may have saved
+            for r in results:
+                if r['error'] is None:
+                    cache.record(r['name'], keys[r['name']], r['output'], r['seconds'])
+            cache.save()
+
+    def render(self, names, out_dir=None, export_specs=None, force=False):
+        import export
+        unknown = [n for n in names if n not in self.figures]
+        if unknown:
+            return {'ok': False, 'error': f"unknown figure(s): {', '.join(unknown)}"}
+        out_dir = out_dir or self.gf.OUT_DIR
+        targets = export.parse_targets(export_specs)
+        start = time.perf_counter()
+        keys, specs, todo, summary = self._plan(names, out_dir, targets, force)
+        if not self.admit(len(todo)):
+            return {'ok': False, 'error': 'busy: too many pending figures, retry later'}
+        try:
+            futures = {n: self.pool.submit(_render, n, out_dir, targets) for n in todo}
+            rendered = {n: f.result() for n, f in futures.items()}
+        finally:
+            self.release(len(todo))
+        if rendered:
+            self._record(out_dir, keys, rendered.values())
+        results = [rendered.get(n) or {'name': n, 'path': os.path.abspath(specs[n].output), 'seconds': 0.0,
+                                       'error': None, 'exports': [], 'cached': True} for n in names]
+        return {'ok': all(r['error'] is None for r in results), 'results': results,
+                'cache': summary, 'seconds': time.perf_counter() - start}
+
+    def status(self):
+        return {'ok': True, 'pid': os.getpid(), 'jobs': self.jobs, 'workers': self.workers,
+                'pending': self.pending, 'rendered': self.rendered,
+                'uptime': time.time() - self.started, 'figures': self.figures}
+
+    def stop(self):
+        """Stop accepting requests; serve_forever() returns and close() cleans up"""
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def close(self):
+        self.server_close()
+        self.pool.shutdown(wait=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    """One client connection: JSON requests in, JSON responses out, one per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op == 'render':
+                    names = request.get('figures') or self.server.figures
+                    response = self.server.render(list(names), request.get('out'), request.get('export'),
+                                                  bool(request.get('force')))
+                elif op == 'ping':
+                    response = self.server.status()
+                elif op == 'stop':
+                    response = {'ok': True, 'stopping': True}
+                    self.server.stop()
+                else:
+                    response = {'ok': False, 'error': f"unknown op: {op!r}"}
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + '\n').encode())
+            self.wfile.flush()
+
+
+def serve(path=SOCKET, jobs=2, max_pending=32, root=HERE):
+    """Run the server until a stop request or SIGINT/SIGTERM"""
+    start = time.perf_counter()
+    server = RenderServer(path, jobs, max_pending, root)
+    print(f"✓ Render server ready on {path} with {server.workers} warm worker(s) "
+          f"in {time.perf_counter() - start:.2f}s")
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: server.stop())
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        print("✓ Render server stopped")
+
+# ==================== Client ====================
+
+def request(payload, path=SOCKET, timeout=None):
+    """Send one request to the server and return its decoded response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall((json.dumps(payload) + '\n').encode())
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def render(figures=None, path=SOCKET, out_dir=None, export=None, force=False):
+    """Render figures on the server; returns the response dict"""
+    return request({'op': 'render', 'figures': list(figures or []), 'out': out_dir,
+                    'export': list(export or []), 'force': force}, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Warm render server and client for the figures.')
+    parser.add_argument('--socket', default=SOCKET, help=f'Unix socket path (default: {SOCKET})')
+    # Also accepted after the command; SUPPRESS keeps a top-level --socket when it is absent there
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--socket', default=argparse.SUPPRESS, help='Unix socket path')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_serve = sub.add_parser('serve', parents=[common], help='start the server in the foreground')
+    p_serve.add_argument('--jobs', '-j', type=int, default=2, help='warm worker processes (concurrency limit)')
+    p_serve.add_argument('--max-pending', type=int, default=32,
+                         help='refuse requests once this many figures are queued')
+    p_serve.add_argument('--root', default=HERE, help='directory whose images/ the figures are written to')
+    p_render = sub.add_parser('render', parents=[common],
+                              help='render figures (default: all) on a running server')
+    p_render.add_argument('figures', nargs='*')
+    p_render.add_argument('--out', metavar='DIR', help='output directory, relative to the server root '
+                                                       '(default: images)')
+    p_render.add_argument('--export', nargs='+', metavar='FORMAT[:DPI[:LEVEL]]',
+                          help='export targets as in generate_figures.py, e.g. svg pdf')
+    p_render.add_argument('--force', action='store_true', help='ignore the render cache')
+    sub.add_parser('ping', parents=[common], help='show server status')
+    sub.add_parser('stop', parents=[common], help='shut the server down')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket, args.jobs, args.max_pending, args.root)
+        return 0
+    try:
+        start = time.perf_counter()
+        if args.command == 'render':
+            response = render(args.figures, args.socket, args.out, args.export, args.force)
+        else:
+            response = request({'op': args.command}, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"✗ No render server on {args.socket}; start one with: python render_server.py serve")
+        return 1
+    if args.command == 'render' and 'results' in response:
+        for r in response['results']:
+            state = 'FAILED' if r['error'] else 'unchanged' if r['cached'] else 'ok'
+            print(f"  {r['name']}: {state} ({r['seconds']:.2f}s) {r['path']}")
+            if r['exports']:
+                from export import format_results
+                print(f"    {format_results(r['exports'])}")
+            if r['error']:
+                print(r['error'])
+        print(response['cache'])
+        print(f"Round trip: {time.perf_counter() - start:.2f}s")
+    else:
+        print(json.dumps(response, indent=2))
+    return 0 if response.get('ok') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+Compact array-backed simplicial complex
+Each dimension is stored as one contiguous int32 array of shape (n, dim+1)
+whose rows are sorted vertex ids in lexicographic (canonical) order, plus
+optional float weights and +1/-1 orientations. There are no per-simplex
+Python objects: memory is ~4*(dim+1) bytes per simplex, plus 8 bytes per
+simplex for the lookup keys once they are first needed.
+Requires: numpy
+"""
+
+import numpy as np
+
+INDEX_DTYPE = np.int32
+
+
+def _inversion_parity(rows):
+    """+1 for rows that are an even permutation of their sorted order, -1 for odd"""
+    k = rows.shape[1]
+    inversions = np.zeros(len(rows), dtype=np.int64)
+    for i in range(k):
+        for j in range(i + 1, k):
+            inversions += rows[:, i] > rows[:, j]
+    return np.where(inversions % 2, -1, 1).astype(np.int8)
+
+
+def row_keys(rows, n_vertices):
+    """Order-preserving scalar keys for canonical rows.
+
+    Mixed-radix int64 when n_vertices**k fits, otherwise big-endian bytes
+    (whose memcmp order equals the numeric lexicographic order).
+    """
+    rows = np.asarray(rows)
+    k = rows.shape[1]
+    if k == 0 or float(max(n_vertices, 1)) ** k < 2.0 ** 63:
+        keys = np.zeros(len(rows), dtype=np.int64)
+        for c in range(k):
+            keys = keys * max(n_vertices, 1) + rows[:, c]
+        return keys
+    be = np.ascontiguousarray(rows, dtype='>u4')
+    return be.view(np.dtype((np.void, 4 * k))).ravel()
+
+
+class SimplicialComplex:
+    """Simplicial complex stored as canonical int32 arrays per dimension.
+
+    simplices  : dict dim -> (n, dim+1) array of vertex ids (any order, duplicates allowed)
+    weights    : optional dict dim -> (n,) weights; duplicates are summed
+    orientations: optional dict dim -> (n,) +1/-1; by default taken from the
+                  given vertex order (an odd permutation of the sorted row is -1)
+    n_vertices : vertex count (default: max vertex id + 1)
+    labels     : optional vertex labels
+    """
+
+    def __init__(self, simplices, weights=None, orientations=None, n_vertices=None, labels=None):
+        simplices = {int(d): np.asarray(s, dtype=np.int64).reshape(-1, int(d) + 1)
+                     for d, s in simplices.items() if len(s)}
+        if n_vertices is None:
+            n_vertices = max((int(s.max()) + 1 for s in simplices.values()), default=0)
+        if labels is not None:
+            n_vertices = max(n_vertices, len(labels))
+        self.n_vertices = int(n_vertices)
+        if self.n_vertices > np.iinfo(INDEX_DTYPE).max:
+            raise ValueError(f"too many vertices for int32 storage: {self.n_vertices}")
+        self.labels = labels
+        self._simplices = {}
+        self._weights = {}
+        self._orientations = {}
+        self._keys = {}
+        self._coface_csr = {}
+        weights = weights or {}
+        orientations = orientations or {}
+        for d, rows in simplices.items():
+            if rows.min() < 0 or rows.max() >= self.n_vertices:
+                raise ValueError(f"vertex id out of range in dimension {d}")
+            w = weights.get(d)
+            o = orientations.get(d)
+            if o is None:
+                o = _inversion_parity(rows)
+            self._store(d, np.sort(rows, axis=1), w, o)
+
+    def _store(self, dim, rows, weights=None, orientations=None):
+        """Canonicalize sorted-vertex rows: lexicographic order, duplicates merged"""
+        keys = row_keys(rows, self.n_vertices)
+        uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        self._simplices[dim] = np.ascontiguousarray(rows[first], dtype=INDEX_DTYPE)
+        self._keys[dim] = uniq
+        if weights is not None:
+            self._weights[dim] = np.bincount(inverse.ravel(), weights=np.asarray(weights, dtype=float),
+                                             minlength=len(uniq))
+        if orientations is not None:
+            self._orientations[dim] = np.asarray(orientations, dtype=np.int8)[first]
+
+    # ---------- Construction ----------
+
+    @classmethod
+    def from_simplices(cls, simplices, weights=None, n_vertices=None, labels=None, close=False):
+        """Build from a flat list of simplices (vertex id sequences of any dimension).
+
+        The given vertex order of each simplex defines its orientation.
+        """
+        groups, wgroups = {}, {}
+        for i, s in enumerate(simplices):
+            groups.setdefault(len(s) - 1, []).append(s)
+            if weights is not None:
+                wgroups.setdefault(len(s) - 1, []).append(weights[i])
+        complex_ = cls(groups, wgroups if weights is not None else None,
+                       n_vertices=n_vertices, labels=labels)
+        return complex_.closure() if close else complex_
+
+    def closure(self):
+        """Smallest complex containing this one and closed under taking faces.
+
+        Added faces get weight 0 and orientation +1.
+        """
+        simplices = dict(self._simplices)
+        weights = dict(self._weights)
+        orientations = dict(self._orientations)
+        for d in range(self.dim, 0, -1):
+            if d not in simplices:
+                continue
+            faces = _all_faces(simplices[d]).reshape(-1, d)
+            if d - 1 in simplices:
+                faces = np.concatenate([simplices[d - 1], faces])
+            faces = np.sort(faces, axis=1)
+            keys = row_keys(faces, self.n_vertices)
+            uniq, first = np.unique(keys, return_index=True)
+            n_old = len(simplices.get(d - 1, ()))
+            new_rows = faces[first]
+            # Existing rows come first in `faces`, so their index in `first` is < n_old
+            if weights:
+                w = np.zeros(len(uniq))
+                if d - 1 in weights:
+                    old = first < n_old
+                    w[old] = weights[d - 1][first[old]]
+                weights[d - 1] = w
+            o = np.ones(len(uniq), dtype=np.int8)
+            if d - 1 in orientations:
+                old = first < n_old
+                o[old] = orientations[d - 1][first[old]]
+            orientations[d - 1] = o
+            simplices[d - 1] = new_rows
+        return SimplicialComplex._from_canonical(simplices, weights, orientations,
+                                                 self.n_vertices, self.labels)
+
+    @classmethod
+    def _from_canonical(cls, simplices, weights, orientations, n_vertices, labels):
+        """Wrap arrays that are already canonical (sorted rows, lexicographic, unique)"""
+        obj = cls.__new__(cls)
+        obj.n_vertices = int(n_vertices)
+        obj.labels = labels
+        obj._simplices = {d: np.ascontiguousarray(s, dtype=INDEX_DTYPE) for d, s in simplices.items()}
+        obj._weights = {d: np.asarray(w, dtype=float) for d, w in weights.items() if d in simplices}
+        obj._orientations = {d: np.asarray(o, dtype=np.int8) for d, o in orientations.items() if d in simplices}
+        obj._keys = {}
+        obj._coface_csr = {}
+        return obj
+
+    # ---------- Basic queries ----------
+
+    @property
+    def dim(self):
+        return max(self._simplices, default=-1)
+
+    @property
+    def dims(self):
+        return sorted(self._simplices)
+
+    def __len__(self):
+        return sum(len(s) for s in self._simplices.values())
+
+    def __repr__(self):
+        counts = ', '.join(f'{d}:{len(self._simplices[d])}' for d in self.dims)
+        return f'SimplicialComplex(n_vertices={self.n_vertices}, simplices={{{counts}}})'
+
+    def count(self, dim):
+        return len(self._simplices.get(dim, ()))
+
+    def simplices(self, dim):
+        """Canonical (n, dim+1) int32 array of the dim-simplices"""
+        return self._simplices.get(dim, np.empty((0, dim + 1), dtype=INDEX_DTYPE))
+
+    def by_dim(self):
+        """dim -> simplex array mapping, as taken by complex_draw.draw_complex"""
+        return dict(self._simplices)
+
+    def weights(self, dim):
+        """Per-simplex weights of dimension `dim`, or None"""
+        return self._weights.get(dim)
+
+    def orientations(self, dim):
+        """Per-simplex orientations (+1/-1) of dimension `dim` (all +1 if unset)"""
+        o = self._orientations.get(dim)
+        return np.ones(self.count(dim), dtype=np.int8) if o is None else o
+
+    def oriented(self, dim):
+        """Simplices with their vertex order restored to their orientation.
+
+        Negatively oriented rows have their first two vertices swapped, so a
+        directed edge (j, i) comes back as (j, i) rather than (i, j).
+        """
+        rows = self.simplices(dim).copy()
+        if dim >= 1:
+            neg = self.orientations(dim) < 0
+            rows[neg, :2] = rows[neg, 1::-1]
+        return rows
+
+    def skeleton(self, k):
+        """Sub-complex of all simplices of dimension <= k"""
+        keep = [d for d in self._simplices if d <= k]
+        return SimplicialComplex._from_canonical(
+            {d: self._simplices[d] for d in keep},
+            {d: self._weights[d] for d in keep if d in self._weights},
+            {d: self._orientations[d] for d in keep if d in self._orientations},
+            self.n_vertices, self.labels)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the simplex, weight, orientation and key arrays"""
+        arrays = [*self._simplices.values(), *self._weights.values(),
+                  *self._orientations.values(), *self._keys.values()]
+        for indptr, indices in self._coface_csr.values():
+            arrays += [indptr, indices]
+        return sum(a.nbytes for a in arrays)
+
+    # ---------- Membership ----------
+
+    def _sorted_keys(self, dim):
+        if dim not in self._keys:
+            self._keys[dim] = row_keys(self.simplices(dim), self.n_vertices)
+        return self._keys[dim]
+
+    def index_of(self, rows, dim=None):
+        """Indices of the given simplices (any vertex order), -1 where absent. O(log n) each"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        dim = rows.shape[1] - 1 if dim is None else dim
+        if self.count(dim) == 0 or len(rows) == 0:
+            return np.full(len(rows), -1, dtype=np.int64)
+        rows = np.sort(rows, axis=1)
+        valid = (rows.min(axis=1) >= 0) & (rows.max(axis=1) < self.n_vertices)
+        keys = self._sorted_keys(dim)
+        query = row_keys(np.where(valid[:, None], rows, 0), self.n_vertices)
+        pos = np.searchsorted(keys, query)
+        pos_c = np.minimum(pos, len(keys) - 1)
+        found = valid & (pos < len(keys)) & (keys[pos_c] == query)
+        return np.where(found, pos_c, -1)
+
+    def __contains__(self, simplex):
+        return bool(self.index_of(list(simplex))[0] >= 0)
+
+    # ---------- Faces and cofaces ----------
+
+    def faces(self, dim, idx=None):
+        """Indices of the codimension-1 faces of dim-simplices, shape (n, dim+1).
+
+        Column j is the face opposite vertex j; -1 marks faces missing from a
+        complex that is not closed.
+        """
+        rows = self.simplices(dim) if idx is None else self.simplices(dim)[np.atleast_1d(idx)]
+        if dim == 0:
+            return np.empty((len(rows), 0), dtype=np.int64)
+        faces = _all_faces(rows)
+        return self.index_of(faces.reshape(-1, dim), dim - 1).reshape(len(rows), dim + 1)
+
+    def coface_csr(self, dim):
+        """CSR (indptr, indices): dim-simplex i is a face of the (dim+1)-simplices indices[indptr[i]:indptr[i+1]]"""
+        if dim not in self._coface_csr:
+            face_idx = self.faces(dim + 1).ravel() if self.count(dim + 1) else np.empty(0, dtype=np.int64)
+            owner = np.repeat(np.arange(self.count(dim + 1), dtype=np.int64), dim + 2)
+            ok = face_idx >= 0
+            face_idx, owner = face_idx[ok], owner[ok]
+            order = np.argsort(face_idx, kind='stable')
+            indptr = np.zeros(self.count(dim) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(face_idx, minlength=self.count(dim)), out=indptr[1:])
+            self._coface_csr[dim] = (indptr, owner[order].astype(INDEX_DTYPE))
+        return self._coface_csr[dim]
+
+    def cofaces(self, dim, i):
+        """Indices of the (dim+1)-simplices that have dim-simplex `i` as a face"""
+        indptr, indices = self.coface_csr(dim)
+        return indices[indptr[i]:indptr[i + 1]]
+
+    def is_closed(self):
+        """True when every face of every simplex is in the complex"""
+        return all((self.faces(d) >= 0).all() for d in self.dims if d > 0)
+
+
+def _all_faces(rows):
+    """(n, k+1, k) array: face j of each row drops column j (rows stay sorted)"""
+    k1 = rows.shape[1]
+    cols = np.array([[c for c in range(k1) if c != j] for j in range(k1)], dtype=np.intp)
+    return rows[:, cols]
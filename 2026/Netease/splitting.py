@@ -0,0 +1,254 @@
+"""
+Inverse splitting engine behind the figure3 pullback illustration
+A weighted complex (clusters of atoms with support weights) is split from
+its global simplices downwards: every iteration decomposes the current
+clusters into their codimension-1 faces, adds the pullbacks (pairwise
+intersections) of clusters that share an atom, and filters the candidates
+by support threshold. The iteration stops when no new cluster survives; the
+limit is the minimal cluster set, the survivors (of any iteration) that
+contain no other survivor (so of {A,B}, {B,C} and {A} it is {B,C} and {A}).
+Containment is found on the same sparse co-occurrence product as the
+pullbacks, so it also needs no pairwise pass over all survivors.
+Clusters are sentinel-padded sorted atom rows, so face generation,
+intersection, deduplication and support lookup are all NumPy operations
+whose cost does not depend on the vocabulary size.
+Requires: numpy
+Benchmark: python splitting.py [--clusters 200000] [--atoms 100000] [--threshold 3]
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from conjugate import csr_transpose, gram_offdiag
+from simplicial_complex import row_keys
+
+# One iteration of the inverse system: the candidate clusters it produced
+# (faces + pullbacks), the ones that passed the support filter, and its cost
+SplitStep = namedtuple('SplitStep', ['iteration', 'candidates', 'kept', 'dropped', 'seconds'])
+
+# ==================== Padded Cluster Rows ====================
+# A cluster is a row of sorted atom ids padded with the sentinel n_atoms, so a
+# batch of clusters is one (n, width) int64 array regardless of vocabulary size.
+
+def to_rows(clusters, n_atoms, width=None):
+    """(n, width) sentinel-padded sorted rows of a list of atom index rows"""
+    lengths = np.fromiter((len(r) for r in clusters), dtype=np.int64, count=len(clusters))
+    width = int(lengths.max(initial=1)) if width is None else width
+    atoms = np.fromiter((a for r in clusters for a in r), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.full((len(clusters), width), n_atoms, dtype=np.int64)
+    owner = np.repeat(np.arange(len(clusters)), lengths)
+    rows[owner, np.arange(len(atoms)) - np.repeat(np.cumsum(lengths) - lengths, lengths)] = atoms
+    return _canonical(rows, n_atoms)
+
+
+def _canonical(rows, n_atoms):
+    """Sort each row and turn repeated atoms into padding"""
+    rows = np.sort(rows, axis=1)
+    rows[:, 1:][rows[:, 1:] == rows[:, :-1]] = n_atoms
+    return np.sort(rows, axis=1)
+
+
+def incidence(rows, n_atoms):
+    """(cluster, atom) pairs of every real entry, ordered by cluster then atom"""
+    owner, col = np.nonzero(rows < n_atoms)
+    return owner.astype(np.int64), rows[owner, col]
+
+
+def _lookup(sorted_keys, query):
+    """Index of each query key in `sorted_keys`, -1 where absent"""
+    if len(sorted_keys) == 0:
+        return np.full(len(query), -1, dtype=np.int64)
+    pos = np.searchsorted(sorted_keys, query)
+    pos_c = np.minimum(pos, len(sorted_keys) - 1)
+    return np.where(sorted_keys[pos_c] == query, pos_c, -1)
+
+
+def faces_of(rows, n_atoms):
+    """Codimension-1 faces: every cluster with one of its atoms dropped (empty faces dropped)"""
+    n, width = rows.shape
+    if n == 0 or width == 1:
+        return rows[:0]
+    keep = np.array([[c for c in range(width) if c != j] for j in range(width)], dtype=np.intp)
+    faces = rows[:, keep]                                  # (n, width, width-1)
+    real = rows < n_atoms                                  # only dropping a real atom is a face
+    faces = faces[real & (real.sum(axis=1, keepdims=True) > 1)]
+    return np.concatenate([faces, np.full((len(faces), 1), n_atoms, dtype=np.int64)], axis=1)
+
+
+def intersect(a, b, n_atoms):
+    """Row-wise intersection of two batches of padded clusters"""
+    member = (a[:, :, None] == b[:, None, :]).any(axis=2) & (a < n_atoms)
+    return np.sort(np.where(member, a, n_atoms), axis=1)
+
+
+def sharing_pairs(rows, n_atoms, max_degree=None):
+    """(pairs (m, 2), shared atom counts) of clusters sharing an atom.
+
+    Pairs come from the sparse co-occurrence product of the cluster x atom
+    incidence matrix, so disjoint pairs are never formed; atoms in more than
+    `max_degree` clusters are not counted.
+    """
+    owner, atoms = incidence(rows, n_atoms)
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=len(rows)), out=indptr[1:])
+    stars = csr_transpose(indptr, atoms, n_atoms)
+    return gram_offdiag(indptr, atoms, *stars, max_degree)
+
+
+def pullbacks(rows, n_atoms, max_degree=None):
+    """Non-empty pairwise intersections X x_K Y = X & Y of clusters sharing an atom"""
+    pairs, _ = sharing_pairs(rows, n_atoms, max_degree)
+    return intersect(rows[pairs[:, 0]], rows[pairs[:, 1]], n_atoms)
+
+
+def minimal(rows, n_atoms, max_degree=None):
+    """The distinct clusters of `rows` that contain no other one, in input order.
+
+    Y is inside X exactly when |X & Y| = |Y| < |X|. Overlaps are taken
+    exactly on the sharing pairs, so only a cluster made of hub atoms alone
+    (see max_degree) can be missed as a subset.
+    """
+    if len(rows) < 2:
+        return rows
+    pairs, _ = sharing_pairs(rows, n_atoms, max_degree)
+    i, j = pairs[:, 0], pairs[:, 1]
+    size = (rows < n_atoms).sum(axis=1)
+    overlap = (intersect(rows[i], rows[j], n_atoms) < n_atoms).sum(axis=1)
+    covered = np.zeros(len(rows), dtype=bool)
+    covered[i[(overlap == size[j]) & (size[j] < size[i])]] = True
+    covered[j[(overlap == size[i]) & (size[i] < size[j])]] = True
+    return rows[~covered]
+
+# ==================== Inverse Splitting ====================
+
+class InverseSplitting:
+    """Inverse splitting of a weighted complex into the clusters passing its support filter.
+
+    clusters: atom index rows (any dimension); weights: support per cluster
+    (duplicates are summed). A candidate's support is the weight of the
+    identical cluster, 0 when the complex does not contain it.
+    """
+
+    def __init__(self, clusters, weights=None, n_atoms=None, atom_labels=None, max_degree=None):
+        if n_atoms is None:
+            n_atoms = max((max(r) for r in clusters if len(r)), default=-1) + 1
+        if atom_labels is not None:
+            n_atoms = max(n_atoms, len(atom_labels))
+        self.n_atoms = int(n_atoms)
+        self.atom_labels = atom_labels
+        self.max_degree = max_degree
+        rows = to_rows(clusters, self.n_atoms)
+        weights = np.ones(len(rows)) if weights is None else np.asarray(weights, dtype=float)
+        self._keys, first, inverse = np.unique(self.keys(rows), return_index=True, return_inverse=True)
+        self.rows = rows[first]
+        self.support = np.bincount(inverse.ravel(), weights=weights, minlength=len(first))
+        self.trace = []
+        self.roots = None
+        self.survivors = None
+        self.limit = None
+
+    @classmethod
+    def from_complex(cls, K, max_degree=None):
+        """Every weighted simplex of a SimplicialComplex becomes a cluster"""
+        rows, weights = [], []
+        for d in K.dims:
+            w = K.weights(d)
+            rows.extend(K.simplices(d).tolist())
+            weights.extend(np.zeros(K.count(d)) if w is None else w)
+        return cls(rows, weights, K.n_vertices, K.labels, max_degree)
+
+    def keys(self, rows):
+        """Order-preserving scalar keys of padded rows (the sentinel is one more radix digit)"""
+        return row_keys(rows, self.n_atoms + 1)
+
+    def supports(self, rows):
+        """Support of arbitrary padded clusters"""
+        idx = _lookup(self._keys, self.keys(rows))
+        return np.where(idx >= 0, self.support[np.maximum(idx, 0)], 0.0)
+
+    def maximal(self):
+        """Clusters not contained in any other cluster: the global complex"""
+        covered = _lookup(self._keys, self.keys(faces_of(self.rows, self.n_atoms)))
+        mask = np.ones(len(self.rows), dtype=bool)
+        mask[covered[covered >= 0]] = False
+        return self.rows[mask]
+
+    def run(self, threshold, roots=None, max_iter=None):
+        """Split from `roots` (default: the maximal clusters) until no new cluster survives.
+
+        Returns the trace, one SplitStep per iteration; the roots themselves
+        are not filtered. self.survivors holds every cluster that passed the
+        filter, self.limit the minimal ones among them.
+        """
+        width = self.rows.shape[1]
+        self.roots = self.maximal() if roots is None else to_rows(roots, self.n_atoms, width)
+        self.trace = []
+        seen = np.sort(self.keys(self.roots))
+        frontier = self.roots
+        survivors = []
+        iteration = 0
+        while len(frontier) and (max_iter is None or iteration < max_iter):
+            start = time.perf_counter()
+            iteration += 1
+            candidates = np.concatenate([faces_of(frontier, self.n_atoms),
+                                         pullbacks(frontier, self.n_atoms, self.max_degree)])
+            candidates = candidates[candidates[:, 0] < self.n_atoms]  # drop empty intersections
+            keys, first = np.unique(self.keys(candidates), return_index=True)
+            fresh = _lookup(seen, keys) < 0
+            candidates, keys = candidates[first[fresh]], keys[fresh]
+            passed = self.supports(candidates) >= threshold
+            seen = np.sort(np.concatenate([seen, keys]))
+            frontier = candidates[passed]
+            survivors.append(frontier)
+            self.trace.append(SplitStep(iteration, candidates, frontier, candidates[~passed],
+                                        time.perf_counter() - start))
+        self.survivors = np.concatenate(survivors) if survivors else self.roots[:0]
+        self.limit = minimal(self.survivors, self.n_atoms, self.max_degree)
+        return self.trace
+
+    def atoms(self, rows):
+        """Atom index arrays of padded clusters"""
+        return [row[row < self.n_atoms] for row in rows]
+
+    def names(self, rows):
+        """Cluster labels in set notation, e.g. '{A,B}'"""
+        name = str if self.atom_labels is None else (lambda a: self.atom_labels[a])
+        return ['{' + ','.join(name(a) for a in row.tolist()) + '}' for row in self.atoms(rows)]
+
+    def report(self):
+        """One line per iteration: candidates, survivors and time"""
+        lines = [f"iter {s.iteration}: {len(s.candidates):,} candidates -> {len(s.kept):,} kept, "
+                 f"{len(s.dropped):,} dropped in {s.seconds * 1e3:.1f} ms" for s in self.trace]
+        total = sum(s.seconds for s in self.trace)
+        limit, survivors = (0, 0) if self.limit is None else (len(self.limit), len(self.survivors))
+        lines.append(f"limit: {limit:,} minimal of {survivors:,} surviving clusters after "
+                     f"{len(self.trace)} iterations, {total:.2f}s")
+        return '\n'.join(lines)
+
+# ==================== Benchmark ====================
+
+def benchmark(n_clusters=200_000, n_atoms=100_000, max_len=6, threshold=3, seed=0):
+    """Inverse splitting of random Zipf-weighted clusters over a large vocabulary"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, max_len + 1, n_clusters)
+    atoms = np.minimum(rng.zipf(1.3, int(lengths.sum())) - 1, n_atoms - 1)
+    clusters = [np.unique(r).tolist() for r in np.split(atoms, np.cumsum(lengths)[:-1])]
+    weights = rng.zipf(1.5, n_clusters).astype(float)
+    start = time.perf_counter()
+    engine = InverseSplitting(clusters, weights, n_atoms, max_degree=100)
+    print(f"{len(engine.rows):,} distinct clusters over {n_atoms:,} atoms, indexed in {time.perf_counter() - start:.2f}s")
+    engine.run(threshold)
+    print(engine.report())
+    return engine
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the inverse splitting engine.')
+    parser.add_argument('--clusters', type=int, default=200_000)
+    parser.add_argument('--atoms', type=int, default=100_000)
+    parser.add_argument('--threshold', type=float, default=3)
+    args = parser.parse_args()
+    benchmark(args.clusters, args.atoms, threshold=args.threshold)
@@ -0,0 +1,100 @@
+"""
+Tests of the incremental BPE engine against known merges and a naive
+recount-every-step trainer
+Requires: numpy, pytest
+Usage: python -m pytest -q test_bpe_engine.py
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from bpe_engine import BPETrainer
+
+
+def naive_bpe(word_counts, num_merges, min_count=2):
+    """Recount all adjacent pairs before every merge; ties go to the smallest ids"""
+    vocab = sorted({ch for w in word_counts for ch in w})
+    ids = {tok: i for i, tok in enumerate(vocab)}
+    words = {w: [ids[ch] for ch in w] for w in word_counts}
+    merges = []
+    while len(merges) < num_merges:
+        counts = Counter()
+        for w, syms in words.items():
+            for pair in zip(syms, syms[1:]):
+                counts[pair] += word_counts[w]
+        if not counts:
+            break
+        pair, count = min(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        if count < min_count:
+            break
+        new = len(vocab)
+        vocab.append(vocab[pair[0]] + vocab[pair[1]])
+        for w, syms in words.items():
+            out, i = [], 0
+            while i < len(syms):
+                if i + 1 < len(syms) and (syms[i], syms[i + 1]) == pair:
+                    out.append(new)
+                    i += 2
+                else:
+                    out.append(syms[i])
+                    i += 1
+            words[w] = out
+        merges.append((vocab[pair[0]], vocab[pair[1]], vocab[new], count))
+    return merges, {w: [vocab[s] for s in syms] for w, syms in words.items()}
+
+
+def random_counts(seed=0, n_words=300):
+    rng = np.random.default_rng(seed)
+    words = [''.join(rng.choice(list('abcd'), size=rng.integers(1, 9))) for _ in range(n_words)]
+    return Counter(words)
+
+# ==================== Known Merges ====================
+
+def test_bpe_overlapping_run():
+    trainer = BPETrainer.from_text('aaaa')
+    steps = trainer.train(10, min_count=1)
+    assert [(s.left, s.right, s.token, s.count) for s in steps] == [('a', 'a', 'aa', 3),
+                                                                    ('aa', 'aa', 'aaaa', 1)]
+    assert list(trainer.segmentation()) == [('aaaa', ['aaaa'], 1)]
+    assert trainer.compression_ratio == 4.0
+
+
+def test_bpe_min_count():
+    trainer = BPETrainer.from_text('aaaa')
+    assert [s.token for s in trainer.train(10)] == ['aa']
+    assert list(trainer.segmentation()) == [('aaaa', ['aa', 'aa'], 1)]
+
+# ==================== Naive Reference ====================
+
+def test_matches_naive_trainer():
+    for seed in range(3):
+        counts = random_counts(seed)
+        trainer = BPETrainer(counts)
+        steps = trainer.train(40)
+        merges, segmentation = naive_bpe(counts, 40)
+        assert [(s.left, s.right, s.token, s.count) for s in steps] == merges
+        assert {w: tokens for w, tokens, _ in trainer.segmentation()} == segmentation
+        chars = sum(len(w) * c for w, c in counts.items())
+        tokens = sum(len(segmentation[w]) * c for w, c in counts.items())
+        assert trainer.compression_ratio == chars / tokens
+
+
+def test_max_len_bans_long_tokens():
+    trainer = BPETrainer(random_counts(1))
+    steps = trainer.train(60, max_len=3)
+    assert steps and max(len(s.token) for s in steps) <= 3
+    assert all(len(t) <= 3 for _, tokens, _ in trainer.segmentation() for t in tokens)
+
+
+def test_replay_reproduces_training():
+    counts = random_counts(2)
+    trained = BPETrainer(counts)
+    steps = trained.train(30)
+    replayed = BPETrainer(counts)
+    replayed.replay(steps)
+    assert list(replayed.segmentation()) == list(trained.segmentation())
+    # merges over symbols this corpus lacks still enter the vocabulary
+    other = BPETrainer(Counter({'ab': 3}))
+    other.replay(steps)
+    assert other.vocab[:2] == ['a', 'b'] and len(other.vocab) == 2 + len(steps)
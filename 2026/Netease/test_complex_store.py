@@ -0,0 +1,83 @@
+"""
+Tests of the memory-mapped complex store: append / compact round trip,
+zero-copy loads and appends from several handles and processes
+Requires: numpy, pytest
+Usage: python -m pytest -q test_complex_store.py
+"""
+
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from complex_store import ComplexStore, open_complex
+from simplicial_complex import SimplicialComplex
+
+
+def labelled(labels, weights):
+    """Path complex over `labels` with the given edge weights"""
+    edges = [[i, i + 1] for i in range(len(labels) - 1)]
+    return SimplicialComplex.from_simplices(edges, weights=weights, labels=labels, close=True)
+
+
+def _append(path, i):
+    ComplexStore.open(path, create=False).append(labelled([f'p{i}', 'hub'], [1.0]))
+
+
+def test_store_append_compact(tmp_path):
+    path = str(tmp_path / 'complex.store')
+    store = ComplexStore.create(path, labelled(['a', 'b', 'c'], [2, 3]))
+    store.append(labelled(['b', 'c', 'd'], [5, 7]))
+    assert len(store.segments) == 2
+    before = (list(store.vocabulary()), store.complex().simplices(1).tolist(),
+              store.complex().weights(1).tolist())
+    assert before == (['a', 'b', 'c', 'd'], [[0, 1], [1, 2], [2, 3]], [2.0, 8.0, 7.0])
+
+    store.compact()
+    assert len(store.segments) == 1
+    reopened = ComplexStore.open(path, create=False)
+    K = reopened.complex()
+    assert (list(reopened.vocabulary()), K.simplices(1).tolist(), K.weights(1).tolist()) == before
+    assert np.array_equal(K.simplices(0).ravel(), np.arange(4))
+
+
+def test_single_segment_loads_as_memmap(tmp_path):
+    path = str(tmp_path / 'complex.store')
+    ComplexStore.create(path, labelled(['a', 'b', 'c'], [2, 3]))
+    K = open_complex(path)
+    # views of the file pages, not copies
+    assert isinstance(K.simplices(1).base, np.memmap) and isinstance(K.weights(1).base, np.memmap)
+    assert pickle.loads(pickle.dumps(ComplexStore(path))).complex().weights(1).tolist() == [2.0, 3.0]
+
+
+def test_labelled_and_unlabelled_do_not_mix(tmp_path):
+    path = str(tmp_path / 'complex.store')
+    store = ComplexStore.create(path, labelled(['a', 'b'], [1]))
+    with pytest.raises(ValueError):
+        store.append(SimplicialComplex.from_simplices([[0, 1]], close=True))
+
+
+def test_stale_handle_appends_after_the_other(tmp_path):
+    path = str(tmp_path / 'complex.store')
+    ComplexStore.create(path)
+    first, second = ComplexStore(path), ComplexStore(path)
+    first.append(labelled(['a', 'b'], [1]))
+    second.append(labelled(['b', 'c'], [4]))
+    store = ComplexStore(path)
+    assert len(store.segments) == 2 and list(store.vocabulary()) == ['a', 'b', 'c']
+    assert store.complex().weights(1).tolist() == [1.0, 4.0]
+
+
+def test_concurrent_process_appends(tmp_path):
+    path = str(tmp_path / 'complex.store')
+    ComplexStore.create(path)
+    n = 8
+    with multiprocessing.get_context('spawn').Pool(4) as pool:
+        pool.starmap(_append, [(path, i) for i in range(n)])
+    store = ComplexStore(path)
+    assert len(store.segments) == n
+    vocabulary = list(store.vocabulary())
+    assert sorted(vocabulary) == sorted([f'p{i}' for i in range(n)] + ['hub'])
+    K = store.complex()
+    assert K.count(1) == n and K.weights(1).sum() == n
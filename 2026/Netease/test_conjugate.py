@@ -0,0 +1,96 @@
+"""
+Tests of the sparse conjugate complex K*: the CSR helpers and A A^T against
+dense products, and the simplices of K* against their definition
+Requires: numpy, pytest
+Usage: python -m pytest -q test_conjugate.py
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+from conjugate import _combinations, conjugate_complex, csr_from_rows, csr_transpose, gram_offdiag
+
+
+def random_tokens(seed, n_tokens=60, n_atoms=25, max_len=5):
+    rng = np.random.default_rng(seed)
+    return [sorted(rng.choice(n_atoms, size=rng.integers(1, max_len + 1), replace=False).tolist())
+            for _ in range(n_tokens)], n_atoms
+
+
+def dense(tokens, n_atoms):
+    A = np.zeros((len(tokens), n_atoms), dtype=np.int64)
+    for i, atoms in enumerate(tokens):
+        A[i, atoms] = 1
+    return A
+
+
+def dense_offdiag(A):
+    """(pairs, counts) of the nonzero upper off-diagonal of A A^T"""
+    G = np.triu(A @ A.T, k=1)
+    pairs = np.argwhere(G)
+    return pairs, G[pairs[:, 0], pairs[:, 1]]
+
+# ==================== Sparse Helpers ====================
+
+def test_csr_transpose_matches_dense():
+    tokens, n_atoms = random_tokens(0)
+    indptr, indices = csr_from_rows(tokens)
+    t_indptr, t_indices = csr_transpose(indptr, indices, n_atoms + 3)
+    AT = dense(tokens, n_atoms + 3).T
+    assert len(t_indptr) == n_atoms + 4
+    for atom in range(n_atoms + 3):
+        assert t_indices[t_indptr[atom]:t_indptr[atom + 1]].tolist() == np.flatnonzero(AT[atom]).tolist()
+
+
+def test_gram_offdiag_matches_dense_product():
+    for seed in range(5):
+        tokens, n_atoms = random_tokens(seed)
+        A = dense(tokens, n_atoms)
+        csr = csr_from_rows(tokens)
+        csc = csr_transpose(*csr, n_atoms)
+        expected = dense_offdiag(A)
+        for batch in (1 << 23, 7, 1):  # one block, several blocks, one row per block
+            pairs, counts = gram_offdiag(*csr, *csc, batch=batch)
+            assert pairs.tolist() == expected[0].tolist() and counts.tolist() == expected[1].tolist()
+
+
+def test_gram_offdiag_skips_hub_atoms():
+    tokens, n_atoms = random_tokens(1)
+    A = dense(tokens, n_atoms)
+    max_degree = int(np.median(A.sum(0)))
+    hubs = A.sum(0) > max_degree
+    assert hubs.any()
+    csr = csr_from_rows(tokens)
+    pairs, counts = gram_offdiag(*csr, *csr_transpose(*csr, n_atoms), max_degree, batch=5)
+    expected = dense_offdiag(A[:, ~hubs])
+    assert pairs.tolist() == expected[0].tolist() and counts.tolist() == expected[1].tolist()
+
+
+def test_combinations_match_itertools():
+    for n in range(1, 8):
+        for k in range(1, n + 1):
+            assert _combinations(n, k).tolist() == [list(c) for c in combinations(range(n), k)]
+
+# ==================== Conjugate Complex ====================
+
+def test_stars_and_labels():
+    K = conjugate_complex([[0, 1], [1, 2], [1]], atom_labels=['A', 'B', 'C'])
+    assert K.star(1).tolist() == [0, 1, 2] and K.star(0).tolist() == [0]
+    assert K.token_labels == ['{A,B}', '{B,C}', '{B}']
+    assert K.edges.tolist() == [[0, 1], [0, 2], [1, 2]] and K.shared.tolist() == [1, 1, 1]
+    assert K.base_complex().simplices(1).tolist() == [[0, 1], [1, 2]]
+
+
+def test_higher_simplices_are_subsets_of_stars():
+    tokens, n_atoms = random_tokens(2, n_tokens=30, n_atoms=12)
+    for max_degree in (None, 8):
+        C = conjugate_complex(tokens, n_atoms, max_degree=max_degree)
+        assert C.skipped_hubs == (0 if max_degree is None else 6)
+        stars = [C.star(a).tolist() for a in range(n_atoms)]
+        stars = [s for s in stars if max_degree is None or len(s) <= max_degree]
+        expected = {t for s in stars for t in combinations(s, 3)}
+        S = C.to_simplicial_complex(max_dim=2)
+        assert {tuple(t) for t in S.simplices(2).tolist()} == expected
+        # edges keep their shared-atom counts; the closure adds none of its own
+        assert S.count(1) == len(C.edges) and S.weights(1).tolist() == C.shared.astype(float).tolist()
@@ -0,0 +1,105 @@
+"""
+Tests of the single-pass export stage: target parsing and paths, PNG pixels
+against savefig, reproducible vector output and the CLI's export files
+Requires: matplotlib, numpy, pytest
+Usage: python -m pytest -q test_export.py
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image as mimage
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import export
+import generate_figures
+from export import ExportTarget, export_figure, parse_target, parse_targets, target_paths
+
+
+def sample_figure():
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.plot([0, 1, 2], [0, 1, 0], 'b-o')
+    ax.set_title('Export')
+    ax.text(2.4, 0.5, 'outside', clip_on=False)  # widens the tight box past the axes
+    return fig
+
+# ==================== Targets ====================
+
+def test_parse_target():
+    assert parse_target('PNG:150:9') == ExportTarget('png', 150.0, 9)
+    assert parse_target('svg') == ExportTarget('svg', None, None)
+    assert parse_target('png::1') == ExportTarget('png', None, 1)
+    for bad in ('jpg', 'svg:300:9', 'png:300:10', 'png:1:2:3'):
+        with pytest.raises(ValueError):
+            parse_target(bad)
+
+
+def test_parse_targets_always_include_png():
+    assert parse_targets(None) == export.DEFAULT_TARGETS
+    assert parse_targets(['svg', 'pdf', 'svg']) == export.DEFAULT_TARGETS + (ExportTarget('svg', None, None),
+                                                                            ExportTarget('pdf', None, None))
+    assert parse_targets(['png:96']) == (ExportTarget('png', 96.0, None),)
+
+
+def test_target_paths():
+    targets = parse_targets(['png:300:9', 'svg', 'png:96:1', 'pdf'])
+    assert target_paths('images/a.png', targets) == ['images/a.png', 'images/a.svg',
+                                                     'images/a@96-z1.png', 'images/a.pdf']
+
+# ==================== Export ====================
+
+def test_png_matches_savefig(tmp_path):
+    fig = sample_figure()
+    expected = str(tmp_path / 'savefig.png')
+    fig.savefig(expected, dpi=100, bbox_inches='tight', facecolor='white')
+    (result,) = export_figure(str(tmp_path / 'a.png'), fig, (ExportTarget('png', 100, None),))
+    plt.close(fig)
+    assert result['bytes'] == (tmp_path / 'a.png').stat().st_size
+    assert np.array_equal(mimage.imread(result['path']), mimage.imread(expected))
+
+
+def test_one_raster_per_dpi_and_compression_levels(tmp_path):
+    fig = sample_figure()
+    targets = parse_targets(['png:100:1', 'png:100:9', 'png:50'])
+    results = export_figure(str(tmp_path / 'a.png'), fig, targets)
+    plt.close(fig)
+    fast, small, half = (mimage.imread(r['path']) for r in results)
+    assert np.array_equal(fast, small) and results[1]['bytes'] <= results[0]['bytes']
+    assert half.shape[0] == fast.shape[0] // 2
+    # the 100 dpi raster is rendered once and charged to its first target
+    assert results[0]['render'] > 0 and results[1]['render'] == 0 and results[2]['render'] > 0
+
+
+def test_vector_output_is_reproducible(tmp_path):
+    paths = []
+    for run in ('a', 'b'):
+        fig = sample_figure()
+        export_figure(str(tmp_path / f'{run}.png'), fig, parse_targets(['svg', 'pdf']))
+        plt.close(fig)
+        paths.append((tmp_path / f'{run}.svg', tmp_path / f'{run}.pdf'))
+    (svg_a, pdf_a), (svg_b, pdf_b) = paths
+    assert svg_a.read_bytes() == svg_b.read_bytes() and b'<svg' in svg_a.read_bytes()
+    assert pdf_a.read_bytes() == pdf_b.read_bytes() and pdf_a.read_bytes().startswith(b'%PDF')
+    assert export.take_results() and not export.take_results()
+
+# ==================== CLI ====================
+
+def test_cli_requires_every_export_file(tmp_path, capsys):
+    out = tmp_path / 'images'
+    argv = ['--only', 'figure5', '--out', str(out), '--export', 'svg']
+    try:
+        assert generate_figures.main(argv) == 0
+        svg = out / 'figure5_weighted_directed_complex.svg'
+        assert svg.stat().st_size > 0 and 'svg' in capsys.readouterr().out
+        assert generate_figures.main(argv) == 0
+        assert 'Cache: 1 hit(s), 0 miss(es)' in capsys.readouterr().out
+        svg.unlink()
+        assert generate_figures.main(argv) == 0
+        assert 'Cache: 0 hit(s), 1 miss(es)' in capsys.readouterr().out and svg.exists()
+        # a PNG-only build of the same directory is keyed apart from the SVG build
+        assert generate_figures.main(argv[:4]) == 0
+        assert 'Cache: 0 hit(s), 1 miss(es)' in capsys.readouterr().out
+    finally:
+        export.configure()
+        generate_figures.set_output_dir()
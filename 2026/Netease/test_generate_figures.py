@@ -0,0 +1,106 @@
+"""
+Tests of the figure CLI: selection, listing, the parallel build, output
+directories and cache keys
+Requires: matplotlib, numpy, pytest
+Usage: python -m pytest -q test_generate_figures.py
+"""
+
+import inspect
+import subprocess
+import sys
+
+import pytest
+
+import generate_figures
+import render_cache
+
+
+@pytest.fixture(autouse=True)
+def default_output_dir():
+    yield
+    generate_figures.set_output_dir()
+
+# ==================== Selection ====================
+
+def test_select():
+    assert generate_figures.select() == list(generate_figures.REGISTERED)
+    assert generate_figures.select('figure5, figure3') == ['figure3', 'figure5']
+    for only in ('figure9', ',', ''):
+        with pytest.raises(ValueError):
+            generate_figures.select(only)
+
+
+def test_empty_selection_exits_2(capsys):
+    assert generate_figures.main(['--only', ',']) == 2
+    assert 'no figures selected' in capsys.readouterr().out
+
+
+def test_list_does_not_import_matplotlib():
+    code = ("import sys, generate_figures; generate_figures.main(['--list']); "
+            "print('matplotlib' in sys.modules)")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                         cwd=generate_figures.HERE, check=True).stdout.splitlines()
+    assert len(out) == len(generate_figures.REGISTRY) + 1 and out[-1] == 'False'
+
+def test_parse_args_defaults():
+    args = generate_figures.parse_args([])
+    assert (args.jobs, args.out, args.only, args.force) == (1, generate_figures.OUT_DIR, None, False)
+    assert generate_figures.parse_args(['-j', '3']).jobs == 3
+
+# ==================== Parallel Build ====================
+
+def test_parallel_build_matches_serial(tmp_path):
+    names = 'figure3,figure5'
+    assert generate_figures.main(['--only', names, '--out', str(tmp_path / 'serial')]) == 0
+    assert generate_figures.main(['--only', names, '--out', str(tmp_path / 'parallel'), '--jobs', '2']) == 0
+    serial = sorted(p.name for p in (tmp_path / 'serial').iterdir())
+    assert serial == sorted(p.name for p in (tmp_path / 'parallel').iterdir()) and len(serial) == 2
+    for name in serial:
+        assert (tmp_path / 'serial' / name).read_bytes() == (tmp_path / 'parallel' / name).read_bytes()
+
+
+def test_failed_figure_is_reported_and_not_cached(tmp_path, monkeypatch, capsys):
+    generate_figures.load_figures()
+    def broken(output):
+        raise RuntimeError('broken figure')
+    monkeypatch.setattr(generate_figures.figures, 'figure5_weighted_directed_complex', broken)
+    out = str(tmp_path / 'images')
+    assert generate_figures.main(['--only', 'figure3,figure5', '--out', out]) == 1
+    text = capsys.readouterr().out
+    assert 'figure5: FAILED' in text and 'RuntimeError: broken figure' in text and 'figure3: ok' in text
+    manifest = render_cache.RenderCache(str(tmp_path / generate_figures.CACHE_MANIFEST))
+    assert [e['name'] for e in manifest.entries.values()] == ['figure3']
+
+# ==================== Output Directories ====================
+
+def test_sibling_output_dirs_keep_their_cache_entries(tmp_path, capsys):
+    for out in ('a', 'b', 'a', 'b'):
+        assert generate_figures.main(['--only', 'figure5', '--out', str(tmp_path / out)]) == 0
+    out = capsys.readouterr().out
+    assert out.count('Cache: 0 hit(s), 1 miss(es)') == 2 and out.count('Cache: 1 hit(s), 0 miss(es)') == 2
+    manifest = render_cache.RenderCache(str(tmp_path / generate_figures.CACHE_MANIFEST))
+    assert sorted(e['name'] for e in manifest.entries.values()) == ['figure5', 'figure5']
+
+# ==================== Cache Keys ====================
+
+def test_keys_cover_indirect_modules():
+    import simplicial_complex
+    import splitting
+    inputs = {spec.name: spec.inputs for spec in generate_figures.load_figures()}
+    figure3 = [m for m in inputs['figure3'] if inspect.ismodule(m)]
+    # figure3 reaches simplicial_complex only through splitting
+    assert splitting in figure3 and simplicial_complex in figure3
+    assert not any(m is generate_figures.figures for specs in inputs.values() for m in specs)
+
+
+def test_editing_an_indirect_module_changes_the_key(monkeypatch):
+    import simplicial_complex
+    specs = generate_figures.FIGURE_SPECS
+    before = {name: generate_figures.spec_key(spec) for name, spec in specs.items()}
+    getsource = inspect.getsource
+    monkeypatch.setattr(render_cache.inspect, 'getsource',
+                        lambda obj: getsource(obj) + ('# edited' if obj is simplicial_complex else ''))
+    changed = sorted(name for name, spec in specs.items() if generate_figures.spec_key(spec) != before[name])
+    assert changed == sorted(name for name, spec in specs.items()
+                             if any(i is simplicial_complex for i in spec.inputs))
+    assert 'figure3' in changed and 'figure2' not in changed
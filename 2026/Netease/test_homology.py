@@ -0,0 +1,92 @@
+"""
+Tests of the sparse GF(2) homology: known Betti numbers, the dense reference
+on random complexes and representative cycles
+Requires: numpy, pytest
+Usage: python -m pytest -q test_homology.py
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from homology import Homology, betti_numbers, dense_betti, dense_rank_gf2
+from simplicial_complex import SimplicialComplex
+from test_simplicial_complex import sphere, torus
+
+
+def random_complex(seed, n_vertices=12, n_simplices=25, dims=(0, 3)):
+    """Closure of random simplices whose dimension is drawn from dims[0]..dims[1]"""
+    rng = np.random.default_rng(seed)
+    simplices = [rng.choice(n_vertices, size=rng.integers(dims[0] + 1, dims[1] + 2), replace=False)
+                 for _ in range(n_simplices)]
+    return SimplicialComplex.from_simplices(simplices, n_vertices=n_vertices, close=True)
+
+
+def boundary(K, dim, chain):
+    """GF(2) boundary of a chain of dim-simplex indices, as a set of face indices"""
+    out = set()
+    for face in K.faces(dim, chain).ravel().tolist():
+        out ^= {face}
+    return out
+
+# ==================== Known Results ====================
+
+def test_betti_sphere():
+    assert betti_numbers(sphere()) == [1, 0, 1]
+    assert dense_betti(sphere()) == [1, 0, 1]
+
+
+def test_betti_torus():
+    assert betti_numbers(torus()) == [1, 2, 1]
+    assert dense_betti(torus()) == [1, 2, 1]
+    assert Homology(torus(), max_dim=1).betti == [1, 2]
+
+
+def test_solid_simplex_and_disjoint_points():
+    assert betti_numbers(SimplicialComplex.from_simplices([range(5)], close=True)) == [1, 0, 0, 0, 0]
+    assert betti_numbers(SimplicialComplex({0: [[0], [1], [2]]})) == [3]
+
+
+def test_open_complex_is_rejected():
+    with pytest.raises(ValueError):
+        Homology(SimplicialComplex.from_simplices([[0, 1, 2]]))
+
+# ==================== Dense Reference ====================
+
+def test_dense_rank_gf2():
+    assert dense_rank_gf2(np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]])) == 2
+    assert dense_rank_gf2(np.eye(11, dtype=bool)) == 11
+
+
+def test_sparse_matches_dense_on_random_complexes():
+    for seed in range(20):
+        K = random_complex(seed)
+        assert betti_numbers(K) == dense_betti(K), seed
+        assert betti_numbers(K, max_dim=1) == dense_betti(K)[:2]
+    # triangles on few vertices enclose voids (b2 > 0) now and then
+    voids = 0
+    for seed in range(20):
+        K = random_complex(seed, n_vertices=7, n_simplices=12, dims=(2, 2))
+        assert betti_numbers(K) == dense_betti(K), seed
+        voids += betti_numbers(K)[2] > 0
+    assert voids
+
+# ==================== Cycles ====================
+
+def test_cycles_are_independent_boundaryless_chains():
+    h = Homology(torus(), cycles=True)
+    edge_cycles = h.cycles(1)
+    assert len(edge_cycles) == 2
+    assert all(boundary(h.K, 1, c) == set() for c in edge_cycles)
+    assert edge_cycles[0] != edge_cycles[1]
+    (surface,) = h.cycles(2)
+    assert surface == list(range(h.K.count(2))) and boundary(h.K, 2, surface) == set()
+    with pytest.raises(ValueError):
+        Homology(torus()).cycles(2)
+
+
+def test_hollow_triangles_give_one_cycle_each():
+    edges = list(combinations(range(3), 2)) + list(combinations(range(3, 6), 2))
+    h = Homology(SimplicialComplex.from_simplices(edges, close=True))
+    assert h.betti == [2, 2] and len(h.cycles(1)) == 2
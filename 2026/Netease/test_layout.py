@@ -0,0 +1,78 @@
+"""
+Tests of the force-directed layout: determinism, boxes, warm starts, hop
+distances and the grid repulsion against the exact one
+Requires: numpy, pytest
+Usage: python -m pytest -q test_layout.py
+"""
+
+import numpy as np
+
+from layout import bfs_distances, fit_to_box, repulsion_exact, repulsion_grid, spring_layout, warm_start
+from simplicial_complex import SimplicialComplex
+
+
+def grid_edges(n):
+    """Edges of an n x n grid graph, vertex i * n + j"""
+    v = np.arange(n * n).reshape(n, n)
+    return np.concatenate([np.stack([v[:, :-1].ravel(), v[:, 1:].ravel()], axis=1),
+                           np.stack([v[:-1].ravel(), v[1:].ravel()], axis=1)])
+
+
+def test_layout_is_deterministic_and_finite():
+    edges = grid_edges(6)
+    pos = spring_layout(edges=edges, n_vertices=36)
+    assert pos.shape == (36, 2) and np.isfinite(pos).all()
+    assert np.array_equal(pos, spring_layout(edges=edges, n_vertices=36))
+    assert not np.array_equal(pos, spring_layout(edges=edges, n_vertices=36, seed=1))
+    assert spring_layout(edges=np.empty((0, 2)), n_vertices=0).shape == (0, 2)
+
+
+def test_grid_graph_unfolds():
+    edges = grid_edges(8)
+    pos = spring_layout(edges=edges, n_vertices=64)
+    lengths = np.linalg.norm(pos[edges[:, 0]] - pos[edges[:, 1]], axis=1)
+    pairs = np.linalg.norm(pos[:, None] - pos[None], axis=2)[np.triu_indices(64, 1)]
+    # neighbours sit close and evenly spaced; the grid is not collapsed or folded
+    assert lengths.mean() < 0.3 * pairs.mean() and lengths.std() < 0.3 * lengths.mean()
+    assert pairs.min() > 0.3 * lengths.mean()
+
+
+def test_complex_weights_and_box():
+    K = SimplicialComplex.from_simplices([[0, 1], [1, 2], [2, 3]], weights=[1.0, 1.0, 50.0], close=True)
+    pos = spring_layout(K, box=(0, 0, 4, 2))
+    assert (pos >= 0).all() and (pos[:, 0] <= 4).all() and (pos[:, 1] <= 2).all()
+    assert np.allclose(fit_to_box(pos, (0, 0, 4, 2)), pos)
+    # the heavy edge pulls harder
+    assert np.linalg.norm(pos[2] - pos[3]) < np.linalg.norm(pos[0] - pos[1])
+
+
+def test_warm_start_keeps_old_positions():
+    edges = grid_edges(5)
+    old = spring_layout(edges=edges[(edges < 24).all(axis=1)], n_vertices=24)
+    filled = warm_start(old, edges, 25, np.random.default_rng(0), 0.5)
+    assert np.allclose(filled[:24], old, atol=0.01)
+    neighbours = edges[(edges == 24).any(axis=1)].ravel()
+    assert np.allclose(filled[24], old[neighbours[neighbours != 24]].mean(axis=0), atol=0.01)
+    warm = spring_layout(edges=edges, n_vertices=25, init=old)
+    assert warm.shape == (25, 2) and np.isfinite(warm).all()
+    cold = spring_layout(edges=edges, n_vertices=25)
+    scale = lambda p: (p - p.mean(axis=0)) / np.max(np.ptp(p, axis=0))
+    assert np.abs(scale(warm)[:24] - scale(old)).max() < np.abs(scale(cold)[:24] - scale(old)).max()
+
+
+def test_bfs_distances():
+    edges = np.array([[0, 1], [1, 2], [2, 3], [0, 3], [4, 5]])
+    both = np.concatenate([edges, edges[:, ::-1]])
+    both = both[np.argsort(both[:, 0], kind='stable')]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(both[:, 0], minlength=7))])
+    assert bfs_distances(indptr, both[:, 1], 0).tolist() == [0, 1, 2, 1, -1, -1, -1]
+
+
+def test_grid_repulsion_approximates_exact():
+    pos = np.random.default_rng(0).uniform(0, 1, (3000, 2))
+    k = 1 / np.sqrt(len(pos))
+    exact, approx = repulsion_exact(pos, k), repulsion_grid(pos, k)
+    error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(error) < 0.1
+    cos = np.einsum('ij,ij->i', exact, approx) / np.linalg.norm(exact, axis=1) / np.linalg.norm(approx, axis=1)
+    assert np.mean(cos > 0.9) > 0.9
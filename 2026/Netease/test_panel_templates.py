@@ -0,0 +1,91 @@
+"""
+Tests of the panel templates: shared collections, the LRU cache and node tiles
+Requires: matplotlib, numpy, pytest
+Usage: python -m pytest -q test_panel_templates.py
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+import complex_draw
+from panel_templates import TEMPLATES, NodeTiles, PanelTemplate, TemplateCache, draw_node_motif
+
+POSITIONS = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, 0.9], [1.5, 0.9]])
+CALLS = [('faces', 'draw_simplices', ([[0, 1, 2], [1, 2, 3]],), dict(facecolor='lightblue', alpha=0.3)),
+         ('edges', 'draw_edges', ([[0, 1], [1, 2], [0, 2], [1, 3], [2, 3]],), dict(color='b')),
+         ('atoms', 'draw_vertices', (), dict(radius=0.08, color='blue', zorder=3))]
+AXES = {'xlim': (-0.5, 2.5), 'ylim': (-0.5, 1.5), 'aspect': 'equal'}
+
+
+def rendered(draw):
+    """RGBA pixels of a small figure drawn by `draw(ax)`"""
+    fig, ax = plt.subplots(figsize=(3, 2), dpi=50)
+    draw(ax)
+    fig.canvas.draw()
+    pixels = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return pixels
+
+
+def direct(offset):
+    def draw(ax):
+        for _, kind, args, kwargs in CALLS:
+            getattr(complex_draw, kind)(ax, POSITIONS + offset, *args, **kwargs)
+        ax.set_xlim(*(np.asarray(AXES['xlim']) + offset[0]))
+        ax.set_ylim(*(np.asarray(AXES['ylim']) + offset[1]))
+        ax.set_aspect('equal')
+        ax.axis('off')
+    return draw
+
+
+def test_shared_collections_render_like_direct_calls():
+    template = PanelTemplate('test', POSITIONS, CALLS, AXES)
+    first = rendered(template.draw)
+    assert set(template.built) == {'faces', 'edges'}
+    paths = template.built['faces'].get_paths()
+    second = rendered(template.draw)
+    assert template.built['faces'].get_paths() is paths
+    assert np.array_equal(first, second)
+    assert np.array_equal(second, rendered(direct(np.zeros(2))))
+
+
+def test_offset_moves_shared_collections():
+    template = PanelTemplate('test', POSITIONS, CALLS, AXES)
+    rendered(template.draw)
+    offset = np.array([3.0, -1.0])
+    shifted = rendered(lambda ax: template.draw(ax, offset))
+    assert np.abs(shifted.astype(int) - rendered(direct(offset))).max() <= 1
+
+
+def test_overrides_rebuild_the_call():
+    template = PanelTemplate('test', POSITIONS, CALLS, AXES)
+    rendered(template.draw)
+    red = rendered(lambda ax: template.draw(ax, overrides={'edges': {'color': 'r'}}))
+    assert (red[..., 0] > 200).any() and not np.array_equal(red, rendered(template.draw))
+
+
+def test_template_cache_is_lru():
+    cache = TemplateCache(maxsize=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 0)
+    cache.get('c', lambda: 3)
+    assert list(cache.entries) == ['a', 'c']
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+
+
+def test_node_tiles_only_for_repeated_labels():
+    fig, ax = plt.subplots()
+    coords = np.random.default_rng(0).random((300, 2))
+    shared = draw_node_motif(ax, coords, ['ab'[i % 2] for i in range(300)])
+    assert len(shared) == 1 and isinstance(shared[0], NodeTiles)
+    distinct = draw_node_motif(ax, coords, [str(i) for i in range(300)])
+    assert len(distinct) == 600
+    few = draw_node_motif(ax, coords[:100], ['a'] * 100)
+    assert len(few) == 200
+    entries = len(TEMPLATES.entries)
+    fig.canvas.draw()
+    assert len(shared[0].tiles.entries) == 2 and len(TEMPLATES.entries) == entries
+    plt.close(fig)
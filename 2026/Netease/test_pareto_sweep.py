@@ -0,0 +1,84 @@
+"""
+Tests of the BPE parameter sweep: the skyline front against brute force,
+saturated settings, grouped training runs and the resumable cache
+Requires: numpy, pytest
+Usage: python -m pytest -q test_pareto_sweep.py
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+import pareto_sweep
+from bpe_engine import BPETrainer
+from pareto_sweep import SweepPoint, distinct, pareto_front, read_cache, sweep
+
+CORPUS = (None, 0.02, 0.2, 0)  # tiny synthetic corpus: (path, size_mb, heldout, seed)
+
+
+def brute_front(values, senses):
+    """Distinct non-dominated rows by checking every pair"""
+    signed = np.array([[v if s == 'min' else -v for v, s in zip(row, senses)] for row in values])
+    front = set()
+    for i, a in enumerate(signed):
+        if not any((b <= a).all() and (b < a).any() for b in signed):
+            front.add(tuple(values[i]))
+    return front
+
+# ==================== Pareto Front ====================
+
+def test_pareto_front_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for trial in range(50):
+        values = rng.integers(0, 8, size=(rng.integers(1, 40), 2)).astype(float)  # many ties
+        for senses in (('min', 'max'), ('min', 'min'), ('max', 'max'), ('max', 'min')):
+            front = pareto_front(values, senses)
+            rows = [tuple(values[i]) for i in front]
+            assert len(rows) == len(set(rows))
+            assert set(rows) == brute_front(values, senses)
+            # the front is ordered along the first objective
+            x = values[front, 0] if senses[0] == 'min' else -values[front, 0]
+            assert (np.diff(x) > 0).all()
+
+
+def test_pareto_front_needs_two_objectives():
+    with pytest.raises(ValueError):
+        pareto_front([[1.0, 2.0]], ('min', 'max', 'min'))
+
+
+def test_distinct_keeps_the_first_saturated_setting():
+    results = {SweepPoint(m, 1, 2): {'merges_done': min(m, 300), 'vocab_size': min(m, 300) + 26}
+               for m in (100, 300, 500, 1000)}
+    results[SweepPoint(500, 2, 2)] = {'merges_done': 500, 'vocab_size': 526}
+    assert sorted(distinct(results)) == [SweepPoint(100, 1, 2), SweepPoint(300, 1, 2), SweepPoint(500, 2, 2)]
+
+# ==================== Sweep ====================
+
+def test_group_run_matches_separate_training(monkeypatch):
+    corpus = pareto_sweep.load_corpus(*CORPUS)
+    monkeypatch.setattr(pareto_sweep, '_corpus', corpus)
+    group = dict(pareto_sweep.run_group(2, 3, [40, 10]))
+    for merges in (10, 40):
+        trainer, held = BPETrainer(corpus[0]), BPETrainer(corpus[1])
+        held.replay(trainer.train(merges, 3, max_len=3))
+        metrics = group[SweepPoint(merges, 2, 3)]
+        assert (metrics['merges_done'], metrics['vocab_size']) == (len(trainer.merges), len(trainer.vocab))
+        assert metrics['heldout_ratio'] == held.compression_ratio
+
+
+def test_sweep_resumes_from_cache(tmp_path, capsys):
+    cache = str(tmp_path / 'sweep_cache.jsonl')
+    points = pareto_sweep.grid([10, 20], [1, 3], [2])
+    first = sweep(points, CORPUS, jobs=2, cache=cache)
+    assert set(first) == set(points) and '2 training run(s) to go' in capsys.readouterr().out
+    with open(cache, 'a') as f:
+        f.write('{"corpus": "torn')  # an interrupted write
+    more = points + pareto_sweep.grid([30], [3], [2])
+    second = sweep(more, CORPUS, jobs=1, cache=cache)
+    assert '4 cached, 1 training run(s) to go' in capsys.readouterr().out
+    assert all(second[p] == first[p] for p in points)
+    assert len(read_cache(cache, pareto_sweep.corpus_key(*CORPUS))) == 5
+    assert read_cache(cache, 'another corpus') == {}
+    with open(cache) as f:
+        assert json.loads(f.readlines()[-1])['point'] == SweepPoint(30, 3, 2)._asdict()
@@ -0,0 +1,92 @@
+"""
+Tests of the content-addressed render cache: keys, hits, misses and eviction
+Requires: matplotlib, numpy, pytest
+Usage: python -m pytest -q test_render_cache.py
+"""
+
+import numpy as np
+
+import generate_figures
+from render_cache import RenderCache, figure_key
+
+RC = {'figure.dpi': 100, 'savefig.dpi': 300, 'font.family': ['sans-serif'], 'font.size': 10}
+
+
+def draw_a(output):
+    return output
+
+
+def draw_b(output):
+    return output.upper()
+
+
+def write(path, data=b'png'):
+    path.write_bytes(data)
+    return str(path)
+
+# ==================== Keys ====================
+
+def test_figure_key_depends_on_source_inputs_and_style():
+    key = figure_key(draw_a, (np.arange(3), 'x'), RC)
+    assert key == figure_key(draw_a, (np.arange(3), 'x'), dict(RC))
+    assert key != figure_key(draw_b, (np.arange(3), 'x'), RC)
+    assert key != figure_key(draw_a, (np.arange(4), 'x'), RC)
+    assert key != figure_key(draw_a, (np.arange(3.0), 'x'), RC)
+    assert key != figure_key(draw_a, (np.arange(3), 'x'), dict(RC, **{'font.size': 11}))
+
+# ==================== Manifest ====================
+
+def test_hit_after_record_and_save(tmp_path):
+    manifest = str(tmp_path / 'render_cache.json')
+    output = write(tmp_path / 'a.png')
+    cache = RenderCache(manifest)
+    assert not cache.lookup('a', 'k1', output)
+    cache.record('a', 'k1', output, 1.5)
+    cache.save()
+    cache = RenderCache(manifest)
+    assert cache.lookup('a', 'k1', output)
+    assert not cache.lookup('a', 'k2', output)
+    assert (cache.hits, cache.misses, cache.time_saved) == (['a'], ['a'], 1.5)
+    assert cache.summary() == "Cache: 1 hit(s), 1 miss(es), ~1.50s saved"
+
+
+def test_miss_when_output_changed_or_companion_missing(tmp_path):
+    output = write(tmp_path / 'a.png')
+    cache = RenderCache(str(tmp_path / 'render_cache.json'))
+    cache.record('a', 'k', output, 1.0)
+    assert not cache.lookup('a', 'k', output, [str(tmp_path / 'a.svg')])
+    write(tmp_path / 'a.svg', b'svg')
+    assert cache.lookup('a', 'k', output, [str(tmp_path / 'a.svg')])
+    write(tmp_path / 'a.png', b'edited')
+    assert not cache.lookup('a', 'k', output)
+
+
+def test_corrupt_manifest_is_empty(tmp_path):
+    manifest = tmp_path / 'render_cache.json'
+    manifest.write_text('{not json')
+    assert RenderCache(str(manifest)).entries == {}
+
+
+def test_evict(tmp_path):
+    cache = RenderCache(str(tmp_path / 'render_cache.json'))
+    kept = write(tmp_path / 'a.png')
+    vanished = write(tmp_path / 'b.png')
+    unregistered = write(tmp_path / 'c.png')
+    for name, output in (('a', kept), ('b', vanished), ('c', unregistered)):
+        cache.record(name, 'k', output, 1.0)
+    (tmp_path / 'b.png').unlink()
+    assert sorted(cache.evict({'a': kept, 'b': vanished})) == [vanished, unregistered]
+    assert list(cache.entries) == [kept]
+
+
+def test_forced_renders_count_as_misses(tmp_path, capsys):
+    out = str(tmp_path / 'images')
+    try:
+        assert generate_figures.main(['--only', 'figure5', '--out', out]) == 0
+        assert 'Cache: 0 hit(s), 1 miss(es)' in capsys.readouterr().out
+        assert generate_figures.main(['--only', 'figure5', '--out', out]) == 0
+        assert 'Cache: 1 hit(s), 0 miss(es)' in capsys.readouterr().out
+        assert generate_figures.main(['--only', 'figure5', '--out', out, '--force']) == 0
+        assert 'Cache: 0 hit(s), 1 miss(es)' in capsys.readouterr().out
+    finally:
+        generate_figures.set_output_dir()
@@ -0,0 +1,59 @@
+"""
+Tests of the warm render server: every worker warm, renders through the cache
+Requires: matplotlib, numpy, pytest (Unix domain sockets)
+Usage: python -m pytest -q test_render_server.py
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import render_server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix domain sockets')
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A server with two workers rendering into tmp_path; yields its socket path"""
+    path = str(tmp_path / 'render.sock')
+    proc = subprocess.Popen([sys.executable, render_server.__file__, '--socket', path, 'serve',
+                             '--jobs', '2', '--root', str(tmp_path)],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.time() + 120
+    while not os.path.exists(path):
+        assert proc.poll() is None and time.time() < deadline, proc.stdout.read()
+        time.sleep(0.1)
+    yield path
+    render_server.request({'op': 'stop'}, path)
+    proc.wait(60)
+    assert not os.path.exists(path)
+
+
+def test_every_worker_is_warm(server):
+    status = render_server.request({'op': 'ping'}, server)
+    assert (status['jobs'], status['workers']) == (2, 2)
+
+
+def test_render_uses_cache_out_and_export(server, tmp_path):
+    first = render_server.render(['figure5'], server)
+    assert first['ok'] and not first['results'][0]['cached']
+    assert first['results'][0]['path'] == str(tmp_path / 'images' / 'figure5_weighted_directed_complex.png')
+    second = render_server.render(['figure5'], server)
+    assert second['results'][0]['cached'] and second['cache'].startswith('Cache: 1 hit(s), 0 miss(es)')
+    forced = render_server.render(['figure5'], server, force=True)
+    assert not forced['results'][0]['cached']
+
+    other = render_server.render(['figure5'], server, out_dir='build', export=['svg'])
+    assert other['ok'] and not other['results'][0]['cached']
+    assert (tmp_path / 'build' / 'figure5_weighted_directed_complex.svg').exists()
+    assert render_server.render(['figure5'], server, out_dir='build', export=['svg'])['results'][0]['cached']
+
+
+def test_unknown_figure_and_bad_target(server):
+    assert render_server.render(['figure9'], server) == {'ok': False, 'error': 'unknown figure(s): figure9'}
+    assert not render_server.render(['figure5'], server, export=['gif'])['ok']
@@ -0,0 +1,85 @@
+"""
+Tests of the array-backed simplicial complex: canonical storage, closure,
+membership, faces and cofaces
+Requires: numpy, pytest
+Usage: python -m pytest -q test_simplicial_complex.py
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from simplicial_complex import SimplicialComplex
+
+# ==================== Fixtures ====================
+
+def sphere():
+    """Boundary of the tetrahedron: a triangulated 2-sphere"""
+    return SimplicialComplex.from_simplices(list(combinations(range(4), 3)), close=True)
+
+
+def torus(n=3):
+    """n x n grid with opposite sides glued, two triangles per square"""
+    v = lambda i, j: (i % n) * n + j % n
+    triangles = []
+    for i in range(n):
+        for j in range(n):
+            triangles += [(v(i, j), v(i + 1, j), v(i + 1, j + 1)), (v(i, j), v(i, j + 1), v(i + 1, j + 1))]
+    return SimplicialComplex.from_simplices(triangles, close=True)
+
+# ==================== Storage ====================
+
+def test_closure_counts():
+    assert [sphere().count(d) for d in range(3)] == [4, 6, 4]
+    assert [torus().count(d) for d in range(3)] == [9, 27, 18]
+    assert sphere().is_closed()
+    assert not SimplicialComplex.from_simplices([[0, 1, 2]]).is_closed()
+
+
+def test_canonical_rows_merge_duplicates_and_keep_orientation():
+    K = SimplicialComplex.from_simplices([[2, 0], [0, 1], [0, 2]], weights=[1.0, 4.0, 2.0])
+    assert K.simplices(1).tolist() == [[0, 1], [0, 2]]
+    assert K.weights(1).tolist() == [4.0, 3.0]
+    assert K.orientations(1).tolist() == [1, -1]
+    assert K.oriented(1).tolist() == [[0, 1], [2, 0]]
+
+
+def test_closure_adds_unweighted_positive_faces():
+    K = SimplicialComplex.from_simplices([[0, 1], [2, 1, 0]], weights=[5.0, 1.0]).closure()
+    assert K.simplices(1).tolist() == [[0, 1], [0, 2], [1, 2]]
+    assert K.weights(1).tolist() == [5.0, 0.0, 0.0]
+    assert K.orientations(1).tolist() == [1, 1, 1]
+    assert K.orientations(2).tolist() == [-1]
+
+
+def test_vertex_out_of_range():
+    with pytest.raises(ValueError):
+        SimplicialComplex({1: [[0, 3]]}, n_vertices=3)
+
+# ==================== Membership / Faces ====================
+
+def test_index_of_and_contains():
+    K = torus()
+    rows = K.simplices(2)
+    assert np.array_equal(K.index_of(rows[:, ::-1]), np.arange(len(rows)))
+    assert (2, 1, 0) not in K and (0, 1) in K and (0, 99) not in K
+    assert K.index_of(np.empty((0, 2), dtype=int)).tolist() == []
+
+
+def test_faces_and_cofaces_agree():
+    K = torus()
+    faces = K.faces(2)
+    assert (faces >= 0).all()
+    for t in range(K.count(2)):
+        for j, e in enumerate(faces[t]):
+            assert K.simplices(1)[e].tolist() == np.delete(K.simplices(2)[t], j).tolist()
+            assert t in K.cofaces(1, e)
+    # every edge of a closed surface bounds exactly two triangles
+    indptr, _ = K.coface_csr(1)
+    assert np.diff(indptr).tolist() == [2] * K.count(1)
+
+
+def test_skeleton():
+    K = sphere().skeleton(1)
+    assert K.dims == [0, 1] and K.count(1) == 6 and K.n_vertices == 4
@@ -0,0 +1,51 @@
+"""
+Tests of the inverse splitting engine: figure3's trace and the minimal limit
+Requires: numpy, pytest
+Usage: python -m pytest -q test_splitting.py
+"""
+
+import numpy as np
+
+from splitting import InverseSplitting, faces_of, minimal, pullbacks, to_rows
+
+# figure3's clusters over atoms A, B, C with their support counts
+CLUSTERS = [[0, 1, 2], [0, 1], [1, 2], [0, 2], [0], [1], [2]]
+SUPPORT = [1, 3, 3, 1, 2, 1, 1]
+
+
+def figure3_engine():
+    engine = InverseSplitting(CLUSTERS, SUPPORT, atom_labels=['A', 'B', 'C'])
+    engine.run(2)
+    return engine
+
+
+def test_figure3_trace():
+    engine = figure3_engine()
+    assert engine.names(engine.roots) == ['{A,B,C}']
+    first = engine.trace[0]
+    assert engine.names(first.candidates) == ['{A,B}', '{A,C}', '{B,C}']
+    assert engine.names(first.kept) == ['{A,B}', '{B,C}']
+    assert engine.names(engine.survivors) == ['{A,B}', '{B,C}', '{A}']
+
+
+def test_figure3_limit_is_minimal():
+    engine = figure3_engine()
+    # {A} lies inside {A,B}, so only {B,C} and {A} are minimal
+    assert engine.names(engine.limit) == ['{B,C}', '{A}']
+    assert 'limit: 2 minimal of 3 surviving clusters' in engine.report()
+
+
+def test_faces_and_pullbacks():
+    rows = to_rows([[0, 1, 2], [1, 2, 3]], 4)
+    assert faces_of(rows, 4)[:, :2].tolist() == [[1, 2], [0, 2], [0, 1], [2, 3], [1, 3], [1, 2]]
+    assert pullbacks(rows, 4)[:, :2].tolist() == [[1, 2]]
+
+
+def test_minimal_matches_brute_force():
+    rng = np.random.default_rng(0)
+    clusters = {tuple(sorted(set(rng.integers(0, 12, rng.integers(1, 5)).tolist()))) for _ in range(300)}
+    clusters = sorted(clusters)
+    rows = to_rows([list(c) for c in clusters], 12)
+    expected = [c for c in clusters if not any(set(o) < set(c) for o in clusters)]
+    got = [tuple(r[r < 12].tolist()) for r in minimal(rows, 12)]
+    assert got == expected
@@ -0,0 +1,66 @@
+"""
+Tests of the AEP typical-set filter: no atypical simplex survives closure
+Requires: numpy, pytest
+Usage: python -m pytest -q test_typical_set.py
+"""
+
+import numpy as np
+
+from interaction_complex import InteractionComplexBuilder
+from typical_set import TypicalSetFilter, filter_complex
+
+EPSILON = 1.0
+
+
+def zipf_builder(typical=None, n_events=20_000, n_items=60, seed=0):
+    rng = np.random.default_rng(seed)
+    items = np.minimum(rng.zipf(1.3, n_events) - 1, n_items - 1)
+    builder = InteractionComplexBuilder(window=3, typical=typical)
+    builder.update(items, np.arange(n_events) // 8)
+    return builder
+
+
+def deviations(K, surprisal, entropy, ids):
+    """dim -> |sample entropy - H| of every simplex of K, vertices mapped to item ids"""
+    return {d: np.abs(surprisal[ids[K.simplices(d)]].mean(axis=1) - entropy) for d in K.dims if d > 0}
+
+
+def test_builder_keeps_no_atypical_face():
+    typical = TypicalSetFilter(EPSILON)
+    K = zipf_builder(typical).to_complex(normalize=False)
+    ids = np.array([int(label) for label in K.labels])
+    dev = deviations(K, typical.meter.surprisal(), typical.meter.entropy, ids)
+    assert all((d < EPSILON).all() for d in dev.values())
+    assert K.count(2) > 0
+    assert not (K.weights(1) == 0).any()
+    # The recorded shrink is the shrink of the returned complex
+    assert {d: kept for d, (_, kept, _, _) in typical.report.items()} == {1: K.count(1), 2: K.count(2)}
+
+
+def test_builder_drops_simplices_with_atypical_faces():
+    typical = TypicalSetFilter(EPSILON)
+    builder = zipf_builder(typical)
+    K = builder.to_complex(normalize=False)
+    builder.typical = None
+    K_all = builder.to_complex(normalize=False)
+    ids = np.array([int(label) for label in K_all.labels])
+    surprisal, entropy = typical.meter.surprisal(), typical.meter.entropy
+    triangles = K_all.simplices(2)
+    own = np.abs(surprisal[ids[triangles]].mean(axis=1) - entropy) < EPSILON
+    # Some triangles are typical on their own but have an atypical edge
+    assert own.sum() > K.count(2)
+
+
+def test_filter_complex_keeps_no_atypical_face():
+    K_all = zipf_builder().to_complex(normalize=False)
+    K = filter_complex(K_all, EPSILON)
+    w0 = K_all.weights(0)
+    p = w0 / w0.sum()
+    surprisal, entropy = -np.log2(p), float(-np.dot(p, np.log2(p)))
+    index = {label: i for i, label in enumerate(K_all.labels)}
+    ids = np.array([index[label] for label in K.labels])
+    dev = deviations(K, surprisal, entropy, ids)
+    assert all((d < EPSILON).all() for d in dev.values())
+    assert 0 < K.count(1) < K_all.count(1)
+    for d in (1, 2):
+        assert not (K.weights(d) == 0).any()
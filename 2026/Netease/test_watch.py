@@ -0,0 +1,98 @@
+"""
+Tests of watch mode: the note index, module reload order and which figures
+an edited note or script makes stale
+Requires: matplotlib, numpy, pytest
+Usage: python -m pytest -q test_watch.py
+"""
+
+import inspect
+import os
+import sys
+
+import pytest
+
+import generate_figures
+import render_cache
+import watch
+from watch import Watcher, build_index, local_modules, note_references, snapshot
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    """Watcher writing to a temporary images/ and reading only the notes under tmp_path"""
+    notes = []
+    monkeypatch.setattr(Watcher, 'notes', lambda self: sorted(notes))
+    w = Watcher(out_dir=str(tmp_path / 'images'))
+    w.note_files = notes
+    yield w
+    generate_figures.set_output_dir()
+
+
+def write_note(tmp_path, name, images):
+    path = tmp_path / name
+    path.write_text('\n'.join(f'![{i}](images/{i})' for i in images), encoding='utf-8')
+    return str(path)
+
+# ==================== Dependency Index ====================
+
+def test_note_references(tmp_path):
+    a = write_note(tmp_path, 'a.md', ['figure5_weighted_directed_complex.png'] * 2)
+    b = write_note(tmp_path, 'b.md', ['figure5_weighted_directed_complex.png', 'figure1_simplicial_complex.png',
+                                      'photo.png'])
+    refs = note_references([b, a])
+    rel = lambda p: os.path.relpath(p, watch.HERE)
+    assert refs == {'figure5_weighted_directed_complex.png': [rel(a), rel(b)],
+                    'figure1_simplicial_complex.png': [rel(b)]}
+    index = build_index(generate_figures.load_figures(), [a, b])
+    assert index['figure1'] == (generate_figures.FIGURE_SPECS['figure1'].output, [rel(b)])
+    assert index['figure2'][1] == []
+
+
+def test_local_modules_in_dependency_order():
+    import complex_store
+    import pareto_sweep
+    order = [m.__name__ for m in local_modules()]
+    assert 'watch' not in order and 'pytest' not in order
+    for dep, user in (('simplicial_complex', 'complex_store'), ('bpe_engine', 'pareto_sweep'),
+                      ('simplicial_complex', 'conjugate')):
+        assert order.index(dep) < order.index(user)
+    assert all(os.path.dirname(m.__file__) == watch.HERE for m in local_modules())
+
+
+def test_snapshot_skips_missing_files(tmp_path):
+    note = write_note(tmp_path, 'a.md', [])
+    assert list(snapshot([note, str(tmp_path / 'gone.md')])) == [note]
+
+# ==================== Rebuilds ====================
+
+def test_edited_note_renders_only_its_missing_figures(tmp_path, watcher, capsys):
+    note = write_note(tmp_path, 'note.md', ['figure5_weighted_directed_complex.png'])
+    watcher.note_files.append(note)
+    watcher.rebuild(set(), {note})
+    out = capsys.readouterr().out
+    assert '1 figure(s) rebuilt' in out and 'figure5 ->' in out
+    assert os.listdir(tmp_path / 'images') == ['figure5_weighted_directed_complex.png']
+    watcher.rebuild(set(), {note})
+    assert '0 figure(s) rebuilt' in capsys.readouterr().out
+    # the watcher's renders are shared with the CLI through the render cache
+    manifest = render_cache.RenderCache(str(tmp_path / generate_figures.CACHE_MANIFEST))
+    assert [e['name'] for e in manifest.entries.values()] == ['figure5']
+
+
+def test_edited_script_makes_its_figures_stale(watcher, monkeypatch):
+    import homology
+    names = list(generate_figures.REGISTERED)
+    assert sorted(watcher.stale(names)) == names  # nothing rendered yet
+    for name, key in watcher.stale(['figure1', 'figure2']).items():
+        spec = watcher.gf.FIGURE_SPECS[name]
+        os.makedirs(os.path.dirname(spec.output), exist_ok=True)
+        with open(spec.output, 'wb') as f:
+            f.write(b'png')
+        watcher.cache.record(name, key, spec.output, 1.0)
+    assert sorted(watcher.stale(names)) == ['figure3', 'figure4', 'figure5', 'figure6']
+    getsource = inspect.getsource
+    monkeypatch.setattr(render_cache.inspect, 'getsource',
+                        lambda obj: getsource(obj) + ('# edited' if obj is homology else ''))
+    # only figure1 reaches homology
+    assert sorted(watcher.stale(['figure1', 'figure2'])) == ['figure1']
+    assert sys.modules['generate_figures'] is watcher.gf
@@ -0,0 +1,228 @@
+"""
+Streaming AEP typical-set filter for interaction complexes
+The empirical per-symbol entropy H of the item stream is estimated online,
+one bincount per chunk. A candidate simplex (x_0, ..., x_n) is scored by its
+sample entropy  -1/(n+1) * sum log2 p(x_i)  under the i.i.d. item model and
+kept only inside the epsilon-typical set of the notes (26.1.22 ComplexCategory):
+    | -1/(n+1) log2 p(x_0, ..., x_n) - H | < epsilon    (bits)
+Scoring is one gather of per-item surprisals in fixed-size row blocks, and
+memory is bounded by the item vocabulary plus one block, independent of the
+number of simplices. The test is closed under faces: a simplex counts as
+typical only if all its faces (of dimension >= min_dim) are typical too, so
+closing the kept set never brings an atypical face back. Plugged into
+InteractionComplexBuilder (typical=...), atypical simplices are dropped
+before the complex is built, so layout, pullback and drawing never see them;
+filter_complex does the same for a complex that already exists (e.g. loaded
+from a complex store).
+Requires: numpy
+Usage: python interaction_complex.py LOG --typical 1.5
+Benchmark: python typical_set.py [--events 10000000] [--items 100000] [--epsilon 1.5]
+"""
+
+import time
+from collections import deque
+from itertools import combinations
+
+import numpy as np
+
+from simplicial_complex import SimplicialComplex
+
+# ==================== Online Entropy ====================
+
+class EntropyMeter:
+    """Empirical per-symbol entropy (bits) of an item stream, updated per chunk.
+
+    history keeps (events, entropy) after each of the last `history` chunks,
+    which shows the estimate converging as the stream grows (AEP).
+    """
+
+    def __init__(self, history=1024):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.total = 0
+        self.history = deque(maxlen=history)
+
+    def add(self, counts):
+        """Add a per-item count vector (e.g. one chunk's bincount)"""
+        counts = np.asarray(counts, dtype=np.int64)
+        self.total += int(counts.sum())
+        if len(counts) > len(self.counts):
+            counts = counts.copy()
+            counts[:len(self.counts)] += self.counts
+            self.counts = counts
+        else:
+            self.counts[:len(counts)] += counts
+        self.history.append((self.total, self.entropy))
+
+    def update(self, items):
+        """Add one chunk of item ids"""
+        self.add(np.bincount(np.asarray(items, dtype=np.int64)))
+
+    @property
+    def entropy(self):
+        """H = log2 N - sum(c log2 c) / N over the items seen so far"""
+        if self.total == 0:
+            return 0.0
+        c = self.counts[self.counts > 0].astype(float)
+        return float(np.log2(self.total) - np.dot(c, np.log2(c)) / self.total)
+
+    def surprisal(self):
+        """-log2 p per item id (inf for ids never seen)"""
+        with np.errstate(divide='ignore'):
+            return np.log2(self.total) - np.log2(self.counts.astype(float))
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes
+
+# ==================== Typical Set ====================
+
+class TypicalSetFilter:
+    """Epsilon-typical set test for simplices over the metered item distribution.
+
+    epsilon : half-width of the typical band around H, in bits per symbol
+    block   : rows scored per step (bounds the temporary memory)
+    min_dim : dimensions below this are never filtered (default: vertices are kept)
+    """
+
+    def __init__(self, epsilon=1.5, block=1 << 20, min_dim=1, meter=None):
+        self.epsilon = float(epsilon)
+        self.block = block
+        self.min_dim = min_dim
+        self.meter = meter or EntropyMeter()
+        self.report = {}  # dim -> [candidates, kept, candidate weight, kept weight]
+        self.elapsed = 0.0
+
+    def update(self, items):
+        self.meter.update(items)
+
+    def clear(self):
+        """Forget the recorded shrink, so each scoring pass is reported on its own"""
+        self.report.clear()
+        self.elapsed = 0.0
+
+    def deviation(self, rows, surprisal=None, entropy=None):
+        """Sample entropy minus H for each row of vertex ids (bits per symbol)"""
+        rows = np.asarray(rows)
+        surprisal = self.meter.surprisal() if surprisal is None else surprisal
+        entropy = self.meter.entropy if entropy is None else entropy
+        out = np.empty(len(rows))
+        for lo in range(0, len(rows), self.block):
+            out[lo:lo + self.block] = surprisal[rows[lo:lo + self.block]].mean(axis=1)
+        return out - entropy
+
+    def mask(self, rows, dim, weights=None, surprisal=None, entropy=None):
+        """Boolean mask of the rows of dimension `dim` that are typical together with
+        all their faces of dimension >= min_dim; the shrink is recorded"""
+        start = time.perf_counter()
+        rows = np.asarray(rows)
+        keep = np.ones(len(rows), dtype=bool)
+        if dim >= self.min_dim and len(rows):
+            surprisal = self.meter.surprisal() if surprisal is None else surprisal
+            entropy = self.meter.entropy if entropy is None else entropy
+            faces = [list(cols) for k in range(self.min_dim, dim + 1)
+                     for cols in combinations(range(dim + 1), k + 1)]
+            for lo in range(0, len(rows), self.block):
+                s = surprisal[rows[lo:lo + self.block]]
+                for cols in faces:
+                    keep[lo:lo + self.block] &= np.abs(s[:, cols].mean(axis=1) - entropy) < self.epsilon
+        w = np.ones(len(rows)) if weights is None else np.asarray(weights, dtype=float)
+        stats = self.report.setdefault(dim, [0, 0, 0.0, 0.0])
+        stats[0] += len(rows)
+        stats[1] += int(np.count_nonzero(keep))
+        stats[2] += float(w.sum())
+        stats[3] += float(w[keep].sum())
+        self.elapsed += time.perf_counter() - start
+        return keep
+
+    def summary(self):
+        """How much the typical set shrank each dimension (count and weight kept)"""
+        parts = []
+        for d, (n, kept, w, w_kept) in sorted(self.report.items()):
+            if d < self.min_dim:
+                continue
+            share = w_kept / w if w else 1.0
+            parts.append(f"{d}-simplices {kept}/{n} kept ({100 * kept / max(n, 1):.1f}%, "
+                         f"{100 * share:.1f}% of weight)")
+        return (f"typical set eps={self.epsilon:g} bits around H={self.meter.entropy:.3f} bits "
+                f"({self.meter.total} events): " + ('; '.join(parts) or 'nothing scored'))
+
+
+def filter_complex(K, epsilon=1.5, typical=None):
+    """Restrict K to its epsilon-typical simplices, renumbering to the vertices still used.
+
+    The item distribution is K's vertex weights (the item counts of
+    InteractionComplexBuilder.to_complex, normalized or not) unless a
+    metered `typical` filter is given. Kept simplices have only typical
+    faces, so closure() adds back at most typical faces that were not
+    stored, with weight 0, as in to_complex.
+    """
+    typical = typical or TypicalSetFilter(epsilon)
+    typical.clear()
+    w0 = K.weights(0)
+    if typical.meter.total:
+        surprisal, entropy = typical.meter.surprisal(), typical.meter.entropy
+    elif w0 is not None and w0.sum() > 0:
+        p = w0 / w0.sum()
+        with np.errstate(divide='ignore'):
+            surprisal = -np.log2(p)
+        entropy = float(-np.dot(p[p > 0], np.log2(p[p > 0])))
+    else:
+        raise ValueError("filter_complex needs vertex weights or a metered TypicalSetFilter")
+    simplices, weights, orientations = {}, {}, {}
+    for d in K.dims:
+        if d == 0:
+            continue
+        rows, w = K.simplices(d), K.weights(d)
+        keep = typical.mask(rows, d, w, surprisal, entropy)
+        simplices[d] = rows[keep]
+        orientations[d] = K.orientations(d)[keep]
+        if w is not None:
+            weights[d] = w[keep]
+    used = np.unique(np.concatenate([r.ravel() for r in simplices.values()] or [np.zeros(0, np.int64)]))
+    if not simplices:
+        used = np.arange(K.n_vertices)
+    remap = np.full(K.n_vertices, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    simplices = {d: remap[r] for d, r in simplices.items()}
+    simplices[0] = np.arange(len(used))[:, None]
+    if w0 is not None:
+        weights[0] = w0[used]
+    labels = [K.labels[i] for i in used] if K.labels is not None else None
+    # Remapping is monotone, so the rows stay sorted and the orientations stay valid
+    return SimplicialComplex._from_canonical(simplices, weights, orientations, len(used), labels).closure()
+
+# ==================== Benchmark ====================
+
+def benchmark(n_events=10_000_000, n_items=100_000, epsilon=1.5, chunk_events=1 << 20, seed=0):
+    """Meter a Zipf item stream, then score and filter the complex built from it"""
+    from interaction_complex import InteractionComplexBuilder
+    rng = np.random.default_rng(seed)
+    typical = TypicalSetFilter(epsilon)
+    builder = InteractionComplexBuilder(window=3, top_k=200_000, typical=typical)
+    start = time.perf_counter()
+    for lo in range(0, n_events, chunk_events):
+        n = min(chunk_events, n_events - lo)
+        items = np.minimum(rng.zipf(1.2, n) - 1, n_items - 1)
+        builder.update(items, (lo + np.arange(n)) // 20)
+    stream = time.perf_counter() - start
+    start = time.perf_counter()
+    K = builder.to_complex()
+    builder.typical = None
+    K_all = builder.to_complex()
+    history = list(typical.meter.history)
+    trace = ', '.join(f'{h:.3f}' for _, h in history[::max(1, len(history) // 6)])
+    print(f"stream: {n_events:,d} events in {stream:.1f}s; entropy per chunk: {trace} bits")
+    print(typical.summary())
+    print(f"scored in {typical.elapsed * 1e3:.1f} ms, meter {typical.meter.nbytes / 1e6:.1f} MB; "
+          f"{K_all} -> {K} ({time.perf_counter() - start:.2f}s for both builds)")
+    return K
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the streaming AEP typical-set filter.')
+    parser.add_argument('--events', type=int, default=10_000_000)
+    parser.add_argument('--items', type=int, default=100_000)
+    parser.add_argument('--epsilon', type=float, default=1.5)
+    args = parser.parse_args()
+    benchmark(args.events, args.items, args.epsilon)
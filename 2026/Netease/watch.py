@@ -0,0 +1,181 @@
+"""
+Watch mode for generate_figures.py
+Keeps a dependency index  figure function -> output image -> notes that embed
+it  and polls the figure scripts and the Markdown notes for changes. After a
+burst of edits settles (debounce), the changed modules are reloaded in place
+and only figures whose cache key changed -- or, for an edited note, the
+figures it embeds whose image is missing or stale -- are re-rendered, in this
+already-warm process.
+Requires: matplotlib, numpy
+Usage: python generate_figures.py --watch [--debounce 0.3]
+"""
+
+import glob
+import importlib
+import os
+import re
+import sys
+import time
+
+from render_cache import RenderCache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMAGE_REF = re.compile(r'images/(figure\d+_[\w-]+\.png)')
+
+# ==================== Dependency Index ====================
+
+def note_references(paths):
+    """image file name -> sorted list of notes that embed it"""
+    index = {}
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for image in set(IMAGE_REF.findall(f.read())):
+                index.setdefault(image, []).append(os.path.relpath(path, HERE))
+    return {image: sorted(notes) for image, notes in index.items()}
+
+
+def build_index(figures, notes):
+    """figure name -> (output image, notes embedding it)"""
+    refs = note_references(notes)
+    return {spec.name: (spec.output, refs.get(os.path.basename(spec.output), [])) for spec in figures}
+
+
+def local_modules():
+    """Loaded modules that live next to this script, in dependency order"""
+    mods = {name: m for name, m in sys.modules.items()
+            if os.path.dirname(os.path.abspath(getattr(m, '__file__', None) or '/')) == HERE
+            and getattr(m, '__spec__', None) is not None and m.__name__ == name != __name__}
+    deps = {}
+    for name, m in mods.items():
+        used = set()
+        for value in vars(m).values():
+            owner = value.__name__ if isinstance(value, type(sys)) else getattr(value, '__module__', None)
+            if owner in mods and owner != name:
+                used.add(owner)
+        deps[name] = used
+    order, done = [], set()
+
+    def visit(name, stack=()):
+        if name in done or name in stack:
+            return
+        for dep in sorted(deps[name]):
+            visit(dep, stack + (name,))
+        done.add(name)
+        order.append(mods[name])
+
+    for name in sorted(mods):
+        visit(name)
+    return order
+
+
+def snapshot(paths):
+    """path -> modification time for every existing path"""
+    out = {}
+    for path in paths:
+        try:
+            out[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return out
+
+# ==================== Watch Loop ====================
+
+class Watcher:
+    """Polls sources and notes; re-renders the affected figures after each settled burst"""
+
+    def __init__(self, debounce=0.3, interval=0.1, notes_glob='**/*.md', out_dir='images'):
+        self.debounce = debounce
+        self.interval = interval
+        self.notes_glob = notes_glob
+        self.out_dir = out_dir
+        self.gf = sys.modules.get('generate_figures') or importlib.import_module('generate_figures')
+        self.gf.set_output_dir(out_dir)
+        self.cache = RenderCache(self.gf.manifest_path())
+        self.refresh_index()
+
+    def notes(self):
+        return sorted(glob.glob(os.path.join(HERE, self.notes_glob), recursive=True))
+
+    def sources(self):
+        return sorted(m.__file__ for m in local_modules())
+
+    def refresh_index(self):
+        self.index = build_index(self.gf.FIGURES, self.notes())
+
+    def reload(self, changed):
+        """Reload the changed local modules and everything loaded after them"""
+        changed = {os.path.abspath(p) for p in changed}
+        dirty = False
+        for module in local_modules():
+            dirty = dirty or os.path.abspath(module.__file__) in changed
+            if dirty:
+                importlib.reload(module)
+        self.gf = sys.modules['generate_figures']
+        self.gf.set_output_dir(self.out_dir)  # a reload resets the module state
+
+    def stale(self, names):
+        """Figures among `names` whose cache key or output no longer matches"""
+        keys = {}
+        for name in names:
+            spec = self.gf.FIGURE_SPECS[name]
+            key = self.gf.spec_key(spec)
+            if not self.gf.is_cached(self.cache, spec, key):
+                keys[name] = key
+        return keys
+
+    def rebuild(self, changed_sources, changed_notes):
+        start = time.perf_counter()
+        if changed_sources:
+            self.reload(changed_sources)
+        self.refresh_index()
+        if changed_sources:
+            candidates = list(self.gf.FIGURE_SPECS)
+        else:
+            rel = {os.path.relpath(p, HERE) for p in changed_notes}
+            candidates = [name for name, (_, notes) in self.index.items() if rel & set(notes)]
+        todo = self.stale(candidates)
+        for name, key in todo.items():
+            _, elapsed, error, _, _ = self.gf.render_job(name)
+            output, notes = self.index[name]
+            if error:
+                print(f"✗ {name} failed:\n{error}")
+                continue
+            self.cache.record(name, key, output, elapsed)
+            print(f"  {name} -> {output} ({elapsed:.2f}s)" + (f" -> {', '.join(notes)}" if notes else ''))
+        self.cache.save()
+        what = ', '.join(os.path.relpath(p, HERE) for p in sorted(changed_sources | changed_notes))
+        print(f"[{time.strftime('%H:%M:%S')}] {what}: {len(todo)} figure(s) rebuilt "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    def run(self):
+        print(f"Watching {len(self.sources())} script(s) and {len(self.notes())} note(s); Ctrl+C to stop")
+        for name, (output, notes) in self.index.items():
+            print(f"  {name} -> {output}" + (f" -> {', '.join(notes)}" if notes else ''))
+        seen = snapshot(self.sources() + self.notes())
+        while True:
+            time.sleep(self.interval)
+            current = snapshot(self.sources() + self.notes())
+            if current == seen:
+                continue
+            # Debounce: wait until the files stop changing
+            while True:
+                time.sleep(self.debounce)
+                settled = snapshot(self.sources() + self.notes())
+                if settled == current:
+                    break
+                current = settled
+            changed = {p for p in set(current) | set(seen) if current.get(p) != seen.get(p)}
+            notes = {p for p in changed if p.endswith('.md')}
+            try:
+                self.rebuild(changed - notes, notes)
+            except Exception as e:  # keep watching through syntax errors mid-edit
+                print(f"✗ Rebuild failed: {type(e).__name__}: {e}")
+            seen = current
+
+
+def watch(debounce=0.3, out_dir='images'):
+    try:
+        Watcher(debounce, out_dir=out_dir).run()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return 0